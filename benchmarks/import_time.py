@@ -0,0 +1,70 @@
+"""
+Measure how long `import bis_code_helpers` takes in a fresh interpreter, and fail if it regresses.
+
+Each run starts a new Python process, so nothing is cached between runs. The check fails (exit code 1)
+when the median import time is above --max-ms, or when importing the package, or using its light
+helpers, loads any of the heavy dependencies that should only be loaded on first DB use.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --max-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pandas", "numpy", "sqlalchemy", "oracledb"]
+
+SNIPPETS = {
+    "import bis_code_helpers": "import bis_code_helpers",
+    "run_external_command": "import bis_code_helpers; bis_code_helpers.run_external_command",
+    "setup_logging": "import bis_code_helpers; bis_code_helpers.setup_logging",
+}
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+{snippet}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def time_snippet(snippet: str) -> dict:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([repo_root, os.environ.get("PYTHONPATH", "")]))
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(snippet=snippet, heavy=HEAVY_MODULES)],
+        stdout=subprocess.PIPE,
+        check=True,
+        env=env,
+    ).stdout
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=100, help="Highest accepted median import time.")
+    args = parser.parse_args()
+
+    failed = False
+    for name, snippet in SNIPPETS.items():
+        results = [time_snippet(snippet) for _ in range(args.runs)]
+        median_ms = statistics.median([x["seconds"] for x in results]) * 1000
+        heavy = sorted({m for x in results for m in x["heavy"]})
+        print("{name:<26} {median_ms:>8.1f} ms median over {runs} runs, heavy modules loaded: {heavy}".format(
+            name=name, median_ms=median_ms, runs=args.runs, heavy=heavy or "none"
+        ))
+        if median_ms > args.max_ms or len(heavy) > 0:
+            failed = True
+
+    if failed:
+        print("Import time regressed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare the speed of library_backend.generate_insert_query to the original row-by-row implementation,
+which tests/test_insert_query_generation.py keeps as the reference it checks the SQL against:
+
+    PYTHONPATH=. python benchmarks/insert_query_generation.py --rows 20000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import bis_code_helpers
+from tests.test_insert_query_generation import reference_generate_insert_query
+
+
+def make_data(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    floats = rng.random(rows) * 10.0 ** rng.integers(-20, 25, rows)
+    floats[::17] = np.nan
+    return pd.DataFrame(
+        {
+            "int col": rng.integers(-2 ** 62, 2 ** 62, rows),
+            "float64": floats,
+            "float32": floats.astype("float32"),
+            "text": pd.Series(rng.choice(["abc", "d e", None, "fgh"], rows), dtype=object),
+            "mixed": pd.Series(rng.choice([1, 2.5, None, "q"], rows), dtype=object),
+            "created": pd.Series([bis_code_helpers.current_db_compatible_time()] * rows, dtype=object),
+            "stamp": pd.date_range("2000", periods=rows, freq="37s"),
+            "flag": rng.random(rows) > 0.5,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    data = make_data(args.rows)
+    column_sets = [
+        list(data.columns),
+        ["int col", "float64"],
+        ["float64", "float32"],
+        ["int col", "flag"],
+        ["stamp"],
+        ["stamp", "float64"],
+        ["text", "int col", "created"],
+    ]
+
+    for columns in column_sets:
+        subset = data[columns]
+        start = time.perf_counter()
+        reference_generate_insert_query(subset, "BENCH_TABLE")
+        reference_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        bis_code_helpers.library_backend.generate_insert_query(subset, "BENCH_TABLE")
+        seconds = time.perf_counter() - start
+
+        print("{columns:<70} reference={ref:.3f}s current={cur:.3f}s x{speedup:.1f}".format(
+            columns=str(columns), ref=reference_seconds, cur=seconds, speedup=reference_seconds / seconds
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Benchmark suite for SQL generation and the upload path, on synthetic DataFrames of varying width, row
+count, string length and null density, against a local SQLite engine.
+
+For every case it reports the fastest of --repeats runs after a warm-up run (the minimum is far less
+affected by other load on the machine than the median, which is reported alongside), throughput in
+rows/second and the tracemalloc peak of a separate run (so tracing does not slow down the timed runs).
+Results can be saved as a baseline and later runs compared against it; the comparison exits with status 1
+when any case is slower or uses more memory than the baseline by more than the given tolerance and by
+more than an absolute noise floor, so millisecond cases do not fail on scheduling jitter.
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --quick --save baseline.json
+    python benchmarks/suite.py --quick --compare baseline.json --time-tolerance 0.25
+
+Timings are only comparable between runs on the same machine and Python/pandas versions, which are
+recorded in the saved file and printed with the comparison.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+
+import bis_code_helpers
+
+FULL_GRID = {
+    "rows": [1000, 20000],
+    "width": [4, 16],
+    "string_length": [8, 64],
+    "null_density": [0.0, 0.3],
+}
+
+# Large enough that no case takes only a few milliseconds, which scheduling noise alone can slow by 20%
+QUICK_GRID = {
+    "rows": [10000],
+    "width": [4, 16],
+    "string_length": [16],
+    "null_density": [0.0, 0.3],
+}
+
+UPLOAD_PARTITION_SIZE = 1000
+
+
+def make_data(rows: int, width: int, string_length: int, null_density: float) -> pd.DataFrame:
+    """
+    Build a DataFrame cycling through integer, float, string and date columns, with null_density of
+    the float, string and date values set to null. The same arguments always give the same data.
+    """
+    rng = np.random.default_rng(rows * 1000 + width)
+    alphabet = np.array(list("abcdefghijklmnopqrstuvwxyz0123456789"))
+    columns = {}
+    for i in range(width):
+        kind = i % 4
+        name = "col_{i}".format(i=i)
+        nulls = rng.random(rows) < null_density
+        if kind == 0:
+            columns[name] = np.arange(rows, dtype="int64") + i
+        elif kind == 1:
+            values = rng.random(rows) * 1e6
+            values[nulls] = np.nan
+            columns[name] = values
+        elif kind == 2:
+            words = ["".join(rng.choice(alphabet, string_length)) for _ in range(64)]
+            values = np.array(words, dtype=object)[rng.integers(0, 64, rows)]
+            values[nulls] = None
+            columns[name] = values
+        else:
+            values = pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 10 ** 6, rows), "s"))
+            values[nulls] = pd.NaT
+            columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def reset_table(table_name: str, data: pd.DataFrame, engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("DROP TABLE IF EXISTS {t}".format(t=table_name)))
+    bis_code_helpers.execute_action_query_on_db(
+        bis_code_helpers.library_backend.generate_table_creation_query(data, table_name),
+        "Created benchmark table.", "Failed to create benchmark table.", engine,
+    )
+
+
+def benchmark_targets(engine) -> dict:
+    """
+    Name, setup and call of each benchmarked function. Setup runs before every call and is not timed.
+    """
+    table_name = "BENCH_SUITE"
+    return {
+        "generate_insert_query": (
+            lambda data: None,
+            lambda data: bis_code_helpers.library_backend.generate_insert_query(data, table_name),
+        ),
+        "generate_table_creation_query": (
+            lambda data: None,
+            lambda data: bis_code_helpers.library_backend.generate_table_creation_query(data, table_name),
+        ),
+        "upload_data_to_table": (
+            lambda data: reset_table(table_name, data, engine),
+            lambda data: bis_code_helpers.upload_data_to_table(
+                data, UPLOAD_PARTITION_SIZE, table_name, engine, use_bind_variables=True
+            ),
+        ),
+    }
+
+
+def measure(setup, call, data: pd.DataFrame, repeats: int) -> dict:
+    # One untimed call first, so imports and caches warmed by the first call are not counted
+    setup(data)
+    call(data)
+
+    seconds = []
+    for _ in range(repeats):
+        setup(data)
+        start = time.perf_counter()
+        call(data)
+        seconds.append(time.perf_counter() - start)
+
+    setup(data)
+    tracemalloc.start()
+    call(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latency = min(seconds)
+    return {
+        "latency_s": latency,
+        "median_s": statistics.median(seconds),
+        "rows_per_s": len(data.index) / latency if latency > 0 else float("inf"),
+        "peak_mib": peak / 2 ** 20,
+    }
+
+
+def run_suite(grid: dict, repeats: int, only: list) -> dict:
+    engine = sqlalchemy.create_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+    targets = benchmark_targets(engine)
+    results = {}
+    for rows, width, string_length, null_density in itertools.product(
+        grid["rows"], grid["width"], grid["string_length"], grid["null_density"]
+    ):
+        data = make_data(rows, width, string_length, null_density)
+        for name, (setup, call) in targets.items():
+            if only and name not in only:
+                continue
+            case = "{name} rows={rows} width={width} strlen={strlen} nulls={nulls}".format(
+                name=name, rows=rows, width=width, strlen=string_length, nulls=null_density
+            )
+            results[case] = measure(setup, call, data, repeats)
+            print("{case:<80} {latency:>9.4f}s {throughput:>12.0f} rows/s {peak:>8.2f} MiB".format(
+                case=case,
+                latency=results[case]["latency_s"],
+                throughput=results[case]["rows_per_s"],
+                peak=results[case]["peak_mib"],
+            ))
+    return results
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sqlalchemy": sqlalchemy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(
+    results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float, time_floor: float, memory_floor: float
+) -> list:
+    """
+    Compare results to a saved baseline and return a description of each regression. A case regresses
+    when it exceeds the baseline by more than the fractional tolerance and by more than the absolute floor.
+    """
+    regressions = []
+    for case, result in results.items():
+        expected = baseline["results"].get(case)
+        if expected is None:
+            print("{case:<80} not in baseline".format(case=case))
+            continue
+        time_ratio = result["latency_s"] / expected["latency_s"]
+        memory_ratio = result["peak_mib"] / max(expected["peak_mib"], 1e-6)
+        flags = []
+        if time_ratio > 1 + time_tolerance and result["latency_s"] - expected["latency_s"] > time_floor:
+            flags.append("SLOWER")
+        if memory_ratio > 1 + memory_tolerance and result["peak_mib"] - expected["peak_mib"] > memory_floor:
+            flags.append("MORE MEMORY")
+        print("{case:<80} time x{time_ratio:.2f} memory x{memory_ratio:.2f} {flags}".format(
+            case=case, time_ratio=time_ratio, memory_ratio=memory_ratio, flags=" ".join(flags)
+        ))
+        if flags:
+            regressions.append("{case}: {flags}".format(case=case, flags=", ".join(flags)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Run a smaller grid of cases.")
+    parser.add_argument("--repeats", type=int, default=7, help="Timed runs per case, the fastest is compared.")
+    parser.add_argument("--only", nargs="*", default=[], help="Names of the functions to benchmark.")
+    parser.add_argument("--save", default=None, help="Write the results to this JSON file as a baseline.")
+    parser.add_argument("--compare", default=None, help="Compare the results to this baseline JSON file.")
+    parser.add_argument("--time-tolerance", type=float, default=0.2, help="Accepted fractional slowdown.")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="Accepted fractional memory increase.")
+    parser.add_argument("--time-floor", type=float, default=0.005, help="Slowdown in seconds always accepted.")
+    parser.add_argument("--memory-floor", type=float, default=0.25, help="Memory increase in MiB always accepted.")
+    args = parser.parse_args()
+
+    bis_code_helpers.set_mock_logging_level(bis_code_helpers.LoggingLevels.WARNING)
+
+    results = run_suite(QUICK_GRID if args.quick else FULL_GRID, args.repeats, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        print("Saved baseline to {path}".format(path=args.save))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("Baseline environment differs, timings may not be comparable: {env}".format(
+                env=baseline.get("environment")
+            ))
+        regressions = compare(
+            results, baseline, args.time_tolerance, args.memory_tolerance, args.time_floor, args.memory_floor
+        )
+        if regressions:
+            print("{n} regressions against {path}:".format(n=len(regressions), path=args.compare))
+            for regression in regressions:
+                print("  " + regression)
+            sys.exit(1)
+        print("No regressions against {path}.".format(path=args.compare))
+
+
+if __name__ == "__main__":
+    main()
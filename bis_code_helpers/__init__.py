@@ -1,16 +1,168 @@
-from .connection_management import *
-from .logged_exceptions import *
-from .logging_helpers import *
-from .database_interaction import *
-from .run_external_command import *
+import importlib as __importlib__
+
+# Public names and the submodules defining them. Most submodules pull in pandas, sqlalchemy or oracledb,
+# so a submodule is only imported the first time one of its names is used.
+__lazy_attributes__: dict = {
+    **dict.fromkeys(
+        [
+            "ConnectionManager",
+            "TransactionManager",
+            "DatabaseSession",
+            "AsyncConnectionManager",
+            "create_engine",
+            "create_async_engine",
+            "dispose_engine",
+            "dispose_all_engines",
+        ],
+        ".connection_management",
+    ),
+    **dict.fromkeys(
+        [
+            "TableMetadataCache",
+            "enable_metadata_cache",
+            "get_metadata_cache",
+            "disable_metadata_cache",
+        ],
+        ".metadata_cache",
+    ),
+    **dict.fromkeys(
+        [
+            "ResultCache",
+            "enable_result_cache",
+            "get_result_cache",
+            "disable_result_cache",
+        ],
+        ".result_cache",
+    ),
+    **dict.fromkeys(
+        [
+            "LoggedValueError",
+            "LoggedDataError",
+            "LoggedDatabaseError",
+            "LoggedSubprocessError",
+        ],
+        ".logged_exceptions",
+    ),
+    **dict.fromkeys(["setup_logging", "format_text_with_dashes"], ".logging_helpers"),
+    **dict.fromkeys(
+        [
+            "current_db_compatible_time",
+            "check_existence_of_table",
+            "get_db_table_column_names",
+            "get_db_table_row_count",
+            "RowCount",
+            "truncate_table",
+            "drop_table",
+            "create_table",
+            "upload_data_to_table",
+            "upload_data_stream_to_table",
+            "load_data_via_staging_table",
+            "upsert_data_to_table",
+            "update_column_by_value",
+            "update_column_by_values",
+            "execute_select_query_on_db",
+            "execute_select_query_on_db_in_chunks",
+            "execute_action_query_on_db",
+        ],
+        ".database_interaction",
+    ),
+    **dict.fromkeys(
+        [
+            "async_execute_select_query_on_db",
+            "async_execute_action_query_on_db",
+            "async_check_existence_of_table",
+            "async_get_db_table_column_names",
+            "async_get_db_table_row_count",
+            "async_upload_data_to_table",
+        ],
+        ".async_database_interaction",
+    ),
+    **dict.fromkeys(["TableCatalog", "load_table_catalog"], ".table_catalog"),
+    **dict.fromkeys(["export_to_files"], ".table_export"),
+    **dict.fromkeys(["load_data_via_sql_loader"], ".bulk_loading"),
+    **dict.fromkeys(
+        [
+            "QueryMetrics",
+            "Histogram",
+            "MetricsRecorder",
+            "add_instrumentation_sink",
+            "remove_instrumentation_sink",
+        ],
+        ".query_instrumentation",
+    ),
+    **dict.fromkeys(
+        [
+            "MockLogger",
+            "set_mock_logging_level",
+            "LoggingLevels",
+            "SchemaInferrer",
+        ],
+        ".library_backend",
+    ),
+}
+
+__submodules__: list = [
+    "connection_management",
+    "metadata_cache",
+    "result_cache",
+    "logged_exceptions",
+    "logging_helpers",
+    "database_interaction",
+    "async_database_interaction",
+    "table_catalog",
+    "table_export",
+    "bulk_loading",
+    "query_instrumentation",
+    "library_backend",
+]
+
+
+def __getattr__(name: str):
+    """
+    Import the submodule defining a public name on first use.
+
+    :param name: (str): Name looked up on the package.
+    :return: The object of that name.
+    """
+    if name in __submodules__:
+        return __importlib__.import_module("." + name, __name__)
+    module_name: str = __lazy_attributes__.get(name)
+    if module_name is None and name in __getattr__("library_backend").__lazy_attributes__:
+        module_name = ".library_backend"
+    if module_name is None:
+        raise AttributeError("module {module!r} has no attribute {name!r}".format(module=__name__, name=name))
+    value = getattr(__importlib__.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__lazy_attributes__) | set(__submodules__))
+
+
+# Imported up front, as it only needs the standard library: the submodule has the name of the function,
+# and importing it lazily would set the package attribute to the submodule rather than the function
+from .run_external_command import run_external_command
 
-# from bis_code_helpers.library_backend import *
-from .library_backend import *
 
 # Select only those objects that you want imported
 __all__ = [
     "ConnectionManager",
+    "TransactionManager",
+    "DatabaseSession",
     "create_engine",
+    "dispose_engine",
+    "dispose_all_engines",
+    "AsyncConnectionManager",
+    "create_async_engine",
+    "TableMetadataCache",
+    "enable_metadata_cache",
+    "get_metadata_cache",
+    "disable_metadata_cache",
+    "ResultCache",
+    "enable_result_cache",
+    "get_result_cache",
+    "disable_result_cache",
     "LoggedValueError",
     "LoggedDataError",
     "LoggedDatabaseError",
@@ -18,14 +170,35 @@ __all__ = [
     "setup_logging",
     "get_db_table_column_names",
     "get_db_table_row_count",
+    "RowCount",
     "truncate_table",
     "drop_table",
     "create_table",
     "upload_data_to_table",
+    "upload_data_stream_to_table",
+    "load_data_via_staging_table",
+    "upsert_data_to_table",
     "update_column_by_value",
+    "update_column_by_values",
     "execute_select_query_on_db",
+    "execute_select_query_on_db_in_chunks",
     "execute_action_query_on_db",
     "check_existence_of_table",
+    "async_execute_select_query_on_db",
+    "async_execute_action_query_on_db",
+    "async_check_existence_of_table",
+    "async_get_db_table_column_names",
+    "async_get_db_table_row_count",
+    "async_upload_data_to_table",
+    "TableCatalog",
+    "load_table_catalog",
+    "export_to_files",
+    "load_data_via_sql_loader",
+    "QueryMetrics",
+    "Histogram",
+    "MetricsRecorder",
+    "add_instrumentation_sink",
+    "remove_instrumentation_sink",
     "set_mock_logging_level",
     "LoggingLevels",
     "current_db_compatible_time",
@@ -0,0 +1,330 @@
+import asyncio as __asyncio__
+import pandas as __pd__
+import sqlalchemy as __sq__
+from logging import Logger as __Logger__
+from typing import Optional as __Optional__
+from typing import Union as __Union__
+
+import bis_code_helpers
+
+
+# ----------------------------------------------------
+# Async counterparts of the database interaction functions, for use from an event loop
+# ----------------------------------------------------
+
+
+async def async_execute_select_query_on_db(
+    query: str,
+    success_msg: str,
+    error_msg: str,
+    engine,
+    logger: __Logger__ = None,
+    binds: __Optional__[dict] = None,
+) -> __pd__.DataFrame:
+    """
+    Execute a returning select query without blocking the event loop.
+    The result is read with pandas.read_sql, as in execute_select_query_on_db.
+
+    :param query: (str): Query to be executed.
+    :param success_msg: (str): Debug message for successful execution.
+    :param error_msg: (str): Error message for failed execution.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :return: (pandas.Dataframe): Data returned from DB.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    def read_sql(conn) -> __pd__.DataFrame:
+        if binds is None:
+            return __pd__.read_sql(query, conn)
+        return __pd__.read_sql(__sq__.text(query), conn, params=binds)
+
+    timer = bis_code_helpers.query_instrumentation.__start_query__(
+        "async_execute_select_query_on_db", query, logger
+    )
+    try:
+        async with bis_code_helpers.AsyncConnectionManager(engine) as conn:
+            timer.checked_out(conn.sync_connection)
+            timer.watch_execute(conn.sync_connection)
+            try:
+                result: __pd__.DataFrame = await conn.run_sync(read_sql)
+                timer.lap("fetch")
+            finally:
+                timer.unwatch_execute(conn.sync_connection)
+            logger.debug(success_msg)
+    except Exception as e:
+        timer.finish(error=e)
+        logger.error(error_msg)
+        raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    timer.finish(rows=len(result))
+    return result
+
+
+async def async_execute_action_query_on_db(
+    query: str,
+    success_msg: str,
+    error_msg: str,
+    engine,
+    logger: __Logger__ = None,
+    binds: __Optional__[__Union__[dict, list]] = None,
+) -> __sq__.CursorResult:
+    """
+    Execute a non-returning, commit required query without blocking the event loop.
+
+    :param query: (str): Query to be executed.
+    :param success_msg: (str): Debug message for successful execution.
+    :param error_msg: (str): Error message for failed execution.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param binds: (Optional[Union[dict, list]]): Bind values for the query, a list of dicts executes it once per dict.
+    :return: (sqlalchemy.CursorResult): Result object from cursor that executed query.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    timer = bis_code_helpers.query_instrumentation.__start_query__(
+        "async_execute_action_query_on_db", query, logger
+    )
+    try:
+        async with bis_code_helpers.AsyncConnectionManager(engine) as conn:
+            timer.checked_out(conn.sync_connection)
+            async with conn.begin():
+                output: __sq__.CursorResult = await conn.execute(__sq__.text(query), binds)
+                timer.lap("execute")
+            timer.lap("commit")
+            logger.debug(success_msg)
+    except Exception as e:
+        timer.finish(error=e)
+        logger.error(error_msg)
+        raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    timer.finish(rows=output.rowcount)
+    return output
+
+
+async def async_check_existence_of_table(
+    table_name: str, engine, logger: __Logger__ = None
+) -> bool:
+    """
+    Check existence of table on database without blocking the event loop.
+    Answers from the engine's metadata cache when enabled.
+
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (bool): Existence of table.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+    if cache is not None:
+        exists: __Optional__[bool] = cache.get_existence(table_name)
+        if exists is not None:
+            logger.debug(
+                "Table '{table_name}' {state} (cached).".format(
+                    table_name=table_name, state="exists" if exists else "does not exist"
+                )
+            )
+            return exists
+
+    query: str = bis_code_helpers.library_backend.generate_check_existence_of_table_query(
+        table_name
+    )
+    timer = bis_code_helpers.query_instrumentation.__start_query__(
+        "async_check_existence_of_table", query, logger
+    )
+    async with bis_code_helpers.AsyncConnectionManager(engine) as conn:
+        timer.checked_out(conn.sync_connection)
+        try:
+            await conn.execute(__sq__.text(query))
+            timer.lap("execute")
+            timer.finish()
+        except __sq__.exc.DatabaseError as error:
+            if bis_code_helpers.database_interaction.__is_missing_table_error__(error):
+                timer.finish(rows=0)
+                logger.debug(
+                    "Table '{table_name}' does not exist.".format(table_name=table_name)
+                )
+                if cache is not None:
+                    cache.set_existence(table_name, False)
+                return False
+            timer.finish(error=error)
+            raise bis_code_helpers.LoggedDatabaseError(logger, str(error))
+
+    logger.debug("Table '{table_name}' exists.".format(table_name=table_name))
+    if cache is not None:
+        cache.set_existence(table_name, True)
+    return True
+
+
+async def async_get_db_table_column_names(
+    table_name: str, engine, logger: __Logger__ = None
+) -> __Optional__[list]:
+    """
+    Get column names of table on database without blocking the event loop. Checks for existence of table first.
+    Answers from the engine's metadata cache when enabled.
+
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (Optional[list]): List of column names, None if table does not exist.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+    if cache is not None:
+        col_names: __Optional__[list] = cache.get_column_names(table_name)
+        if col_names is not None:
+            logger.debug("Column Names (cached): {column_names}".format(column_names=col_names))
+            return col_names
+
+    if not await async_check_existence_of_table(table_name, engine, logger):
+        return None
+
+    query: str = bis_code_helpers.library_backend.generate_column_names_of_db_table_query(
+        table_name
+    )
+
+    success_msg: str = "Successfully retrieved column names of '{table_name}'.".format(
+        table_name=table_name
+    )
+    error_msg: str = "Failed to retrieve column names of '{table_name}'.".format(
+        table_name=table_name
+    )
+
+    result: __pd__.DataFrame = await async_execute_select_query_on_db(
+        query, success_msg, error_msg, engine, logger
+    )
+    col_names = list(result.columns)
+    logger.debug("Column Names: {column_names}".format(column_names=col_names))
+    if cache is not None:
+        cache.set_column_names(table_name, col_names)
+    return col_names
+
+
+async def async_get_db_table_row_count(
+    table_name: str, engine, logger: __Logger__ = None
+) -> __Optional__[bis_code_helpers.RowCount]:
+    """
+    Count the rows of table on database exactly without blocking the event loop.
+
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (RowCount): Number of rows, None if table does not exist.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    query: str = bis_code_helpers.library_backend.generate_get_number_of_rows_of_db_table_query(
+        table_name
+    )
+
+    success_msg: str = "Successfully retrieved row count for table '{table_name}'.".format(
+        table_name=table_name
+    )
+    error_msg: str = "Failed to retrieve row count for table '{table_name}'.".format(
+        table_name=table_name
+    )
+
+    try:
+        result: __pd__.DataFrame = await async_execute_select_query_on_db(
+            query, success_msg, error_msg, engine, logger
+        )
+        return bis_code_helpers.RowCount(int(result.iloc[0, 0]))
+    except bis_code_helpers.LoggedDatabaseError as error:
+        if bis_code_helpers.database_interaction.__is_missing_table_error__(error):
+            return None
+        raise
+
+
+async def async_upload_data_to_table(
+    table_data: __pd__.DataFrame,
+    upload_partition_size: int,
+    table_name: str,
+    engine,
+    logger: __Logger__ = None,
+    use_bind_variables: bool = False,
+    max_concurrency: int = 1,
+) -> None:
+    """
+    Upload data in table_data DataFrame to table without blocking the event loop.
+
+    Partitions are sent as in upload_data_to_table and each is committed on its own. With
+    max_concurrency above 1 that many partitions are in flight at once, each on its own connection.
+    Every partition is attempted, and the failed row ranges are reported together at the end.
+
+    :param table_data: (pandas.DataFrame): data to be uploaded.
+    :param upload_partition_size: (int): Number of rows to upload at a time.
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload partitions with bind variables instead of literal SQL.
+    :param max_concurrency: (int): Number of partitions to upload concurrently.
+    :return: None
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    table_data = bis_code_helpers.database_interaction.__sanitize_upload_data__(
+        table_data, use_bind_variables
+    )
+
+    partitions: list = bis_code_helpers.database_interaction.__get_upload_partitions__(
+        len(table_data.index), upload_partition_size
+    )
+    semaphore: __asyncio__.Semaphore = __asyncio__.Semaphore(max(1, max_concurrency))
+
+    async def upload_partition(partition: tuple) -> bool:
+        start, end, first_row, last_row = partition
+        success_msg: str = "Uploaded rows: {a} - {b} to '{table_name}'".format(
+            a=str(first_row), b=str(last_row), table_name=table_name,
+        )
+        error_msg: str = "Failed to upload rows: {a} - {b} to '{table_name}'".format(
+            a=str(first_row), b=str(last_row), table_name=table_name,
+        )
+        async with semaphore:
+            # Generated only once a slot is free, so at most max_concurrency partitions are held in memory, and
+            # in a worker thread, so the event loop is not blocked while formatting them
+            query, binds = await __asyncio__.to_thread(
+                bis_code_helpers.database_interaction.__generate_upload_query__,
+                table_data[start:end],
+                table_name,
+                use_bind_variables,
+            )
+            if use_bind_variables and len(binds) == 0:
+                return True
+            try:
+                await async_execute_action_query_on_db(
+                    query, success_msg, error_msg, engine, logger, binds
+                )
+            except bis_code_helpers.LoggedDatabaseError:
+                return False
+        return True
+
+    succeeded: list = await __asyncio__.gather(*[upload_partition(x) for x in partitions])
+    bis_code_helpers.database_interaction.__invalidate_cached_results__(table_name, engine)
+
+    failed_partitions: list = [x for x, ok in zip(partitions, succeeded) if not ok]
+    if len(failed_partitions) > 0:
+        failed_ranges: str = ", ".join(
+            ["{a} - {b}".format(a=first_row, b=last_row) for _, _, first_row, last_row in failed_partitions]
+        )
+        raise bis_code_helpers.LoggedDatabaseError(
+            logger,
+            "Failed to upload {failed} of {total} partitions to '{table_name}' (other partitions committed), rows: {ranges}".format(
+                failed=len(failed_partitions),
+                total=len(partitions),
+                table_name=table_name,
+                ranges=failed_ranges,
+            ),
+        )
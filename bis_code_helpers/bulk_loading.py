@@ -0,0 +1,272 @@
+import os as __os__
+import shutil as __shutil__
+import tempfile as __tempfile__
+import pandas as __pd__
+from logging import Logger as __Logger__
+from typing import Iterable as __Iterable__
+from typing import Optional as __Optional__
+from typing import Union as __Union__
+
+import bis_code_helpers
+
+
+# ----------------------------------------------------
+# Bulk load data with SQL*Loader
+# ----------------------------------------------------
+
+__sql_loader_load_methods__: list = ["APPEND", "INSERT", "REPLACE", "TRUNCATE"]
+
+# SQL*Loader exits with 2 when it loaded the data but rejected or discarded rows, which are checked from its log
+__sql_loader_accepted_return_codes__: tuple = (0, 2)
+
+
+def load_data_via_sql_loader(
+    source: __Union__[str, __os__.PathLike, __pd__.DataFrame, __Iterable__[__pd__.DataFrame]],
+    table_name: str,
+    engine,
+    chunk_size: int = 100000,
+    load_method: str = "APPEND",
+    max_errors: int = 0,
+    sql_loader_path: str = "sqlldr",
+    options: __Optional__[dict] = None,
+    userid: __Optional__[str] = None,
+    work_dir: __Optional__[str] = None,
+    keep_files: bool = False,
+    read_options: __Optional__[dict] = None,
+    logger: __Logger__ = None,
+) -> dict:
+    """
+    Load data with a direct path SQL*Loader run, for loads too large for batched inserts.
+
+    The source, a DataFrame, an iterable of DataFrames or a CSV or Parquet file as for
+    upload_data_stream_to_table, is written chunk by chunk to a delimited data file, while its column types
+    are inferred as for generate_table_creation_query. The table is then created with create_table if it
+    does not exist, and the control file is generated from the same column types. SQL*Loader is run through
+    run_external_command with a parameter file holding the credentials, so they do not appear in the
+    process list, and its log is read for the row counts.
+
+    Values written as to_date(...) strings are loaded as dates. Strings holding line breaks cannot be loaded
+    and raise a LoggedDataError.
+
+    :param source: (Union[str, os.PathLike, pandas.DataFrame, Iterable[pandas.DataFrame]]): Data to be loaded.
+    :param table_name: (str): Name of table to load into.
+    :param engine: (sqlalchemy.engine): DB engine for creating the table, and for the credentials if no userid.
+    :param chunk_size: (int): Most rows held in memory at a time while writing the data file.
+    :param load_method: (str): APPEND, INSERT, REPLACE or TRUNCATE.
+    :param max_errors: (int): Most rows that may be rejected before the load fails.
+    :param sql_loader_path: (str): SQL*Loader executable.
+    :param options: (Optional[dict]): More SQL*Loader parameters, e.g. {"multithreading": "true"}.
+    :param userid: (Optional[str]): Credentials as user/password@connect_string, defaults to those of the engine.
+    :param work_dir: (Optional[str]): Directory for the data, control, log and bad files, defaults to a new temporary one.
+    :param keep_files: (bool): Keep the files after a successful load. A failed load keeps them only if rows were rejected.
+    :param read_options: (Optional[dict]): Keyword arguments for reading a CSV or Parquet source.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (dict): Row counts read from the log: read, loaded, rejected, discarded and skipped.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    load_method = load_method.upper()
+    if load_method not in __sql_loader_load_methods__:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Unknown load method '{load_method}', expected one of {methods}.".format(
+                load_method=load_method, methods=__sql_loader_load_methods__
+            ),
+        )
+
+    created_work_dir: bool = work_dir is None
+    if created_work_dir:
+        work_dir = __tempfile__.mkdtemp(prefix="sqlldr_")
+    else:
+        __os__.makedirs(work_dir, exist_ok=True)
+    base_name: str = table_name.replace('"', "").replace(".", "_").lower()
+    files: dict = {
+        x: __os__.path.join(work_dir, "{base_name}.{extension}".format(base_name=base_name, extension=x))
+        for x in ["dat", "ctl", "log", "bad", "par"]
+    }
+
+    # The data file may hold sensitive data, so the files are only kept after a failure when the error
+    # message points at them
+    succeeded: bool = False
+    keep_files_of_failure: bool = False
+    try:
+        schema: bis_code_helpers.library_backend.SchemaInferrer = __write_sql_loader_data_file__(
+            source, files["dat"], chunk_size, read_options, logger
+        )
+        if len(schema.column_names) == 0:
+            raise bis_code_helpers.LoggedDataError(
+                logger, "No columns to load into '{table_name}'.".format(table_name=table_name)
+            )
+        bis_code_helpers.create_table(schema, table_name, engine, logger=logger)
+
+        control_file: str = bis_code_helpers.library_backend.generate_sql_loader_control_file(
+            schema.column_types(), table_name, files["dat"], files["bad"], load_method
+        )
+        with open(files["ctl"], "w") as f:
+            f.write(control_file)
+
+        parameters: dict = {
+            "userid": userid if userid is not None else __sql_loader_userid__(engine),
+            "control": files["ctl"],
+            "log": files["log"],
+            "bad": files["bad"],
+            "direct": "true",
+            "errors": str(max_errors),
+            **(options or {}),
+        }
+        # Readable by the owner only, as it holds the password
+        par_fd: int = __os__.open(files["par"], __os__.O_WRONLY | __os__.O_CREAT | __os__.O_TRUNC, 0o600)
+        with open(par_fd, "w") as f:
+            f.write("".join("{k}={v}\n".format(k=k, v=v) for k, v in parameters.items()))
+
+        try:
+            bis_code_helpers.run_external_command(
+                [sql_loader_path, "parfile=" + files["par"]],
+                logger,
+                accepted_return_codes=__sql_loader_accepted_return_codes__,
+            )
+        finally:
+            __os__.remove(files["par"])
+            bis_code_helpers.database_interaction.__invalidate_cached_results__(table_name, engine)
+
+        try:
+            with open(files["log"]) as f:
+                counts: dict = bis_code_helpers.library_backend.parse_sql_loader_log(f.read())
+        except OSError as e:
+            raise bis_code_helpers.LoggedSubprocessError(
+                logger, "Failed to read SQL*Loader log '{log}': {e}".format(log=files["log"], e=e)
+            )
+        if counts["loaded"] is None:
+            raise bis_code_helpers.LoggedSubprocessError(
+                logger, "No row counts in SQL*Loader log '{log}'.".format(log=files["log"])
+            )
+        if (counts["rejected"] or 0) > max_errors:
+            keep_files_of_failure = True
+            raise bis_code_helpers.LoggedDatabaseError(
+                logger,
+                "SQL*Loader rejected {rejected} rows loading '{table_name}', see '{bad}' and '{log}'.".format(
+                    rejected=counts["rejected"], table_name=table_name, bad=files["bad"], log=files["log"]
+                ),
+            )
+
+        logger.info(
+            "SQL*Loader loaded {loaded} of {read} rows into '{table_name}', {rejected} rejected.".format(
+                loaded=counts["loaded"],
+                read=counts["read"],
+                table_name=table_name,
+                rejected=counts["rejected"] or 0,
+            )
+        )
+        succeeded = True
+    finally:
+        if not (keep_files if succeeded else keep_files_of_failure):
+            __remove_sql_loader_files__(work_dir, files, created_work_dir)
+    return counts
+
+
+def __remove_sql_loader_files__(work_dir: str, files: dict, created_work_dir: bool) -> None:
+    """
+    Remove the data, control, log, bad and parameter files of a load, and the work directory if it was created for it.
+
+    :param work_dir: (str): Directory of the files.
+    :param files: (dict): Paths of the files by extension.
+    :param created_work_dir: (bool): The work directory is a temporary one created for the load.
+    :return: None
+    """
+    if created_work_dir:
+        __shutil__.rmtree(work_dir, ignore_errors=True)
+        return
+    for x in files.values():
+        if __os__.path.exists(x):
+            __os__.remove(x)
+
+
+def __write_sql_loader_data_file__(
+    source, data_file: str, chunk_size: int, read_options: __Optional__[dict], logger: __Logger__
+) -> "bis_code_helpers.library_backend.SchemaInferrer":
+    """
+    Write the source chunk by chunk to a comma delimited data file, inferring its column types on the way.
+
+    :param source: (Union[str, os.PathLike, pandas.DataFrame, Iterable[pandas.DataFrame]]): Data to be written.
+    :param data_file: (str): Path of data file.
+    :param chunk_size: (int): Most rows held in memory at a time.
+    :param read_options: (Optional[dict]): Keyword arguments for reading a CSV or Parquet source.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (SchemaInferrer): Column types of the data written.
+    """
+    if isinstance(source, __pd__.DataFrame):
+        source = [source]
+
+    schema: bis_code_helpers.library_backend.SchemaInferrer = bis_code_helpers.library_backend.SchemaInferrer()
+    columns: __Optional__[list] = None
+    with open(data_file, "w", encoding="utf-8", newline="") as f:
+        for chunk in bis_code_helpers.database_interaction.__iterate_upload_chunks__(
+            source, chunk_size, read_options, logger
+        ):
+            if columns is None:
+                columns = list(chunk.columns)
+            elif list(chunk.columns) != columns:
+                unexpected: list = [x for x in chunk.columns if x not in columns]
+                if len(unexpected) > 0:
+                    raise bis_code_helpers.LoggedDataError(
+                        logger, "Chunk has columns {columns} not in the first chunk.".format(columns=unexpected)
+                    )
+                chunk = chunk.reindex(columns=columns)
+            schema.update(chunk)
+            __prepare_sql_loader_chunk__(chunk, logger).to_csv(f, header=False, index=False, lineterminator="\n")
+    return schema
+
+
+def __prepare_sql_loader_chunk__(chunk: __pd__.DataFrame, logger: __Logger__) -> __pd__.DataFrame:
+    """
+    Convert the values of a chunk to the text SQL*Loader reads them from: booleans as 1/0 and to_date(...)
+    strings in the date mask of the control file. The chunk itself is not changed.
+
+    :param chunk: (pandas.DataFrame): Chunk of data.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (pandas.DataFrame): Chunk to write.
+    """
+    prepared: dict = {}
+    for x in chunk.columns:
+        column: __pd__.Series = chunk[x]
+        if __pd__.api.types.is_bool_dtype(column):
+            column = column.astype("Int8")
+        elif column.dtype == object or isinstance(column.dtype, __pd__.StringDtype):
+            values: __pd__.Series = column.dropna().astype(str)
+            if values.str.contains(r"[\r\n]", regex=True).any():
+                raise bis_code_helpers.LoggedDataError(
+                    logger, "Column '{column}' holds line breaks, which SQL*Loader cannot load.".format(column=x)
+                )
+            is_date: __pd__.Series = values.str.contains("to_date", regex=False)
+            if is_date.any():
+                dates: __pd__.Series = bis_code_helpers.library_backend.database_functions.__to_date_column_to_datetimes__(
+                    values[is_date]
+                )
+                column = column.astype(object).copy()
+                column[dates.index] = dates.dt.strftime("%Y-%m-%d %H:%M:%S")
+        prepared[x] = column
+    return __pd__.DataFrame(prepared, index=chunk.index)
+
+
+def __sql_loader_userid__(engine) -> str:
+    """
+    Get SQL*Loader credentials, user/"password"@connect_string, from the URL of an engine.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :return: (str): Credentials.
+    """
+    url = bis_code_helpers.metadata_cache.__cache_key__(engine).url
+    service_name: __Optional__[str] = url.query.get("service_name")
+    if url.host is None:
+        connect_string: str = url.database or ""
+    elif service_name is not None or url.database:
+        connect_string = "{host}:{port}/{service}".format(
+            host=url.host, port=url.port or 1521, service=service_name or url.database
+        )
+    else:
+        connect_string = url.host if url.port is None else "{host}:{port}".format(host=url.host, port=url.port)
+    return '{user}/"{password}"@{connect_string}'.format(
+        user=url.username, password=url.password, connect_string=connect_string
+    )
@@ -1,48 +1,199 @@
 import sqlalchemy as __sq__
+import sqlalchemy.ext.asyncio as __sq_asyncio__
 from logging import Logger as __Logger__
 
 import os as __os__
-import oracledb as __oracledb__
+import hashlib as __hashlib__
+import threading as __threading__
+from concurrent.futures import ThreadPoolExecutor as __ThreadPoolExecutor__
 
-#__oracledb__.init_oracle_client(lib_dir=__os__.environ['ORACLE_HOME'])
-__oracledb__.init_oracle_client()
 import bis_code_helpers
 
 
+# ----------------------------------------------------
+# Oracle client initialisation, deferred until the first engine is created
+# ----------------------------------------------------
+
+
+__oracle_client_initialised__: bool = False
+__oracle_client_lock__: __threading__.Lock = __threading__.Lock()
+
+
+def __init_oracle_client__() -> None:
+    """
+    Load the Oracle client libraries (python-oracledb thick mode), once per process.
+
+    :return: None
+    """
+    global __oracle_client_initialised__
+    with __oracle_client_lock__:
+        if not __oracle_client_initialised__:
+            import oracledb as __oracledb__
+
+            # __oracledb__.init_oracle_client(lib_dir=__os__.environ['ORACLE_HOME'])
+            __oracledb__.init_oracle_client()
+            __oracle_client_initialised__ = True
+
+
+# ----------------------------------------------------
+# Registry of engines, so each user and DB shares one connection pool
+# ----------------------------------------------------
+
+
+__engine_registry__: dict = {}
+__engine_registry_lock__: __threading__.Lock = __threading__.Lock()
+
+
+def __prewarm_engine__(engine, connections: int) -> None:
+    """
+    Open connections in the pool of an engine, concurrently, and return them to the pool, so later
+    queries do not pay for session setup.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :param connections: (int): Number of connections to open.
+    :return: None
+    """
+    with __ThreadPoolExecutor__(max_workers=connections) as executor:
+        opened_connections: list = list(executor.map(lambda _: engine.connect(), range(connections)))
+    for conn in opened_connections:
+        conn.close()
+
+
+def dispose_engine(engine) -> None:
+    """
+    Remove an engine from the engine registry and close all connections in its pool.
+
+    :param engine: (sqlalchemy.engine): DB engine made by create_engine.
+    :return: None
+    """
+    with __engine_registry_lock__:
+        for key, (registered_engine, _, _) in list(__engine_registry__.items()):
+            if registered_engine is engine:
+                del __engine_registry__[key]
+    engine.dispose()
+
+
+def dispose_all_engines() -> None:
+    """
+    Remove all engines from the engine registry and close all connections in their pools.
+
+    :return: None
+    """
+    with __engine_registry_lock__:
+        engines: list = [engine for engine, _, _ in __engine_registry__.values()]
+        __engine_registry__.clear()
+    for engine in engines:
+        engine.dispose()
+
+
 # ----------------------------------------------------
 # Function for creating and testing an Oracle DB engine
 # ----------------------------------------------------
 
 
 def create_engine(
-    username: str, password: str, database: str, logger: __Logger__ = None
+    username: str,
+    password: str,
+    database: str,
+    logger: __Logger__ = None,
+    pool_size: int = 30,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = False,
+    prewarm: int = 0,
+    reuse: bool = True,
 ):
     """
     Sets up a database connection engine used to execute queries.
 
+    Engines are kept in a registry keyed by username and DB, and calling create_engine again for the
+    same username and DB returns the registered engine and its pool. Pool arguments differing from those
+    the registered engine was created with are not applied, and a warning is logged; use dispose_engine
+    first, or reuse=False, to get a pool with other settings. A different password replaces the registered
+    engine. Use dispose_engine to close a pool.
+
     :param username: (str): Username for DB.
     :param password: (str): Password for DB.
     :param database: (str): DB address.
     :param logger: (logging.Logger): Logger for logging debug and error messages.
+    :param pool_size: (int): Number of connections kept open in the pool.
+    :param max_overflow: (int): Number of connections opened beyond pool_size under load, -1 for no limit.
+    :param pool_timeout: (float): Seconds to wait for a connection when the pool and overflow are used up.
+    :param pool_recycle: (int): Seconds after which a connection is replaced, -1 to never replace connections.
+    :param pool_pre_ping: (bool): Test connections with a round-trip when they are checked out.
+    :param prewarm: (int): Number of connections to open up front, at most pool_size.
+    :param reuse: (bool): Use the engine registry, False always creates a new engine that is not registered.
     :return: (sqlalchemy.engine): DB connection engine.
     """
 
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    key: tuple = (username.upper(), database)
+    password_hash: str = __hashlib__.sha256(password.encode()).hexdigest()
+    pool_settings: dict = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+        "prewarm": prewarm,
+    }
+    if reuse:
+        with __engine_registry_lock__:
+            registered: tuple = __engine_registry__.get(key)
+        if registered is not None and registered[1] == password_hash:
+            ignored: list = [
+                "{k}={v} (registered: {registered})".format(k=k, v=v, registered=registered[2][k])
+                for k, v in pool_settings.items()
+                if registered[2][k] != v
+            ]
+            if len(ignored) > 0:
+                logger.warning(
+                    "Reusing DB Connection: {DB} with its pool settings, ignoring {ignored}.".format(
+                        DB=database, ignored=", ".join(ignored)
+                    )
+                )
+            else:
+                logger.debug("Reusing DB Connection: " + database)
+            return registered[0]
+
+    __init_oracle_client__()
+
     conn_string: str = "oracle+oracledb://" + username + ":" + password + "@" + database
     # print(conn_string)
-    engine = __sq__.create_engine(conn_string, pool_size=30, max_overflow=-1)
+    engine = __sq__.create_engine(
+        conn_string,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+    )
 
     try:
         with ConnectionManager(engine):
             logger.debug("Got DB Connection: " + database)
+        if prewarm > 1:
+            __prewarm_engine__(engine, min(prewarm, pool_size))
+            logger.debug(
+                "Opened {n} pooled connections to: {DB}".format(n=min(prewarm, pool_size), DB=database)
+            )
     except Exception as e:
+        engine.dispose()
         raise bis_code_helpers.LoggedDatabaseError(
             logger,
             "Failed to connect to DB: {DB}\n{error}".format(DB=database, error=str(e)),
         )
 
+    if reuse:
+        with __engine_registry_lock__:
+            replaced: tuple = __engine_registry__.get(key)
+            __engine_registry__[key] = (engine, password_hash, pool_settings)
+        if replaced is not None:
+            replaced[0].dispose()
+
     return engine
 
 
@@ -54,16 +205,213 @@ def create_engine(
 class ConnectionManager:
     """
     Context manager class to open and close connections as required.
+    Given a DatabaseSession, it hands out the session's connection and leaves it open.
 
-    :param engine: (sqlalchemy.engine): Engine for connection.
+    :param engine: (Union[sqlalchemy.engine, DatabaseSession]): Engine or session for connection.
     """
 
     def __init__(self, engine):
         self.engine = engine
 
     def __enter__(self):
-        self.connection = self.engine.connect()
+        if isinstance(self.engine, DatabaseSession):
+            self.connection = self.engine.connection
+        else:
+            self.connection = self.engine.connect()
         return self.connection
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.connection.close()
+        if not isinstance(self.engine, DatabaseSession):
+            self.connection.close()
+
+
+# ----------------------------------------------------
+# Context manager class to run statements in a transaction
+# ----------------------------------------------------
+
+
+class TransactionManager:
+    """
+    Context manager class to open a connection and run statements in a transaction, committed on
+    success and rolled back on failure.
+
+    Given a DatabaseSession, it hands out the session's connection. A transactional session is left to
+    commit or roll back when it ends, any other session commits or rolls back every transaction.
+
+    :param engine: (Union[sqlalchemy.engine, DatabaseSession]): Engine or session for connection.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self):
+        if isinstance(self.engine, DatabaseSession):
+            self.connection = self.engine.connection
+        else:
+            self.connection = self.engine.connect()
+            self.connection.begin()
+        return self.connection
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if isinstance(self.engine, DatabaseSession) and self.engine.transactional:
+                return
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            if not isinstance(self.engine, DatabaseSession):
+                self.connection.close()
+
+
+# ----------------------------------------------------
+# Session holding one connection across many function calls
+# ----------------------------------------------------
+
+
+class DatabaseSession:
+    """
+    Holds one connection of an engine, so a sequence of database interaction functions runs on it instead of
+    each checking out its own. Every function taking an engine accepts a session in its place.
+
+    A transactional session runs everything in one transaction, committed when the session ends without an
+    error and rolled back otherwise. A non-transactional session commits after every action query, as the
+    functions do with an engine. Functions that upload with several workers upload sequentially on the
+    session's connection. DDL, e.g. create_table or truncate_table, commits on Oracle regardless.
+
+    The session is used as such::
+
+        with DatabaseSession(engine) as session:
+            create_table(data, table_name, session)
+            upload_data_to_table(data, 1000, table_name, session)
+
+    :param engine: (sqlalchemy.engine): Engine for connection.
+    :param transactional: (bool): Run everything in one transaction.
+    """
+
+    def __init__(self, engine, transactional: bool = True):
+        self.engine = engine
+        self.transactional: bool = transactional
+        self.connection = None
+
+    @property
+    def dialect(self):
+        return self.engine.dialect
+
+    def __enter__(self):
+        self.connection = self.engine.connect()
+        if self.transactional:
+            self.connection.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+    def commit(self) -> None:
+        """
+        Commit the transaction of the session, and start a new one if the session is transactional.
+
+        :return: None
+        """
+        self.connection.commit()
+        if self.transactional:
+            self.connection.begin()
+
+    def rollback(self) -> None:
+        """
+        Roll back the transaction of the session, and start a new one if the session is transactional.
+
+        :return: None
+        """
+        self.connection.rollback()
+        if self.transactional:
+            self.connection.begin()
+
+
+# ----------------------------------------------------
+# Function for creating and testing an async Oracle DB engine
+# ----------------------------------------------------
+
+
+async def create_async_engine(
+    username: str,
+    password: str,
+    database: str,
+    logger: __Logger__ = None,
+    pool_size: int = 30,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = False,
+):
+    """
+    Sets up an async database connection engine used to execute queries from an event loop,
+    with the async_* database interaction functions.
+
+    :param username: (str): Username for DB.
+    :param password: (str): Password for DB.
+    :param database: (str): DB address.
+    :param logger: (logging.Logger): Logger for logging debug and error messages.
+    :param pool_size: (int): Number of connections kept open in the pool.
+    :param max_overflow: (int): Number of connections opened beyond pool_size under load, -1 for no limit.
+    :param pool_timeout: (float): Seconds to wait for a connection when the pool and overflow are used up.
+    :param pool_recycle: (int): Seconds after which a connection is replaced, -1 to never replace connections.
+    :param pool_pre_ping: (bool): Test connections with a round-trip when they are checked out.
+    :return: (sqlalchemy.ext.asyncio.AsyncEngine): Async DB connection engine.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    conn_string: str = "oracle+oracledb_async://" + username + ":" + password + "@" + database
+    engine = __sq_asyncio__.create_async_engine(
+        conn_string,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+    )
+
+    try:
+        async with AsyncConnectionManager(engine):
+            logger.debug("Got DB Connection: " + database)
+    except Exception as e:
+        await engine.dispose()
+        raise bis_code_helpers.LoggedDatabaseError(
+            logger,
+            "Failed to connect to DB: {DB}\n{error}".format(DB=database, error=str(e)),
+        )
+
+    return engine
+
+
+# ----------------------------------------------------
+# Async context manager class to open and close connections as required
+# ----------------------------------------------------
+
+
+class AsyncConnectionManager:
+    """
+    Async context manager class to open and close connections as required.
+
+    :param engine: (sqlalchemy.ext.asyncio.AsyncEngine): Async engine for connection.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        self.connection = await self.engine.connect()
+        return self.connection
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.connection.close()
@@ -4,9 +4,18 @@ import sqlalchemy.engine
 
 import bis_code_helpers
 from typing import Optional as __Optional__
+from typing import Union as __Union__
+from typing import Iterator as __Iterator__
+from typing import Iterable as __Iterable__
 import sqlalchemy as __sq__
 from logging import Logger as __Logger__
+import os as __os__
 import time as __time__
+import math as __math__
+import queue as __queue__
+import threading as __threading__
+from concurrent.futures import ThreadPoolExecutor as __ThreadPoolExecutor__
+from contextlib import contextmanager as __contextmanager__
 
 
 def current_db_compatible_time() -> str:
@@ -17,11 +26,132 @@ def current_db_compatible_time() -> str:
     return date_str
 
 
+def __is_missing_table_error__(error: Exception) -> bool:
+    """
+    Check if a DB error was raised because a table does not exist, on Oracle or the SQLite stand-in.
+
+    :param error: (Exception): Error raised by the DB.
+    :return: (bool): Whether the table does not exist.
+    """
+    return "table or view does not exist" in str(error) or "no such table" in str(error)
+
+
+def __invalidate_cached_results__(table_name: str, engine) -> None:
+    """
+    Forget the cached results of queries reading a table, if the engine caches results.
+
+    :param table_name: (str): Name of table that changed.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :return: None
+    """
+    cache: __Optional__[bis_code_helpers.ResultCache] = bis_code_helpers.get_result_cache(engine)
+    if cache is not None:
+        cache.invalidate(table_name)
+
+
+def __in_session_transaction__(engine) -> bool:
+    """
+    Check if queries on an engine run in the open transaction of a transactional DatabaseSession, so their
+    results may hold rows other connections cannot see and must not be cached.
+
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :return: (bool): Whether a transaction of a session is open.
+    """
+    return (
+        isinstance(engine, bis_code_helpers.DatabaseSession)
+        and engine.transactional
+        and engine.connection is not None
+        and engine.connection.in_transaction()
+    )
+
+
+def __execute_timed__(
+    conn, operation: str, query: str, binds=None, logger: __Logger__ = None, fetch_one: bool = False
+):
+    """
+    Execute a statement on a connection already checked out, timed for the instrumentation sinks like the
+    calls of execute_action_query_on_db.
+
+    :param conn: (sqlalchemy.Connection): Connection to execute on.
+    :param operation: (str): Function making the call.
+    :param query: (str): Statement to execute.
+    :param binds: (Optional[Union[dict, list]]): Bind values for the statement.
+    :param logger: (logging.Logger): Logger for errors raised by sinks.
+    :param fetch_one: (bool): Fetch and return the single row the statement returns.
+    :return: (Union[sqlalchemy.CursorResult, tuple]): Result of the statement, or its row with fetch_one.
+    """
+    timer = bis_code_helpers.query_instrumentation.__start_query__(operation, query, logger)
+    try:
+        result: __sq__.CursorResult = conn.execute(__sq__.text(query), binds)
+        timer.lap("execute")
+        if fetch_one:
+            row: tuple = tuple(result.one())
+            timer.lap("fetch")
+    except Exception as e:
+        timer.finish(error=e)
+        raise
+    if fetch_one:
+        timer.finish(rows=1)
+        return row
+    timer.finish(rows=result.rowcount)
+    return result
+
+
+def __end_transaction_timed__(conn, operation: str, logger: __Logger__ = None, rollback: bool = False) -> None:
+    """
+    Commit or roll back the transaction of a connection, timed for the instrumentation sinks.
+
+    :param conn: (sqlalchemy.Connection): Connection in a transaction.
+    :param operation: (str): Function making the call.
+    :param logger: (logging.Logger): Logger for errors raised by sinks.
+    :param rollback: (bool): Roll back instead of committing.
+    :return: None
+    """
+    timer = bis_code_helpers.query_instrumentation.__start_query__(
+        operation, "ROLLBACK" if rollback else "COMMIT", logger
+    )
+    try:
+        if rollback:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception as e:
+        timer.finish(error=e)
+        raise
+    timer.lap("rollback" if rollback else "commit")
+    timer.finish()
+
+
+@__contextmanager__
+def __timed_transaction__(engine, operation: str, logger: __Logger__ = None):
+    """
+    TransactionManager whose commit is timed for the instrumentation sinks as a call of its own. The
+    statements run in it are timed with __execute_timed__.
+
+    :param engine: (Union[sqlalchemy.engine, DatabaseSession]): Engine or session for connection.
+    :param operation: (str): Function making the calls.
+    :param logger: (logging.Logger): Logger for errors raised by sinks.
+    :return: (sqlalchemy.Connection): Connection in a transaction.
+    """
+    timer = bis_code_helpers.query_instrumentation.__null_query_timer__
+    try:
+        with bis_code_helpers.TransactionManager(engine) as conn:
+            yield conn
+            # A transactional session commits when it ends
+            if not __in_session_transaction__(engine):
+                timer = bis_code_helpers.query_instrumentation.__start_query__(operation, "COMMIT", logger)
+        timer.lap("commit")
+    except Exception as e:
+        timer.finish(error=e)
+        raise
+    timer.finish()
+
+
 def check_existence_of_table(
     table_name: str, engine, logger: __Logger__ = None
 ) -> bool:
     """
-    Check existence of table on database.
+    Check existence of table on database. Answers from the engine's metadata cache when enabled.
 
     :param table_name: (str): Name of table to perform operation on.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
@@ -32,25 +162,49 @@ def check_existence_of_table(
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+    if cache is not None:
+        exists: __Optional__[bool] = cache.get_existence(table_name)
+        if exists is not None:
+            logger.debug(
+                "Table '{table_name}' {state} (cached).".format(
+                    table_name=table_name, state="exists" if exists else "does not exist"
+                )
+            )
+            return exists
+
     query: str = bis_code_helpers.library_backend.generate_check_existence_of_table_query(
         table_name
     )
+    timer = bis_code_helpers.query_instrumentation.__start_query__("check_existence_of_table", query, logger)
     with bis_code_helpers.ConnectionManager(engine) as conn:
+        timer.checked_out(conn)
+        timer.watch_execute(conn)
         try:
             result: __pd__.DataFrame = __pd__.read_sql(query, conn)
+            timer.lap("fetch")
+            timer.finish(rows=len(result))
             if "1" in result.columns:
                 logger.debug(
                     "Table '{table_name}' exists.".format(table_name=table_name)
                 )
+                if cache is not None:
+                    cache.set_existence(table_name, True)
                 return True
-        except __sq__.exc.DatabaseError as error:
-            if "table or view does not exist" in str(error):
+        except (__sq__.exc.DatabaseError, __pd__.errors.DatabaseError) as error:
+            if __is_missing_table_error__(error):
+                timer.finish(rows=0)
                 logger.debug(
                     "Table '{table_name}' does not exist.".format(table_name=table_name)
                 )
+                if cache is not None:
+                    cache.set_existence(table_name, False)
                 return False
             else:
+                timer.finish(error=error)
                 raise bis_code_helpers.LoggedDatabaseError(logger, str(error))
+        finally:
+            timer.unwatch_execute(conn)
 
 
 def get_db_table_column_names(
@@ -58,6 +212,7 @@ def get_db_table_column_names(
 ) -> __Optional__[list]:
     """
     Get column names of table on database. Checks for existence of table first.
+    Answers from the engine's metadata cache when enabled.
 
     :param table_name: (str): Name of table to perform operation on.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
@@ -68,6 +223,13 @@ def get_db_table_column_names(
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+    if cache is not None:
+        col_names: __Optional__[list] = cache.get_column_names(table_name)
+        if col_names is not None:
+            logger.debug("Column Names (cached): {column_names}".format(column_names=col_names))
+            return col_names
+
     if bis_code_helpers.check_existence_of_table(table_name, engine):
         query: str = bis_code_helpers.library_backend.generate_column_names_of_db_table_query(
             table_name
@@ -81,30 +243,107 @@ def get_db_table_column_names(
         )
 
         result: __pd__.DataFrame = bis_code_helpers.execute_select_query_on_db(
-            query, success_msg, error_msg, engine, logger
+            query, success_msg, error_msg, engine, logger, use_result_cache=False
         )
         col_names: list = list(result.columns)
         logger.debug("Column Names: {column_names}".format(column_names=col_names))
+        if cache is not None:
+            cache.set_column_names(table_name, col_names)
         return col_names
     else:
         return None
 
 
+class RowCount(int):
+    """
+    Row count of a table. Behaves as an int and also says how the count was obtained.
+
+    :param value: (int): Number of rows.
+    :param is_exact: (bool): Whether the rows were counted exactly.
+    :param method: (str): 'count', 'statistics' or 'sample'.
+    :param error_bound: (int): Number of rows the estimate may be off by, 0 for exact counts.
+    """
+
+    def __new__(cls, value: int, is_exact: bool = True, method: str = "count", error_bound: int = 0):
+        row_count: RowCount = super(RowCount, cls).__new__(cls, value)
+        row_count.is_exact = is_exact
+        row_count.method = method
+        row_count.error_bound = error_bound
+        return row_count
+
+    def __repr__(self) -> str:
+        if self.is_exact:
+            return "RowCount({value})".format(value=int(self))
+        return "RowCount({value} +/- {error_bound}, {method})".format(
+            value=int(self), error_bound=self.error_bound, method=self.method
+        )
+
+
 def get_db_table_row_count(
-    table_name: str, engine, logger: __Logger__ = None
-) -> __Optional__[int]:
+    table_name: str,
+    engine,
+    logger: __Logger__ = None,
+    estimate: __Optional__[str] = None,
+    sample_percent: float = 1.0,
+    max_statistics_age_days: float = 7,
+) -> __Optional__[RowCount]:
     """
     Get row count of table on database. Checks for existence of table first.
 
+    By default the rows are counted exactly with count(*). Large tables can be estimated instead:
+
+        statistics: the row count of the optimizer statistics. The error bound is the DML recorded by
+        table monitoring since the statistics were gathered.
+
+        sample: count(*) over a SAMPLE BLOCK of sample_percent of the table, scaled up. The error bound
+        is the 95% confidence interval treating the sampled rows as independent, which is optimistic
+        for tables whose rows are clustered in blocks.
+
+    Estimation falls back to an exact count when the statistics are missing, stale or older than
+    max_statistics_age_days, when the sample contains no rows, and on databases other than Oracle.
+
     :param table_name: (str): Name of table to perform operation on.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
     :param logger: (logging.Logger): Logger to use for logging.
-    :return: (int): Number of rows, None if table does not exist.
+    :param estimate: (Optional[str]): None for an exact count, 'statistics' or 'sample' to estimate.
+    :param sample_percent: (float): Percentage of blocks to sample for 'sample'.
+    :param max_statistics_age_days: (float): Oldest statistics accepted for 'statistics'.
+    :return: (RowCount): Number of rows, None if table does not exist.
     """
 
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    if estimate not in (None, "statistics", "sample"):
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Unknown row count estimate '{estimate}', expected None, 'statistics' or 'sample'.".format(
+                estimate=estimate
+            ),
+        )
+
+    if estimate is not None and engine.dialect.name != "oracle":
+        logger.debug(
+            "Row count estimation is only supported on Oracle, counting rows of '{table_name}' exactly.".format(
+                table_name=table_name
+            )
+        )
+    elif estimate == "statistics":
+        row_count: __Optional__[RowCount] = __estimate_row_count_from_statistics__(
+            table_name, engine, logger, max_statistics_age_days
+        )
+        if row_count is not None:
+            return row_count
+    elif estimate == "sample":
+        try:
+            row_count = __estimate_row_count_from_sample__(table_name, engine, logger, sample_percent)
+        except bis_code_helpers.LoggedDatabaseError as error:
+            if __is_missing_table_error__(error):
+                return None
+            raise
+        if row_count is not None:
+            return row_count
+
     query: str = bis_code_helpers.library_backend.generate_get_number_of_rows_of_db_table_query(
         table_name
     )
@@ -118,15 +357,111 @@ def get_db_table_row_count(
 
     try:
         result: __pd__.DataFrame = execute_select_query_on_db(
-            query, success_msg, error_msg, engine, logger
+            query, success_msg, error_msg, engine, logger, use_result_cache=False
         )
-        count: int = result["COUNT(*)"].iloc[0]
-        return count
+        count: int = int(result.iloc[0, 0])
+        return RowCount(count)
     except bis_code_helpers.LoggedDatabaseError as error:
-        if "table or view does not exist" in str(error):
+        if __is_missing_table_error__(error):
             return None
 
 
+def __estimate_row_count_from_statistics__(
+    table_name: str, engine, logger: __Logger__, max_statistics_age_days: float
+) -> __Optional__[RowCount]:
+    """
+    Estimate the row count of a table from its optimizer statistics.
+
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param max_statistics_age_days: (float): Oldest statistics accepted.
+    :return: (Optional[RowCount]): Estimated row count, None if the statistics can not be used.
+    """
+    query, binds = bis_code_helpers.library_backend.generate_table_statistics_query(table_name)
+
+    success_msg: str = "Successfully retrieved statistics for table '{table_name}'.".format(
+        table_name=table_name
+    )
+    error_msg: str = "Failed to retrieve statistics for table '{table_name}'.".format(
+        table_name=table_name
+    )
+
+    result: __pd__.DataFrame = execute_select_query_on_db(
+        query, success_msg, error_msg, engine, logger, binds, use_result_cache=False
+    )
+    result.columns = [x.lower() for x in result.columns]
+
+    if len(result) == 0 or __pd__.isna(result["num_rows"].iloc[0]) or __pd__.isna(result["last_analyzed"].iloc[0]):
+        reason: str = "missing"
+    elif result["stale_stats"].iloc[0] == "YES":
+        reason = "stale"
+    elif __pd__.Timestamp.now() - __pd__.Timestamp(result["last_analyzed"].iloc[0]) > __pd__.Timedelta(
+        days=max_statistics_age_days
+    ):
+        reason = "older than {days} days".format(days=max_statistics_age_days)
+    else:
+        modifications: int = int(__pd__.Series([result["inserts"].iloc[0], result["deletes"].iloc[0]]).fillna(0).sum())
+        return RowCount(
+            int(result["num_rows"].iloc[0]), is_exact=False, method="statistics", error_bound=modifications
+        )
+
+    logger.debug(
+        "Statistics of '{table_name}' are {reason}, counting rows exactly.".format(
+            table_name=table_name, reason=reason
+        )
+    )
+    return None
+
+
+def __estimate_row_count_from_sample__(
+    table_name: str, engine, logger: __Logger__, sample_percent: float
+) -> __Optional__[RowCount]:
+    """
+    Estimate the row count of a table by counting the rows in a block sample.
+
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param sample_percent: (float): Percentage of blocks to sample.
+    :return: (Optional[RowCount]): Estimated row count, None if the sample contained no rows.
+    """
+    if not 0 < sample_percent < 100:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Sample percent must be greater than 0 and less than 100, got {sample_percent}.".format(
+                sample_percent=sample_percent
+            ),
+        )
+
+    query: str = bis_code_helpers.library_backend.generate_sample_row_count_query(
+        table_name, sample_percent
+    )
+
+    success_msg: str = "Successfully sampled row count for table '{table_name}'.".format(
+        table_name=table_name
+    )
+    error_msg: str = "Failed to sample row count for table '{table_name}'.".format(
+        table_name=table_name
+    )
+
+    result: __pd__.DataFrame = execute_select_query_on_db(
+        query, success_msg, error_msg, engine, logger, use_result_cache=False
+    )
+    sampled_rows: int = int(result.iloc[0, 0])
+    if sampled_rows == 0:
+        logger.debug(
+            "Sample of '{table_name}' contained no rows, counting rows exactly.".format(table_name=table_name)
+        )
+        return None
+
+    fraction: float = sample_percent / 100
+    error_bound: float = 1.96 * __math__.sqrt(sampled_rows * (1 - fraction)) / fraction
+    return RowCount(
+        round(sampled_rows / fraction), is_exact=False, method="sample", error_bound=__math__.ceil(error_bound)
+    )
+
+
 def truncate_table(table_name: str, engine, logger: __Logger__ = None) -> None:
     """
     Truncate staging or prod table. Checks for existence of table first.
@@ -156,6 +491,11 @@ def truncate_table(table_name: str, engine, logger: __Logger__ = None) -> None:
             query, success_msg, error_msg, engine, logger
         )
 
+        cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+        if cache is not None:
+            cache.set_existence(table_name, True)
+        __invalidate_cached_results__(table_name, engine)
+
 
 def drop_table(table_name: str, engine, logger: __Logger__ = None) -> None:
     """
@@ -172,7 +512,7 @@ def drop_table(table_name: str, engine, logger: __Logger__ = None) -> None:
 
     if bis_code_helpers.check_existence_of_table(table_name, engine):
         query: str = bis_code_helpers.library_backend.generate_drop_db_table_query(
-            table_name
+            table_name, engine.dialect.name
         )
 
         success_msg: str = "Successfully dropped '{table_name}'".format(
@@ -184,9 +524,14 @@ def drop_table(table_name: str, engine, logger: __Logger__ = None) -> None:
             query, success_msg, error_msg, engine, logger
         )
 
+        cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+        if cache is not None:
+            cache.set_existence(table_name, False)
+        __invalidate_cached_results__(table_name, engine)
+
 
 def create_table(
-    data_results: __pd__.DataFrame,
+    data_results: __Union__[__pd__.DataFrame, "bis_code_helpers.library_backend.SchemaInferrer"],
     table_name: str,
     engine,
     allow_nulls: bool = True,
@@ -195,7 +540,8 @@ def create_table(
     """
     Create a table based on the given DataFrame, automatically choosing data types.
 
-    :param data_results: (pd.DataFrame): Data to use for generating column names and data types.
+    :param data_results: (Union[pd.DataFrame, SchemaInferrer]): Data to use for generating column names and
+        data types, or a SchemaInferrer already updated with the data.
     :param table_name: (str): Name of table to perform operation on.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
     :param allow_nulls: (bool): Allow nulls in table.
@@ -224,11 +570,21 @@ def create_table(
             create_query, success_msg, error_msg, engine, logger
         )
 
+        cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+        if cache is not None:
+            cache.invalidate(table_name)
+            cache.set_existence(table_name, True)
+
     else:
         # Formatting
         db_col_names: list = [x.upper() for x in db_col_names]
+        data_col_names: list = (
+            data_results.column_names
+            if isinstance(data_results, bis_code_helpers.library_backend.SchemaInferrer)
+            else list(data_results.columns)
+        )
         new_data_col_names: list = [
-            x.upper().replace(" ", "_") for x in list(data_results.columns)
+            x.upper().replace(" ", "_") for x in data_col_names
         ]
 
         # Convert to sets for comparison operations
@@ -255,85 +611,876 @@ def create_table(
 
 def upload_data_to_table(
     table_data: __pd__.DataFrame,
-    upload_partition_size: int,
+    upload_partition_size: __Union__[int, str],
     table_name: str,
     engine,
     logger: __Logger__ = None,
+    use_bind_variables: bool = False,
+    max_workers: int = 1,
+    commit_policy: str = "best_effort",
+    target_partition_seconds: float = 1.0,
+    max_partition_bytes: int = 16 * 2 ** 20,
 ) -> None:
     """
     Upload data in table_data DataFrame to table.
 
+    By default each partition is sent as a literal INSERT ALL statement, with single quotes stripped
+    from strings. With use_bind_variables each partition is instead sent as one prepared INSERT statement
+    executed with array binding (executemany), so the statement text is the same for every partition and
+    call, is parsed once, and values keep their types. Single quotes in strings are then kept as is,
+    and to_date(...) strings are bound as datetimes.
+
+    With max_workers above 1 the partitions are uploaded concurrently, each worker on its own
+    connection from the engine's pool. The commit_policy decides what happens when partitions fail:
+
+        best_effort: each partition is committed on its own. Every partition is attempted, and the
+        failed row ranges are reported together once all workers are done.
+
+        all_or_nothing: nothing is committed unless every partition succeeded. With one worker the
+        partitions are uploaded in one transaction, committed once at the end. With max_workers above 1
+        the workers upload into a staging table, an empty copy of the table, which is then copied into the
+        table with one INSERT ... SELECT and dropped.
+
+    With upload_partition_size="auto" the partition size is adjusted while the upload runs, from the
+    measured time and bytes of each partition, towards partitions taking target_partition_seconds and
+    sending at most max_partition_bytes of SQL or bind values. The chosen sizes are logged.
+
     :param table_data: (pandas.DataFrame): data to be uploaded.
-    :param upload_partition_size: (int): Number of rows to upload at a time.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload at a time, or "auto".
     :param table_name: (str): Name of table to perform operation on.
     :param engine: (sqlalchemy.engine) DB engine used for DB connection.
     :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload partitions with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions to upload concurrently.
+    :param commit_policy: (str): 'best_effort' or 'all_or_nothing'.
+    :param target_partition_seconds: (float): Seconds a partition should take with upload_partition_size="auto".
+    :param max_partition_bytes: (int): Most bytes a partition may send with upload_partition_size="auto".
     :return: None
     """
 
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
-    iterator_index: int = 0
+    if commit_policy not in ("best_effort", "all_or_nothing"):
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Unknown commit policy '{commit_policy}', expected 'best_effort' or 'all_or_nothing'.".format(
+                commit_policy=commit_policy
+            ),
+        )
+
+    # A session has a single connection to upload on
+    is_session: bool = isinstance(engine, bis_code_helpers.DatabaseSession)
+    if is_session and max_workers > 1:
+        logger.debug("Uploading to '{table_name}' sequentially on the session's connection.".format(
+            table_name=table_name
+        ))
+        max_workers = 1
+
+    # Concurrent workers commit on their own connections, so they upload into a staging table that is
+    # copied into the table with a single statement
+    if commit_policy == "all_or_nothing" and max_workers > 1:
+        __upload_via_staging_table__(
+            table_data,
+            upload_partition_size,
+            table_name,
+            engine,
+            logger,
+            use_bind_variables,
+            max_workers,
+            target_partition_seconds,
+            max_partition_bytes,
+        )
+        return
+
     data_num_records: int = len(table_data.index)
 
-    # Strip illegal characters
-    for col_name in table_data.columns:
-        if table_data[col_name].dtype == object and table_data[col_name].str.contains("to_date").sum() == 0:
-            table_data[col_name].replace({"'": ""}, regex=True, inplace=True)
-            table_data[col_name].replace({",": ""}, inplace=True)
+    table_data = __sanitize_upload_data__(table_data, use_bind_variables)
+
+    auto_partition_size: bool = upload_partition_size == "auto"
+    if auto_partition_size:
+        partitions = bis_code_helpers.library_backend.AdaptivePartitionSizer(
+            data_num_records, target_partition_seconds, max_partition_bytes
+        )
+    else:
+        partitions = __get_upload_partitions__(data_num_records, upload_partition_size)
+
+    def upload_partition(partition: tuple, conn=None) -> None:
+        start, end, first_row, last_row = partition
+        started: float = __time__.perf_counter()
+        query, binds = __generate_upload_query__(
+            table_data[start:end], table_name, use_bind_variables,
+        )
+        success_msg: str = "Uploaded rows: {a} - {b} to '{table_name}'".format(
+            a=str(first_row), b=str(last_row), table_name=table_name,
+        )
+        error_msg: str = "Failed to upload rows: {a} - {b} to '{table_name}'".format(
+            a=str(first_row), b=str(last_row), table_name=table_name,
+        )
 
-        if table_data[col_name].dtype == object:
-            table_data[col_name] = table_data[col_name].str[0:3975]
+        if use_bind_variables and len(binds) == 0:
+            return
 
-    while (iterator_index + 1) * upload_partition_size < data_num_records:
+        if conn is None:
+            bis_code_helpers.execute_action_query_on_db(
+                query, success_msg, error_msg, engine, logger, binds
+            )
+        else:
+            try:
+                __execute_timed__(conn, "upload_data_to_table", query, binds, logger)
+                logger.debug(success_msg)
+            except Exception as e:
+                logger.error(error_msg)
+                raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+
+        if auto_partition_size:
+            num_bytes: int = (
+                int(table_data[start:end].memory_usage(index=False, deep=True).sum())
+                if use_bind_variables
+                else len(query)
+            )
+            previous_size: int = partitions.size
+            next_size: int = partitions.record(end - start, __time__.perf_counter() - started, num_bytes)
+            if next_size != previous_size:
+                logger.debug(
+                    "Upload partition size for '{table_name}' set to {size} rows.".format(
+                        table_name=table_name, size=next_size
+                    )
+                )
+
+    # Sequential upload, a commit per partition
+    if max_workers <= 1 and commit_policy == "best_effort":
+        try:
+            for partition in partitions:
+                upload_partition(partition)
+        finally:
+            __invalidate_cached_results__(table_name, engine)
+        __log_partition_sizes__(partitions, table_name, logger)
+        return
 
-        query: str = bis_code_helpers.library_backend.generate_insert_query(
-            table_data[
-                iterator_index
-                * upload_partition_size : (iterator_index + 1)
-                * upload_partition_size
-            ],
+    failed_partitions: list = []
+
+    if commit_policy == "best_effort":
+
+        def upload_best_effort(partition: tuple) -> None:
+            try:
+                upload_partition(partition)
+            except bis_code_helpers.LoggedDatabaseError:
+                failed_partitions.append(partition)
+
+        __map_partitions_concurrently__(upload_best_effort, partitions, max_workers)
+        __invalidate_cached_results__(table_name, engine)
+
+    else:
+        # One transaction on one connection, so every partition is committed at once or not at all
+        conn = engine.connection if is_session else engine.connect()
+        try:
+            if not is_session:
+                conn.begin()
+            for partition in partitions:
+                try:
+                    upload_partition(partition, conn)
+                except bis_code_helpers.LoggedDatabaseError:
+                    failed_partitions.append(partition)
+                    break
+
+            # A transactional session commits or rolls back when it ends
+            if not (is_session and engine.transactional):
+                __end_transaction_timed__(conn, "upload_data_to_table", logger, rollback=len(failed_partitions) > 0)
+        except bis_code_helpers.LoggedDatabaseError:
+            raise
+        except Exception as e:
+            raise bis_code_helpers.LoggedDatabaseError(
+                logger,
+                "Failed to commit upload to '{table_name}' (nothing committed): {error}".format(
+                    table_name=table_name, error=str(e)
+                ),
+            )
+        finally:
+            if not is_session:
+                conn.close()
+            __invalidate_cached_results__(table_name, engine)
+
+    __log_partition_sizes__(partitions, table_name, logger)
+
+    if len(failed_partitions) > 0:
+        failed_ranges: str = ", ".join(
+            ["{a} - {b}".format(a=first_row, b=last_row) for _, _, first_row, last_row in sorted(failed_partitions)]
+        )
+        raise bis_code_helpers.LoggedDatabaseError(
+            logger,
+            "Failed to upload {failed} of {total} partitions to '{table_name}' ({policy}), rows: {ranges}".format(
+                failed=len(failed_partitions),
+                total=len(partitions.sizes) if auto_partition_size else len(partitions),
+                table_name=table_name,
+                policy="nothing committed" if commit_policy == "all_or_nothing" else "other partitions committed",
+                ranges=failed_ranges,
+            ),
+        )
+
+
+def __upload_via_staging_table__(
+    table_data: __pd__.DataFrame,
+    upload_partition_size: __Union__[int, str],
+    table_name: str,
+    engine,
+    logger: __Logger__,
+    use_bind_variables: bool,
+    max_workers: int,
+    target_partition_seconds: float,
+    max_partition_bytes: int,
+) -> None:
+    """
+    Upload data concurrently into a staging table, an empty copy of the table, and copy it into the table
+    with one INSERT ... SELECT, so the rows are committed to the table at once or not at all.
+    The staging table is dropped once the upload is done, whether it succeeded or not.
+
+    :param table_data: (pandas.DataFrame): data to be uploaded.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload at a time, or "auto".
+    :param table_name: (str): Name of table to upload to.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload partitions with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions to upload concurrently.
+    :param target_partition_seconds: (float): Seconds a partition should take with upload_partition_size="auto".
+    :param max_partition_bytes: (int): Most bytes a partition may send with upload_partition_size="auto".
+    :return: None
+    """
+    staging_table_name: str = "{table_name}_STG".format(table_name=table_name)
+    try:
+        __stage_data__(
+            table_data,
             table_name,
+            staging_table_name,
+            engine,
+            upload_partition_size,
+            logger,
+            use_bind_variables,
+            max_workers,
+            copy_table_structure=True,
+            target_partition_seconds=target_partition_seconds,
+            max_partition_bytes=max_partition_bytes,
         )
-        success_msg: str = "Uploaded rows: {a} - {b} to '{table_name}'".format(
-            a=str(iterator_index * upload_partition_size),
-            b=str((iterator_index + 1) * upload_partition_size - 1),
-            table_name=table_name,
+        bis_code_helpers.execute_action_query_on_db(
+            bis_code_helpers.library_backend.generate_table_to_table_insert_query(staging_table_name, table_name),
+            "Copied '{staging}' into '{table_name}'.".format(staging=staging_table_name, table_name=table_name),
+            "Failed to copy '{staging}' into '{table_name}'.".format(staging=staging_table_name, table_name=table_name),
+            engine,
+            logger,
         )
+    except (bis_code_helpers.LoggedDatabaseError, bis_code_helpers.LoggedDataError) as e:
+        raise bis_code_helpers.LoggedDatabaseError(
+            logger,
+            "Failed to upload to '{table_name}' (nothing committed): {error}".format(
+                table_name=table_name, error=str(e)
+            ),
+        )
+    finally:
+        __invalidate_cached_results__(table_name, engine)
+        __drop_leftover_table__(staging_table_name, engine, logger)
 
-        error_msg: str = "Failed to upload rows: {a} - {b} to '{table_name}'".format(
-            a=str(iterator_index * upload_partition_size),
-            b=str((iterator_index + 1) * upload_partition_size - 1),
+
+def __map_partitions_concurrently__(function, partitions, max_workers: int) -> None:
+    """
+    Call a function on every partition with max_workers threads. Each thread takes the next partition
+    only once it is done with its last, so adaptively sized partitions see the latest measurements.
+
+    :param function: (Callable): Function to call on each partition.
+    :param partitions: (Iterable): Partitions, a list or an AdaptivePartitionSizer.
+    :param max_workers: (int): Number of threads.
+    :return: None
+    """
+    partition_iterator = iter(partitions)
+    lock: __threading__.Lock = __threading__.Lock()
+
+    def next_partition() -> __Optional__[tuple]:
+        with lock:
+            return next(partition_iterator, None)
+
+    def work(_) -> None:
+        partition: __Optional__[tuple] = next_partition()
+        while partition is not None:
+            function(partition)
+            partition = next_partition()
+
+    with __ThreadPoolExecutor__(max_workers=max_workers) as executor:
+        list(executor.map(work, range(max_workers)))
+
+
+def __log_partition_sizes__(partitions, table_name: str, logger: __Logger__) -> None:
+    """
+    Log the partition sizes an adaptively sized upload settled on, to be used as a fixed size later.
+
+    :param partitions: (Iterable): Partitions of the upload, only AdaptivePartitionSizer partitions are logged.
+    :param table_name: (str): Name of table uploaded to.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: None
+    """
+    if not isinstance(partitions, bis_code_helpers.library_backend.AdaptivePartitionSizer):
+        return
+    logger.info(
+        "Uploaded {rows} rows to '{table_name}' in {n} partitions of {min_size} - {max_size} rows, settled on {size} rows.".format(
+            rows=partitions.num_rows,
             table_name=table_name,
+            n=len(partitions.sizes),
+            min_size=min(partitions.sizes, default=0),
+            max_size=max(partitions.sizes, default=0),
+            size=partitions.size,
         )
+    )
 
-        bis_code_helpers.execute_action_query_on_db(
-            query, success_msg, error_msg, engine, logger
+
+def __sanitize_upload_data__(table_data: __pd__.DataFrame, use_bind_variables: bool) -> __pd__.DataFrame:
+    """
+    Strip characters that break literal SQL from the strings of data to be uploaded and truncate them
+    to fit a VARCHAR2. The given DataFrame is left untouched, only its string columns are copied.
+
+    :param table_data: (pandas.DataFrame): data to be uploaded.
+    :param use_bind_variables: (bool): Whether the data is uploaded with bind variables, which keep quotes and commas.
+    :return: (pandas.DataFrame): Sanitized data.
+    """
+    sanitized_columns: dict = {}
+    for col_name in table_data.columns:
+        column: __pd__.Series = table_data[col_name]
+        if not (column.dtype == object or isinstance(column.dtype, __pd__.StringDtype)):
+            continue
+
+        # Strip illegal characters
+        if not use_bind_variables and column.str.contains("to_date").sum() == 0:
+            column = column.replace({"'": ""}, regex=True)
+            column = column.replace({",": ""})
+
+        sanitized_columns[col_name] = column.str[0:3975]
+
+    if len(sanitized_columns) == 0:
+        return table_data
+    table_data = table_data.copy(deep=False)
+    for col_name, column in sanitized_columns.items():
+        table_data[col_name] = column
+    return table_data
+
+
+def __get_upload_partitions__(data_num_records: int, upload_partition_size: int) -> list:
+    """
+    Split the rows of an upload into partitions.
+
+    :param data_num_records: (int): Number of rows to upload.
+    :param upload_partition_size: (int): Number of rows to upload at a time.
+    :return: (list): (start, end, first_row, last_row) per partition, start and end for slicing and
+        first_row and last_row for the row range reported in log messages.
+    """
+    partitions: list = []
+    iterator_index: int = 0
+    while (iterator_index + 1) * upload_partition_size < data_num_records:
+        partitions.append(
+            (
+                iterator_index * upload_partition_size,
+                (iterator_index + 1) * upload_partition_size,
+                iterator_index * upload_partition_size,
+                (iterator_index + 1) * upload_partition_size - 1,
+            )
         )
         iterator_index += 1
 
     # Final non divisible rows
-    query: str = bis_code_helpers.library_backend.generate_insert_query(
-        table_data[iterator_index * upload_partition_size :], table_name,
+    partitions.append(
+        (
+            iterator_index * upload_partition_size,
+            data_num_records,
+            iterator_index * upload_partition_size,
+            data_num_records,
+        )
     )
+    return partitions
 
-    success_msg: str = "Uploaded rows: {a} - {b} to '{table_name}'".format(
-        a=str(iterator_index * upload_partition_size),
-        b=str(data_num_records),
-        table_name=table_name,
+
+def __generate_upload_query__(
+    partition: __pd__.DataFrame, table_name: str, use_bind_variables: bool
+) -> tuple:
+    """
+    Generate the query and binds used to upload one partition of data.
+
+    :param partition: (pandas.DataFrame): Rows to be uploaded.
+    :param table_name: (str): Name of table to upload to.
+    :param use_bind_variables: (bool): Generate a bind variable query instead of literal SQL.
+    :return: (tuple): (query, binds), binds is None for literal SQL.
+    """
+    if use_bind_variables:
+        return bis_code_helpers.library_backend.generate_insert_bind_query(
+            partition, table_name
+        )
+    return bis_code_helpers.library_backend.generate_insert_query(partition, table_name), None
+
+
+def upload_data_stream_to_table(
+    source: __Union__[str, __os__.PathLike, __Iterable__[__pd__.DataFrame]],
+    table_name: str,
+    engine,
+    chunk_size: int = 100000,
+    upload_partition_size: __Union__[int, str] = 10000,
+    logger: __Logger__ = None,
+    use_bind_variables: bool = True,
+    max_workers: int = 1,
+    commit_policy: str = "best_effort",
+    schema_chunks: __Optional__[int] = 1,
+    allow_nulls: bool = True,
+    read_options: __Optional__[dict] = None,
+) -> int:
+    """
+    Upload data too large for memory to table, reading it a chunk of at most chunk_size rows at a time,
+    so memory use depends on chunk_size and not on the size of the data.
+
+    The source is an iterable of DataFrames, or the path of a CSV file (read with pandas.read_csv, compressed
+    files included) or a Parquet file (read with pyarrow). If the table does not exist it is created by
+    create_table, with data types inferred from the first schema_chunks chunks. Strings longer than any seen
+    in those chunks will fail to upload, so for files schema_chunks=None reads the whole file once to infer
+    the schema before uploading it. Each chunk is uploaded as by upload_data_to_table, and committed on its own.
+
+    :param source: (Union[str, os.PathLike, Iterable[pandas.DataFrame]]): Data to be uploaded.
+    :param table_name: (str): Name of table to perform operation on.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param chunk_size: (int): Most rows held in memory at a time, larger DataFrames from the source are split.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload at a time, or "auto".
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload partitions with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions of a chunk to upload concurrently.
+    :param commit_policy: (str): 'best_effort' or 'all_or_nothing', applied per chunk.
+    :param schema_chunks: (Optional[int]): Number of chunks to infer data types from, None for the whole file.
+    :param allow_nulls: (bool): Allow nulls in a created table.
+    :param read_options: (Optional[dict]): Keyword arguments for pandas.read_csv or pyarrow.parquet.ParquetFile.iter_batches.
+    :return: (int): Number of rows uploaded.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    is_path: bool = isinstance(source, (str, __os__.PathLike))
+    if schema_chunks is None and not is_path:
+        raise bis_code_helpers.LoggedValueError(
+            logger, "Inferring the schema from all chunks needs a file path to read twice, not an iterable."
+        )
+
+    schema: bis_code_helpers.library_backend.SchemaInferrer = bis_code_helpers.library_backend.SchemaInferrer()
+    if schema_chunks is None:
+        for chunk in __iterate_upload_chunks__(source, chunk_size, read_options, logger):
+            schema.update(chunk)
+
+    chunks: __Iterator__[__pd__.DataFrame] = __iterate_upload_chunks__(source, chunk_size, read_options, logger)
+    schema_sample: list = []
+    if schema_chunks is not None:
+        for chunk in chunks:
+            schema.update(chunk)
+            schema_sample.append(chunk)
+            if len(schema_sample) >= schema_chunks:
+                break
+
+    if len(schema.column_names) == 0:
+        raise bis_code_helpers.LoggedDataError(
+            logger, "No columns to upload to '{table_name}'.".format(table_name=table_name)
+        )
+    create_table(schema, table_name, engine, allow_nulls, logger)
+
+    def chunks_to_upload() -> __Iterator__[__pd__.DataFrame]:
+        # Release the chunks read for the schema as they are uploaded
+        while len(schema_sample) > 0:
+            yield schema_sample.pop(0)
+        yield from chunks
+
+    num_rows: int = 0
+    for chunk in chunks_to_upload():
+        upload_data_to_table(
+            chunk,
+            upload_partition_size,
+            table_name,
+            engine,
+            logger,
+            use_bind_variables=use_bind_variables,
+            max_workers=max_workers,
+            commit_policy=commit_policy,
+        )
+        num_rows += len(chunk.index)
+        logger.debug(
+            "Uploaded {rows} rows to '{table_name}' so far.".format(rows=num_rows, table_name=table_name)
+        )
+
+    return num_rows
+
+
+def __iterate_upload_chunks__(
+    source: __Union__[str, __os__.PathLike, __Iterable__[__pd__.DataFrame]],
+    chunk_size: int,
+    read_options: __Optional__[dict],
+    logger: __Logger__,
+) -> __Iterator__[__pd__.DataFrame]:
+    """
+    Read data to be uploaded as DataFrames of at most chunk_size rows.
+
+    :param source: (Union[str, os.PathLike, Iterable[pandas.DataFrame]]): CSV or Parquet file, or DataFrames.
+    :param chunk_size: (int): Most rows per DataFrame.
+    :param read_options: (Optional[dict]): Keyword arguments for the file reader.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (Iterator[pandas.DataFrame]): Chunks of data.
+    """
+    read_options = read_options or {}
+
+    if isinstance(source, (str, __os__.PathLike)):
+        path: str = __os__.fspath(source)
+        if path.lower().endswith((".parquet", ".pq")):
+            __import_pyarrow__(logger)
+            import pyarrow.parquet as __pq__
+
+            for batch in __pq__.ParquetFile(path).iter_batches(batch_size=chunk_size, **read_options):
+                yield batch.to_pandas()
+        else:
+            with __pd__.read_csv(path, chunksize=chunk_size, **read_options) as reader:
+                yield from reader
+        return
+
+    for data in source:
+        for start in range(0, max(len(data.index), 1), chunk_size):
+            yield data.iloc[start : start + chunk_size]
+
+
+def load_data_via_staging_table(
+    table_data: __pd__.DataFrame,
+    table_name: str,
+    engine,
+    upload_partition_size: __Union__[int, str] = 10000,
+    publish_mode: str = "append",
+    staging_table_name: __Optional__[str] = None,
+    logger: __Logger__ = None,
+    use_bind_variables: bool = True,
+    max_workers: int = 1,
+) -> int:
+    """
+    Load data into a table through a staging table, so readers of the table never see a partial load.
+
+    The data is uploaded into a fresh staging table created by create_table, its row count is checked
+    against the data, and it is then published with one server-side operation:
+
+        append: the staged rows are copied into the table (created first if it does not exist) with a
+        direct-path INSERT /*+ APPEND */ ... SELECT, committed as one transaction.
+
+        swap: the table is renamed out of the way and the staging table renamed in its place, after which
+        the old table is dropped. On Oracle both renames are sent as one PL/SQL call, but they are DDL, so
+        queries in the moment between them can fail to find the table. Grants, indexes and constraints of
+        the old table are not carried over.
+
+    The staging table is dropped once the load is done, whether it succeeded or not.
+
+    :param table_data: (pandas.DataFrame): Data to be loaded.
+    :param table_name: (str): Name of table to load into.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload to the staging table at a time, or "auto".
+    :param publish_mode: (str): 'append' or 'swap'.
+    :param staging_table_name: (Optional[str]): Name of staging table, defaults to the table name suffixed with _STG.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload to the staging table with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions to upload to the staging table concurrently.
+    :return: (int): Number of rows published.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    if publish_mode not in ("append", "swap"):
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Unknown publish mode '{publish_mode}', expected 'append' or 'swap'.".format(
+                publish_mode=publish_mode
+            ),
+        )
+
+    if staging_table_name is None:
+        staging_table_name = "{table_name}_STG".format(table_name=table_name)
+
+    data_num_records: int = len(table_data.index)
+
+    try:
+        __stage_data__(
+            table_data,
+            table_name,
+            staging_table_name,
+            engine,
+            upload_partition_size,
+            logger,
+            use_bind_variables,
+            max_workers,
+        )
+
+        if publish_mode == "append":
+            __publish_staging_table_by_append__(
+                table_data, table_name, staging_table_name, engine, logger
+            )
+        else:
+            __publish_staging_table_by_swap__(table_name, staging_table_name, engine, logger)
+    finally:
+        __invalidate_cached_results__(table_name, engine)
+        __drop_leftover_table__(staging_table_name, engine, logger)
+
+    return data_num_records
+
+
+def __drop_leftover_table__(table_name: str, engine, logger: __Logger__) -> None:
+    """
+    Drop a staging or backup table when cleaning up. A failure is only logged, so it neither hides the
+    outcome of the load nor replaces the error the load raised.
+
+    :param table_name: (str): Name of table to drop.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: None
+    """
+    try:
+        drop_table(table_name, engine, logger)
+    except bis_code_helpers.LoggedDatabaseError:
+        logger.warning("Table '{table_name}' was left in place, drop it manually.".format(table_name=table_name))
+
+
+def __stage_data__(
+    table_data: __pd__.DataFrame,
+    table_name: str,
+    staging_table_name: str,
+    engine,
+    upload_partition_size: __Union__[int, str],
+    logger: __Logger__,
+    use_bind_variables: bool,
+    max_workers: int,
+    copy_table_structure: bool = False,
+    **upload_options,
+) -> None:
+    """
+    Upload data into a fresh staging table and check that every row arrived.
+
+    :param table_data: (pandas.DataFrame): Data to be staged.
+    :param table_name: (str): Name of table the data is staged for, used in messages.
+    :param staging_table_name: (str): Name of staging table.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload at a time, or "auto".
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions to upload concurrently.
+    :param copy_table_structure: (bool): Create the staging table as an empty copy of the table, not from the data.
+    :param upload_options: More keyword arguments for upload_data_to_table.
+    :return: None
+    """
+    drop_table(staging_table_name, engine, logger)
+    if copy_table_structure:
+        bis_code_helpers.execute_action_query_on_db(
+            bis_code_helpers.library_backend.generate_empty_table_copy_query(table_name, staging_table_name),
+            "Created '{staging}' as an empty copy of '{table_name}'.".format(
+                staging=staging_table_name, table_name=table_name
+            ),
+            "Failed to create '{staging}' as an empty copy of '{table_name}'.".format(
+                staging=staging_table_name, table_name=table_name
+            ),
+            engine,
+            logger,
+        )
+        cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+        if cache is not None:
+            cache.invalidate(staging_table_name)
+            cache.set_existence(staging_table_name, True)
+    else:
+        create_table(table_data, staging_table_name, engine, logger=logger)
+    upload_data_to_table(
+        table_data,
+        upload_partition_size,
+        staging_table_name,
+        engine,
+        logger,
+        use_bind_variables=use_bind_variables,
+        max_workers=max_workers,
+        **upload_options,
     )
 
-    error_msg: str = "Failed to upload rows: {a} - {b} to '{table_name}'".format(
-        a=str(iterator_index * upload_partition_size),
-        b=str(data_num_records),
-        table_name=table_name,
+    data_num_records: int = len(table_data.index)
+    staged_num_records: int = get_db_table_row_count(staging_table_name, engine, logger)
+    if staged_num_records != data_num_records:
+        raise bis_code_helpers.LoggedDataError(
+            logger,
+            "Staging table '{staging}' holds {staged} rows, expected {expected}, not publishing to '{table_name}'.".format(
+                staging=staging_table_name,
+                staged=staged_num_records,
+                expected=data_num_records,
+                table_name=table_name,
+            ),
+        )
+
+
+def __publish_staging_table_by_append__(
+    table_data: __pd__.DataFrame, table_name: str, staging_table_name: str, engine, logger: __Logger__
+) -> None:
+    """
+    Copy all rows of a staging table into a table with one direct-path insert, creating the table if needed.
+
+    :param table_data: (pandas.DataFrame): Data that was staged, used to create the table.
+    :param table_name: (str): Name of table to publish to.
+    :param staging_table_name: (str): Name of staging table.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: None
+    """
+    create_table(table_data, table_name, engine, logger=logger)
+
+    query: str = bis_code_helpers.library_backend.generate_table_to_table_insert_query(
+        staging_table_name,
+        table_name,
+        column_names=get_db_table_column_names(staging_table_name, engine, logger),
+        direct_path=True,
     )
+    success_msg: str = "Published '{staging}' to '{table_name}'.".format(
+        staging=staging_table_name, table_name=table_name
+    )
+    error_msg: str = "Failed to publish '{staging}' to '{table_name}'.".format(
+        staging=staging_table_name, table_name=table_name
+    )
+    bis_code_helpers.execute_action_query_on_db(query, success_msg, error_msg, engine, logger)
 
-    bis_code_helpers.execute_action_query_on_db(
-        query, success_msg, error_msg, engine, logger
+
+def __publish_staging_table_by_swap__(
+    table_name: str, staging_table_name: str, engine, logger: __Logger__
+) -> None:
+    """
+    Rename a staging table in place of a table and drop the replaced table.
+
+    :param table_name: (str): Name of table to replace.
+    :param staging_table_name: (str): Name of staging table.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: None
+    """
+    backup_table_name: __Optional__[str] = None
+    if check_existence_of_table(table_name, engine, logger):
+        backup_table_name = "{table_name}_OLD".format(table_name=table_name)
+        drop_table(backup_table_name, engine, logger)
+
+    statements: list = bis_code_helpers.library_backend.generate_table_swap_query(
+        table_name, staging_table_name, backup_table_name, engine.dialect.name
+    )
+    try:
+        with __timed_transaction__(engine, "load_data_via_staging_table", logger) as conn:
+            for statement in statements:
+                __execute_timed__(conn, "load_data_via_staging_table", statement, logger=logger)
+        logger.debug(
+            "Swapped '{staging}' in place of '{table_name}'.".format(
+                staging=staging_table_name, table_name=table_name
+            )
+        )
+    except Exception as e:
+        logger.error(
+            "Failed to swap '{staging}' in place of '{table_name}'.".format(
+                staging=staging_table_name, table_name=table_name
+            )
+        )
+        raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    finally:
+        cache: __Optional__[bis_code_helpers.TableMetadataCache] = bis_code_helpers.get_metadata_cache(engine)
+        if cache is not None:
+            for x in [table_name, staging_table_name, backup_table_name]:
+                if x is not None:
+                    cache.invalidate(x)
+
+    if backup_table_name is not None:
+        __drop_leftover_table__(backup_table_name, engine, logger)
+
+
+def upsert_data_to_table(
+    table_data: __pd__.DataFrame,
+    table_name: str,
+    key_columns: list,
+    engine,
+    upload_partition_size: __Union__[int, str] = 10000,
+    staging_table_name: __Optional__[str] = None,
+    logger: __Logger__ = None,
+    use_bind_variables: bool = True,
+    max_workers: int = 1,
+) -> int:
+    """
+    Insert or update the rows of a DataFrame in a table, matching rows on the key columns.
+
+    The rows are uploaded in bulk into a staging table (see load_data_via_staging_table) and applied with
+    a single MERGE statement, or INSERT ... ON CONFLICT on the SQLite stand-in, which needs a unique index
+    on the key columns of the table. The table must already exist. The staging table is dropped once
+    the upsert is done, whether it succeeded or not.
+
+    :param table_data: (pandas.DataFrame): Rows to be inserted or updated.
+    :param table_name: (str): Name of table to perform operation on.
+    :param key_columns: (list): Columns of table_data identifying a row.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param upload_partition_size: (Union[int, str]): Number of rows to upload to the staging table at a time, or "auto".
+    :param staging_table_name: (Optional[str]): Name of staging table, defaults to the table name suffixed with _STG.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param use_bind_variables: (bool): Upload to the staging table with bind variables instead of literal SQL.
+    :param max_workers: (int): Number of partitions to upload to the staging table concurrently.
+    :return: (int): Number of rows inserted or updated, as reported by the DB.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    missing_key_columns: list = [x for x in key_columns if x not in table_data.columns]
+    if len(key_columns) == 0 or len(missing_key_columns) > 0:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Key columns {missing} are not columns of the data to upsert into '{table_name}'.".format(
+                missing=missing_key_columns or key_columns, table_name=table_name
+            ),
+        )
+
+    # A target row matched by several source rows would make MERGE fail half way
+    if table_data.duplicated(subset=key_columns).any():
+        raise bis_code_helpers.LoggedDataError(
+            logger,
+            "Data to upsert into '{table_name}' holds duplicate keys on {key_columns}.".format(
+                table_name=table_name, key_columns=key_columns
+            ),
+        )
+
+    if not check_existence_of_table(table_name, engine, logger):
+        raise bis_code_helpers.LoggedDatabaseError(
+            logger, "Can not upsert into '{table_name}', it does not exist.".format(table_name=table_name)
+        )
+
+    if staging_table_name is None:
+        staging_table_name = "{table_name}_STG".format(table_name=table_name)
+
+    db_column_name = bis_code_helpers.library_backend.schema_inference.__db_column_name__
+    query: str = bis_code_helpers.library_backend.generate_merge_query(
+        staging_table_name,
+        table_name,
+        [db_column_name(x) for x in key_columns],
+        [db_column_name(x) for x in table_data.columns],
+        engine.dialect.name,
     )
 
+    try:
+        __stage_data__(
+            table_data,
+            table_name,
+            staging_table_name,
+            engine,
+            upload_partition_size,
+            logger,
+            use_bind_variables,
+            max_workers,
+        )
+
+        success_msg: str = "Merged '{staging}' into '{table_name}'.".format(
+            staging=staging_table_name, table_name=table_name
+        )
+        error_msg: str = "Failed to merge '{staging}' into '{table_name}'.".format(
+            staging=staging_table_name, table_name=table_name
+        )
+        result: __sq__.CursorResult = bis_code_helpers.execute_action_query_on_db(
+            query, success_msg, error_msg, engine, logger
+        )
+    finally:
+        __invalidate_cached_results__(table_name, engine)
+        __drop_leftover_table__(staging_table_name, engine, logger)
+
+    return result.rowcount
+
 
 def update_column_by_value(
     old_value: int,
@@ -345,7 +1492,8 @@ def update_column_by_value(
 ) -> None:
     """
     Update all rows in the production DB that have the old value in latest_prediction
-    to have the new value.
+    to have the new value. The values are sent as bind variables, values written as SQL
+    literals ('text' or to_date(...)) are converted to the matching bind values.
 
     :param old_value: (int): Value to select rows by.
     :param new_value: (int): Value to replace old value.
@@ -359,7 +1507,7 @@ def update_column_by_value(
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
-    query: str = bis_code_helpers.library_backend.generate_update_column_by_value_query(
+    query, binds = bis_code_helpers.library_backend.generate_update_column_by_value_bind_query(
         table_name, column_name, old_value, new_value,
     )
     success_msg: str = "Updated rows in '{table_name}' table: '{column_name}'='{old_value}' -> '{column_name}'='{new_value}'.".format(
@@ -376,39 +1524,339 @@ def update_column_by_value(
     )
 
     bis_code_helpers.execute_action_query_on_db(
-        query, success_msg, error_msg, engine, logger
+        query, success_msg, error_msg, engine, logger, binds
     )
+    __invalidate_cached_results__(table_name, engine)
+
+
+def update_column_by_values(
+    value_mapping: __Union__[dict, __pd__.DataFrame],
+    table_name: str,
+    column_name: str,
+    engine,
+    logger: __Logger__ = None,
+    batch_size: int = 1000,
+) -> dict:
+    """
+    Update rows of a table from many old values to new values in one transaction, instead of calling
+    update_column_by_value once per value. Each batch of values is applied with a single CASE based
+    UPDATE, and nothing is committed unless every batch succeeded.
+
+    Rows are matched on their value before the update, so with {1: 2, 2: 3} rows holding 1 end up
+    holding 2, not 3. Values written as SQL literals ('text' or to_date(...)) are converted to the
+    matching bind values, as in update_column_by_value.
+
+    :param value_mapping: (Union[dict, pandas.DataFrame]): Old values to new values, or a DataFrame with
+        the old values in its first column and the new values in its second.
+    :param table_name: (str): Name of table to perform operation on.
+    :param column_name: (str): Name of column to update.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.logger): Logger to use for logging.
+    :param batch_size: (int): Number of values per UPDATE, at most 1000.
+    :return: (dict): Old values to the number of rows updated from them.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    if isinstance(value_mapping, __pd__.DataFrame):
+        if len(value_mapping.columns) != 2:
+            raise bis_code_helpers.LoggedValueError(
+                logger,
+                "Expected a DataFrame of old and new values, got {n} columns.".format(
+                    n=len(value_mapping.columns)
+                ),
+            )
+        value_pairs: list = list(zip(value_mapping.iloc[:, 0], value_mapping.iloc[:, 1]))
+    else:
+        value_pairs = list(value_mapping.items())
+
+    old_values: list = [old_value for old_value, _ in value_pairs]
+    if len(set(old_values)) != len(old_values):
+        raise bis_code_helpers.LoggedValueError(
+            logger, "Old values to update '{column_name}' from are not unique.".format(column_name=column_name)
+        )
+
+    batch_size = max(1, min(batch_size, 1000))
+    batches: list = [value_pairs[i : i + batch_size] for i in range(0, len(value_pairs), batch_size)]
+    # Later batches would update rows again that earlier batches set to one of their old values
+    if len(batches) > 1 and len(set(old_values) & {new_value for _, new_value in value_pairs}) > 0:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Some new values of '{column_name}' are also old values, so all {n} values must fit in one batch of at most 1000.".format(
+                column_name=column_name, n=len(value_pairs)
+            ),
+        )
+
+    updated_counts: dict = {}
+    try:
+        with __timed_transaction__(engine, "update_column_by_values", logger) as conn:
+            for batch in batches:
+                count_query, count_binds = bis_code_helpers.library_backend.generate_count_by_values_bind_query(
+                    table_name, column_name, [old_value for old_value, _ in batch],
+                )
+                counts: tuple = __execute_timed__(
+                    conn, "update_column_by_values", count_query, count_binds, logger, fetch_one=True
+                )
+
+                update_query, update_binds = bis_code_helpers.library_backend.generate_update_column_by_values_bind_query(
+                    table_name, column_name, batch,
+                )
+                __execute_timed__(conn, "update_column_by_values", update_query, update_binds, logger)
+
+                for (old_value, _), count in zip(batch, counts):
+                    updated_counts[old_value] = int(count or 0)
+        logger.debug(
+            "Updated {rows} rows in '{table_name}' table from {n} values of '{column_name}'.".format(
+                rows=sum(updated_counts.values()),
+                table_name=table_name,
+                n=len(value_pairs),
+                column_name=column_name,
+            )
+        )
+    except Exception as e:
+        logger.error(
+            "Failed to update rows in '{table_name}' table from {n} values of '{column_name}'.".format(
+                table_name=table_name, n=len(value_pairs), column_name=column_name
+            )
+        )
+        raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+
+    __invalidate_cached_results__(table_name, engine)
+    return updated_counts
+
+
+__result_modes__: list = ["pandas", "arrow", "arrow_pandas"]
+
+
+def __import_pyarrow__(logger: __Logger__):
+    """
+    Import pyarrow, which is only needed for the Arrow result modes.
+
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (module): The pyarrow module.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "pyarrow is required for Arrow results, install it with 'pip install bis_code_helpers[arrow]'.",
+        )
+    return pyarrow
+
+
+def __fetch_arrow_table__(conn, query: str, binds: __Optional__[dict], batch_size: int, pa):
+    """
+    Fetch the result of a select query into an Arrow table.
+
+    On Oracle with python-oracledb 3+ the driver fills the Arrow buffers itself, so no Python object is
+    created per value. Other drivers are read batch_size rows at a time, each batch being turned into
+    Arrow arrays column by column, so at most one batch of row tuples is alive at once.
+
+    :param conn: (sqlalchemy.Connection): Open DB connection.
+    :param query: (str): Query to be executed.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :param batch_size: (int): Rows fetched per round-trip.
+    :param pa: (module): The pyarrow module.
+    :return: (pyarrow.Table): Data returned from DB.
+    """
+    driver_connection = conn.connection.driver_connection
+    if conn.dialect.name == "oracle" and hasattr(driver_connection, "fetch_df_all"):
+        oracle_df = driver_connection.fetch_df_all(
+            statement=query, parameters=binds, arraysize=batch_size
+        )
+        return pa.Table.from_arrays(oracle_df.column_arrays(), names=oracle_df.column_names())
+
+    if binds is None:
+        result: __sq__.CursorResult = conn.exec_driver_sql(
+            query, execution_options={"stream_results": True}
+        )
+    else:
+        result = conn.execute(__sq__.text(query), binds, execution_options={"stream_results": True})
+    columns: list = list(result.keys())
+
+    batches: list = [
+        pa.Table.from_arrays([pa.array(values) for values in zip(*rows)], names=columns)
+        for rows in result.partitions(batch_size)
+    ]
+    if len(batches) == 0:
+        return pa.table({x: pa.array([], type=pa.null()) for x in columns})
+    # Batches infer their own types, e.g. a batch of only nulls, so promote them to a common schema
+    return pa.concat_tables(batches, promote_options="permissive")
 
 
 def execute_select_query_on_db(
-    query: str, success_msg: str, error_msg: str, engine, logger: __Logger__ = None,
-) -> __pd__.DataFrame:
+    query: str,
+    success_msg: str,
+    error_msg: str,
+    engine,
+    logger: __Logger__ = None,
+    binds: __Optional__[dict] = None,
+    result_mode: str = "pandas",
+    arrow_batch_size: int = 10000,
+    use_result_cache: bool = True,
+):
     """
     Execute a returning select query.
 
+    By default the result is read with pandas.read_sql. The Arrow result modes fetch into columnar Arrow
+    buffers instead and need pyarrow:
+        - "arrow" returns a pyarrow.Table.
+        - "arrow_pandas" returns a DataFrame backed by the Arrow buffers (pandas.ArrowDtype columns).
+
+    If enable_result_cache was called for the engine, repeated queries are answered from its cache. Queries
+    in the transaction of a transactional DatabaseSession bypass the cache, as they may see uncommitted rows.
+
     :param query: (str): Query to be executed.
     :param success_msg: (str): Debug message for successful execution.
     :param error_msg: (str): Error message for failed execution.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
     :param logger: (logging.Logger): Logger to use for logging.
-    :return: (pandas.Dataframe): Date returned from DB.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :param result_mode: (str): One of "pandas", "arrow" or "arrow_pandas".
+    :param arrow_batch_size: (int): Rows fetched per round-trip in the Arrow result modes.
+    :param use_result_cache: (bool): Use the engine's result cache, if enabled.
+    :return: (Union[pandas.DataFrame, pyarrow.Table]): Data returned from DB.
     """
 
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    if result_mode not in __result_modes__:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Invalid result_mode '{mode}', must be one of {modes}.".format(
+                mode=result_mode, modes=__result_modes__
+            ),
+        )
+    pa = __import_pyarrow__(logger) if result_mode != "pandas" else None
+
+    cache: __Optional__[bis_code_helpers.ResultCache] = (
+        bis_code_helpers.get_result_cache(engine)
+        if use_result_cache and not __in_session_transaction__(engine)
+        else None
+    )
+    if cache is not None:
+        cache_key: str = cache.key(query, binds, result_mode)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug("{success_msg} (cached)".format(success_msg=success_msg))
+            return cached_result
+
+        # Taken before executing, so a result read before a concurrent write is not cached after it
+        cache_generation: tuple = cache.generation(query)
+
+    timer = bis_code_helpers.query_instrumentation.__start_query__("execute_select_query_on_db", query, logger)
     try:
         with bis_code_helpers.ConnectionManager(engine) as conn:
-            result: __pd__.DataFrame = __pd__.read_sql(query, conn)
+            timer.checked_out(conn)
+            timer.watch_execute(conn)
+            try:
+                if result_mode != "pandas":
+                    result = __fetch_arrow_table__(conn, query, binds, arrow_batch_size, pa)
+                    timer.lap("fetch")
+                    if result_mode == "arrow_pandas":
+                        result = result.to_pandas(types_mapper=__pd__.ArrowDtype)
+                        timer.lap("build")
+                elif binds is None:
+                    result: __pd__.DataFrame = __pd__.read_sql(query, conn)
+                    timer.lap("fetch")
+                else:
+                    result = __pd__.read_sql(__sq__.text(query), conn, params=binds)
+                    timer.lap("fetch")
+            finally:
+                timer.unwatch_execute(conn)
             logger.debug(success_msg)
     except Exception as e:
+        timer.finish(error=e)
         logger.error(error_msg)
         raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    timer.finish(rows=len(result))
+    if cache is not None:
+        cache.put(cache_key, query, result, cache_generation)
     return result
 
 
+def execute_select_query_on_db_in_chunks(
+    query: str,
+    success_msg: str,
+    error_msg: str,
+    engine,
+    logger: __Logger__ = None,
+    chunk_size: int = 10000,
+    fetch_arraysize: __Optional__[int] = None,
+    binds: __Optional__[dict] = None,
+) -> __Iterator__[__pd__.DataFrame]:
+    """
+    Execute a returning select query and yield the result in DataFrames of at most chunk_size rows.
+    One connection is held open until the generator is exhausted or closed, and only one chunk is
+    held in memory at a time.
+
+    :param query: (str): Query to be executed.
+    :param success_msg: (str): Debug message for successful execution, logged once all rows are fetched.
+    :param error_msg: (str): Error message for failed execution.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param chunk_size: (int): Number of rows per yielded DataFrame.
+    :param fetch_arraysize: (Optional[int]): Rows fetched per round-trip by the driver, defaults to chunk_size.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :return: (Iterator[pandas.DataFrame]): Data returned from DB, chunk by chunk.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    if fetch_arraysize is None:
+        fetch_arraysize = chunk_size
+
+    def set_arraysize(conn, cursor, statement, parameters, context, executemany):
+        cursor.arraysize = fetch_arraysize
+
+    timer = bis_code_helpers.query_instrumentation.__start_query__(
+        "execute_select_query_on_db_in_chunks", query, logger
+    )
+    num_rows: int = 0
+    try:
+        with bis_code_helpers.ConnectionManager(engine) as conn:
+            timer.checked_out(conn)
+            __sq__.event.listen(conn, "before_cursor_execute", set_arraysize)
+            try:
+                result: __sq__.CursorResult = conn.execute(
+                    __sq__.text(query), binds, execution_options={"stream_results": True}
+                )
+            finally:
+                # A session's connection outlives this query
+                __sq__.event.remove(conn, "before_cursor_execute", set_arraysize)
+            timer.lap("execute")
+            columns: list = list(result.keys())
+            has_rows: bool = False
+            for rows in result.partitions(chunk_size):
+                has_rows = True
+                timer.lap("fetch")
+                chunk: __pd__.DataFrame = __pd__.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                timer.lap("build")
+                num_rows += len(chunk.index)
+                yield chunk
+                # Time spent by the caller between chunks is not part of any phase
+                timer.skip()
+            if not has_rows:
+                yield __pd__.DataFrame(columns=columns)
+            logger.debug(success_msg)
+    except Exception as e:
+        timer.finish(rows=num_rows, error=e)
+        logger.error(error_msg)
+        raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    timer.finish(rows=num_rows)
+
+
 def execute_action_query_on_db(
-    query: str, success_msg: str, error_msg: str, engine: sqlalchemy.engine.Engine, logger: __Logger__ = None,
+    query: str,
+    success_msg: str,
+    error_msg: str,
+    engine: sqlalchemy.engine.Engine,
+    logger: __Logger__ = None,
+    binds: __Optional__[__Union__[dict, list]] = None,
 ) -> __sq__.CursorResult:
     """
     Execute a non-returning, commit required query.
@@ -418,18 +1866,24 @@ def execute_action_query_on_db(
     :param error_msg: (str): Error message for failed execution.
     :param engine: (sqlalchemy.engine): DB engine used for DB connection.
     :param logger: (logging.Logger): Logger to use for logging.
+    :param binds: (Optional[Union[dict, list]]): Bind values for the query, a list of dicts executes it once per dict.
     :return: (sqlalchemy.CursorResult): Result object from cursor that executed query.
     """
 
     if logger is None:
         logger = bis_code_helpers.library_backend.MockLogger()
 
+    timer = bis_code_helpers.query_instrumentation.__start_query__("execute_action_query_on_db", query, logger)
     try:
-        with engine.connect() as conn:
-            with conn.begin():
-                output: __sq__.CursorResult = conn.execute(sqlalchemy.text(query))
-            logger.debug(success_msg)
-            return output
+        with bis_code_helpers.TransactionManager(engine) as conn:
+            timer.checked_out(conn)
+            output: __sq__.CursorResult = conn.execute(sqlalchemy.text(query), binds)
+            timer.lap("execute")
+        timer.lap("commit")
+        logger.debug(success_msg)
     except Exception as e:
+        timer.finish(error=e)
         logger.error(error_msg)
         raise bis_code_helpers.LoggedDatabaseError(logger, str(e))
+    timer.finish(rows=output.rowcount)
+    return output
@@ -1,13 +1,63 @@
-from bis_code_helpers.library_backend.database_functions import (
-    generate_trunc_db_table_query,
-    generate_drop_db_table_query,
-    generate_get_number_of_rows_of_db_table_query,
-    generate_column_names_of_db_table_query,
-    generate_table_creation_query,
-    generate_insert_query,
-    generate_update_column_by_value_query,
-    generate_check_existence_of_table_query,
-)
+import importlib as __importlib__
+
+# The query generators and schema inference need pandas and numpy, so their submodules are only
+# imported the first time one of their names is used.
+__lazy_attributes__: dict = {
+    **dict.fromkeys(
+        [
+            "generate_table_to_table_insert_query",
+            "generate_empty_table_copy_query",
+            "generate_table_swap_query",
+            "generate_merge_query",
+            "generate_trunc_db_table_query",
+            "generate_drop_db_table_query",
+            "generate_get_number_of_rows_of_db_table_query",
+            "generate_table_statistics_query",
+            "generate_sample_row_count_query",
+            "generate_key_bounds_query",
+            "generate_key_range_query",
+            "generate_column_names_of_db_table_query",
+            "generate_table_creation_query",
+            "generate_insert_query",
+            "generate_insert_bind_query",
+            "generate_update_column_by_value_query",
+            "generate_update_column_by_value_bind_query",
+            "generate_update_column_by_values_bind_query",
+            "generate_count_by_values_bind_query",
+            "generate_check_existence_of_table_query",
+            "generate_table_catalog_query",
+        ],
+        ".database_functions",
+    ),
+    "SchemaInferrer": ".schema_inference",
+    "AdaptivePartitionSizer": ".partition_sizing",
+    **dict.fromkeys(["generate_sql_loader_control_file", "parse_sql_loader_log"], ".sql_loader"),
+}
+
+__submodules__: list = ["database_functions", "schema_inference", "partition_sizing", "sql_loader"]
+
+
+def __getattr__(name: str):
+    """
+    Import the submodule defining a name on first use.
+
+    :param name: (str): Name looked up on the package.
+    :return: The object of that name.
+    """
+    if name in __submodules__:
+        return __importlib__.import_module("." + name, __name__)
+    module_name: str = __lazy_attributes__.get(name)
+    if module_name is None:
+        raise AttributeError("module {module!r} has no attribute {name!r}".format(module=__name__, name=name))
+    value = getattr(__importlib__.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__lazy_attributes__) | set(__submodules__))
+
+
 from bis_code_helpers.library_backend.MockLogger import (
     MockLogger,
     set_mock_logging_level,
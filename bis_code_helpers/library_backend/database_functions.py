@@ -2,10 +2,15 @@ import math
 
 import pandas as __pd__
 from typing import Callable as __Callable__
+from typing import Iterable as __Iterable__
+from typing import Union as __Union__
+from typing import Optional as __Optional__
 import re as __re__
 import numpy as __np__
 import math as __math__
 
+from bis_code_helpers.library_backend.schema_inference import SchemaInferrer
+
 
 # ----------------------------------------------------
 # Generate query to copy data from staging to production
@@ -13,21 +18,174 @@ import math as __math__
 
 
 def generate_table_to_table_insert_query(
-    source_table_name: str, target_table_name: str
+    source_table_name: str,
+    target_table_name: str,
+    column_names: __Optional__[list] = None,
+    direct_path: bool = False,
 ) -> str:
     """
     Generate query to copy all data from source table to target table.
 
     :param source_table_name: (str): Source table name.
     :param target_table_name: (str) Target table name.
+    :param column_names: (Optional[list]): Columns to copy, matched by name, None for all columns by position.
+    :param direct_path: (bool): Add the APPEND hint, so Oracle writes the rows above the high water mark
+        in one direct-path operation. The target can not be read in the same transaction until it commits.
     :return: (str): Query for copying data.
     """
-    query: str = "INSERT INTO {target_table_name} SELECT * FROM {source_table_name}".format(
+    hint: str = " /*+ APPEND */" if direct_path else ""
+    if column_names is None:
+        target_columns: str = ""
+        source_columns: str = "*"
+    else:
+        source_columns = ", ".join(column_names)
+        target_columns = " ({columns})".format(columns=source_columns)
+
+    query: str = "INSERT{hint} INTO {target_table_name}{target_columns} SELECT {source_columns} FROM {source_table_name}".format(
+        hint=hint,
+        source_table_name=source_table_name,
+        target_table_name=target_table_name,
+        target_columns=target_columns,
+        source_columns=source_columns,
+    )
+    return query
+
+
+# ----------------------------------------------------
+# Generate query to create an empty copy of a table
+# ----------------------------------------------------
+
+
+def generate_empty_table_copy_query(source_table_name: str, target_table_name: str) -> str:
+    """
+    Generate query to create a table with the columns and column types of another table, but none of its rows.
+
+    :param source_table_name: (str): Name of table to copy.
+    :param target_table_name: (str): Name of table to create.
+    :return: (str): Query for creating the table.
+    """
+    query: str = "CREATE TABLE {target_table_name} AS SELECT * FROM {source_table_name} WHERE 1 = 0".format(
         source_table_name=source_table_name, target_table_name=target_table_name
     )
     return query
 
 
+# ----------------------------------------------------
+# Generate queries to swap a staging table in place of a table
+# ----------------------------------------------------
+
+
+def generate_table_swap_query(
+    table_name: str,
+    staging_table_name: str,
+    backup_table_name: __Optional__[str] = None,
+    dialect_name: str = "oracle",
+) -> list:
+    """
+    Generate the statements that rename a table out of the way and rename a staging table in its place.
+
+    On Oracle the renames are DDL, which commits on its own, so they are wrapped in one PL/SQL block to be
+    sent as a single server-side call. Other databases (e.g. the SQLite stand-in) get one statement per
+    rename, to be run in one transaction.
+
+    :param table_name: (str): Name of table to replace.
+    :param staging_table_name: (str): Name of table taking its place.
+    :param backup_table_name: (Optional[str]): Name the replaced table is renamed to, None if it does not exist.
+    :param dialect_name: (str): Name of the SQLAlchemy dialect of the DB.
+    :return: (list): Statements to execute in order.
+    """
+    renames: list = []
+    if backup_table_name is not None:
+        renames.append((table_name, backup_table_name))
+    renames.append((staging_table_name, table_name))
+
+    # The new name of a renamed table can not be qualified with its owner
+    statements: list = [
+        "ALTER TABLE {old} RENAME TO {new}".format(old=old, new=new.split(".")[-1])
+        for old, new in renames
+    ]
+
+    if dialect_name == "oracle":
+        return [
+            "BEGIN\n{statements}\nEND;".format(
+                statements="\n".join(
+                    ["    EXECUTE IMMEDIATE '{x}';".format(x=x) for x in statements]
+                )
+            )
+        ]
+    return statements
+
+
+# ----------------------------------------------------
+# Generate query to upsert data from staging to production
+# ----------------------------------------------------
+
+
+def generate_merge_query(
+    source_table_name: str,
+    target_table_name: str,
+    key_columns: list,
+    column_names: list,
+    dialect_name: str = "oracle",
+) -> str:
+    """
+    Generate query to upsert all rows of source table into target table: rows whose key columns match a
+    target row update it, the others are inserted.
+
+    On Oracle this is a MERGE statement. Other databases (e.g. the SQLite stand-in) get an equivalent
+    INSERT ... ON CONFLICT statement, which needs a unique index on the key columns of the target table.
+
+    :param source_table_name: (str): Source table name.
+    :param target_table_name: (str): Target table name.
+    :param key_columns: (list): Columns identifying a row, as named on the DB.
+    :param column_names: (list): All columns to copy, key columns included, as named on the DB.
+    :param dialect_name: (str): Name of the SQLAlchemy dialect of the DB.
+    :return: (str): Query for upserting data.
+    """
+    update_columns: list = [x for x in column_names if x not in key_columns]
+
+    if dialect_name == "oracle":
+        on_clause: str = " AND ".join(["t.{x} = s.{x}".format(x=x) for x in key_columns])
+        update_clause: str = ""
+        if len(update_columns) > 0:
+            update_clause = "\nWHEN MATCHED THEN UPDATE SET {set_list}".format(
+                set_list=", ".join(["t.{x} = s.{x}".format(x=x) for x in update_columns])
+            )
+        query: str = (
+            "MERGE INTO {target_table_name} t\n"
+            "USING {source_table_name} s\n"
+            "ON ({on_clause}){update_clause}\n"
+            "WHEN NOT MATCHED THEN INSERT ({column_names}) VALUES ({source_column_names})"
+        ).format(
+            target_table_name=target_table_name,
+            source_table_name=source_table_name,
+            on_clause=on_clause,
+            update_clause=update_clause,
+            column_names=", ".join(column_names),
+            source_column_names=", ".join(["s.{x}".format(x=x) for x in column_names]),
+        )
+        return query
+
+    conflict_action: str = "DO NOTHING"
+    if len(update_columns) > 0:
+        conflict_action = "DO UPDATE SET {set_list}".format(
+            set_list=", ".join(["{x} = excluded.{x}".format(x=x) for x in update_columns])
+        )
+    # The WHERE clause keeps SQLite from reading ON CONFLICT as a join constraint
+    query = (
+        "INSERT INTO {target_table_name} ({column_names})\n"
+        "SELECT {column_names} FROM {source_table_name} WHERE true\n"
+        "ON CONFLICT ({key_columns}) {conflict_action}"
+    ).format(
+        target_table_name=target_table_name,
+        source_table_name=source_table_name,
+        column_names=", ".join(column_names),
+        key_columns=", ".join(key_columns),
+        conflict_action=conflict_action,
+    )
+    return query
+
+
 # ----------------------------------------------------
 # Generate query to truncate table on database
 # ----------------------------------------------------
@@ -49,14 +207,17 @@ def generate_trunc_db_table_query(table_name: str) -> str:
 # ----------------------------------------------------
 
 
-def generate_drop_db_table_query(table_name: str) -> str:
+def generate_drop_db_table_query(table_name: str, dialect_name: str = "oracle") -> str:
     """
-    Generate query to drop table.
+    Generate query to drop table. On Oracle the table is purged rather than moved to the recycle bin.
 
     :param table_name: (str): Table to be dropped.
+    :param dialect_name: (str): Name of the SQLAlchemy dialect of the DB.
     :return: (str): Query for dropping table.
     """
-    query: str = "drop table {table_name} purge".format(table_name=table_name)
+    if dialect_name == "oracle":
+        return "drop table {table_name} purge".format(table_name=table_name)
+    query: str = "drop table {table_name}".format(table_name=table_name)
     return query
 
 
@@ -76,6 +237,97 @@ def generate_get_number_of_rows_of_db_table_query(table_name: str) -> str:
     return query
 
 
+# ----------------------------------------------------
+# Generate queries to estimate the number of rows of table on database
+# ----------------------------------------------------
+
+
+def generate_table_statistics_query(table_name: str) -> tuple:
+    """
+    Generate query to get the optimizer statistics row count of a table, when it was analyzed, whether
+    the statistics are stale and the DML recorded by table monitoring since.
+
+    :param table_name: (str): Table to get statistics for, optionally qualified with its owner.
+    :return: (tuple): (query, binds) returning num_rows, last_analyzed, stale_stats, inserts and deletes.
+    """
+    parts: list = table_name.upper().split(".")
+    query: str = """SELECT
+        s.num_rows,
+        s.last_analyzed,
+        s.stale_stats,
+        m.inserts,
+        m.deletes
+    FROM all_tab_statistics s
+    LEFT JOIN all_tab_modifications m
+        ON m.table_owner = s.owner AND m.table_name = s.table_name AND m.partition_name IS NULL
+    WHERE s.owner = NVL(:owner, SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'))
+        AND s.table_name = :table_name
+        AND s.object_type = 'TABLE'"""
+    binds: dict = {
+        "owner": parts[0] if len(parts) > 1 else None,
+        "table_name": parts[-1],
+    }
+    return query, binds
+
+
+def generate_sample_row_count_query(table_name: str, sample_percent: float) -> str:
+    """
+    Generate query to count the rows in a block sample of a table.
+
+    :param table_name: (str): Table to sample.
+    :param sample_percent: (float): Percentage of blocks to sample, greater than 0 and less than 100.
+    :return: (str): Query for counting the sampled rows.
+    """
+    query: str = "select count(*) from {table_name} SAMPLE BLOCK ({sample_percent})".format(
+        table_name=table_name, sample_percent=float(sample_percent)
+    )
+    return query
+
+
+# ----------------------------------------------------
+# Generate queries to split a query into key ranges
+# ----------------------------------------------------
+
+
+def generate_key_bounds_query(source_query: str, key_column: str) -> str:
+    """
+    Generate query for the smallest and largest key of the rows of a query.
+
+    :param source_query: (str): Query whose rows are to be split.
+    :param key_column: (str): Column to split the rows by.
+    :return: (str): Query returning min_key and max_key.
+    """
+    query: str = "select min({key}) as min_key, max({key}) as max_key from ({source_query}) key_bounds".format(
+        key=key_column, source_query=source_query
+    )
+    return query
+
+
+def generate_key_range_query(
+    source_query: str, key_column: str, include_upper: bool = False, include_nulls: bool = False
+) -> str:
+    """
+    Generate query for the rows of a query with a key from :lower_key up to :upper_key, bound when executed.
+    Splitting on consecutive ranges, with include_upper set for the last range and include_nulls for one
+    range, returns every row exactly once.
+
+    :param source_query: (str): Query whose rows are to be split.
+    :param key_column: (str): Column to split the rows by.
+    :param include_upper: (bool): Include rows with a key equal to :upper_key.
+    :param include_nulls: (bool): Also include rows without a key.
+    :return: (str): Query for the rows in the key range.
+    """
+    condition: str = "{key} >= :lower_key and {key} {operator} :upper_key".format(
+        key=key_column, operator="<=" if include_upper else "<"
+    )
+    if include_nulls:
+        condition = "({condition}) or {key} is null".format(condition=condition, key=key_column)
+    query: str = "select * from ({source_query}) key_range where {condition}".format(
+        source_query=source_query, condition=condition
+    )
+    return query
+
+
 # ----------------------------------------------------
 # Generate query to get column names of table on database
 # ----------------------------------------------------
@@ -88,7 +340,7 @@ def generate_column_names_of_db_table_query(table_name: str):
     :param table_name: (str): Table to have it's column names retrieved.
     :return: (str): Query for getting column names of table.
     """
-    query: str = "SELECT * FROM {table_name} WHERE rownum < 1".format(
+    query: str = "SELECT * FROM {table_name} WHERE 1 = 0".format(
         table_name=table_name
     )
     return query
@@ -118,117 +370,45 @@ def __generate_table_creation_query__(column_data: str, table_name: str) -> str:
 
 
 def generate_table_creation_query(
-    data: __pd__.DataFrame, table_name: str, allow_nulls: bool = True,
+    data: __Union__[__pd__.DataFrame, __Iterable__[__pd__.DataFrame], SchemaInferrer],
+    table_name: str,
+    allow_nulls: bool = True,
 ) -> str:
     """
     Generate query for creating a table based on the data in an inputted DataFrame.
     Performs column name extraction and data type conversion.
-    Date types are infered from to_date(...) formatted column data for date in
-    the name of columns in the case of empty input DataFrames.
+    Date types are infered from columns where every value is a to_date(...) string.
+
+    Every row is inspected in a single pass, a chunk at a time, so data can also be given as an
+    iterator of DataFrames that together would not fit in memory, or as an already updated SchemaInferrer.
 
-    :param data: (DataFrame): Data the table will be based on.
+    :param data: (Union[DataFrame, Iterable[DataFrame], SchemaInferrer]): Data the table will be based on.
     :param table_name: (str): Name of new table to be created.
     :param allow_nulls: (bool): Allow nulls in table.
     :return: (str): Query for creating table.
     """
-    data = data.sample(n=min(max(50000, len(data) // 3), len(data)), random_state=1).copy()
-
-    oracle_keywords: list = ["default", "comment", "date", "size"]
-    keyword_columns: list = [x for x in data.columns if x in oracle_keywords]
-    if len(keyword_columns) > 0:
-        columns_to_rename: dict = {}
-        [columns_to_rename.update({x: f'"{x.upper()}"'}) for x in keyword_columns]
-        data.rename(columns=columns_to_rename, inplace=True)
+    if isinstance(data, SchemaInferrer):
+        schema: SchemaInferrer = data
+    else:
+        schema = SchemaInferrer()
+        for chunk in [data] if isinstance(data, __pd__.DataFrame) else data:
+            schema.update(chunk)
+
+    columns_to_rename: dict = schema.renamed_keyword_columns()
+    if len(columns_to_rename) > 0:
         print("Renaming keyword columns:", columns_to_rename)
 
-    # get data types
-    db_table_cols: __pd__.Series = data.dtypes
-
-    # Handle datetime64[ns] objects
-    db_table_cols[db_table_cols == "datetime64[ns]"] = "VARCHAR2(200)"
-
-    # convert series data to string so we can replace types
-    db_table_cols = db_table_cols.astype("str")
-
-    # replace python / numpy data types with oracle sql data types
-    # db_table_cols = db_table_cols.str.replace("object", "VARCHAR2(200)")
-    db_table_cols = db_table_cols.str.replace("float32", "FLOAT(32)")
-    db_table_cols = db_table_cols.str.replace("float64", "FLOAT(64)")
-    db_table_cols = db_table_cols.str.replace("int64", "INT")
-    db_table_cols = db_table_cols.str.replace("int32", "INT")
-    db_table_cols = db_table_cols.str.replace("bool", "NUMBER(3)")
-
-    # All columns that are objects and have all values as to_date(...) strings will be dates on the DB
-    date_cols: list = []
-    string_col_pairs: list = []
-    nan_col_pairs: list = []
-
-    x: str
-    for x in data.columns:
-        # Oracle keywords
-        if str(data[x].dtype) == "object":
-            data[x] = data[x].astype(__np__.str_)
-            # Check if date
-            try:
-                to_date_len = len(data[x][data[x].str.contains("to_date")])
-                if to_date_len == len(data) and to_date_len > 0:
-                    date_cols.append(x)
-                    continue
-            except ValueError as e:
-                if (
-                    not "Cannot mask with non-boolean array containing NA / NaN values"
-                    in str(e)
-                ):
-                    raise ValueError(e)
-
-            # If not date
-            col_len: int = data[x].map(len).max()
-            if math.isnan(col_len):
-                col_len = 10
-            string_col_pairs.append((x, int(col_len + (10 - (col_len % 10)))))
-        else:
-            if data[x].isnull().values.any():
-                if db_table_cols[x] == "FLOAT(32)":
-                    nan_col_pairs.append((x, "BINARY_FLOAT"))
-                elif db_table_cols[x] == "FLOAT(64)":
-                    nan_col_pairs.append((x, "BINARY_DOUBLE"))
-
-    for col in date_cols:
-        db_table_cols[col] = "DATE"
-    for col, length in string_col_pairs:
-        rounded_up_length: int = 1 << ((length*2)-1).bit_length()
-        if rounded_up_length > 4000:
-            rounded_up_length = 4000
-        db_table_cols[col] = f"VARCHAR2({rounded_up_length})"
-    for col, t in nan_col_pairs:
-        db_table_cols[col] = t
-
-    # convert series to DataFrame
-    db_table_cols_frame: __pd__.DataFrame = db_table_cols.to_frame()
-
-    # convert index names to column to replace spaces
-    db_table_cols_frame["col_names"] = db_table_cols_frame.index
-    db_table_cols_frame.col_names = db_table_cols_frame.col_names.str.replace(" ", "_")
-    db_table_cols_frame.columns = ["col_types", "col_names"]
-    db_table_cols_frame = db_table_cols_frame[["col_names", "col_types"]]
-
-    # convert DataFrame to list
-    db_table_cols_list: list = db_table_cols_frame.to_string(
-        header=False, index=False, index_names=False
-    ).split("\n")
-
-    # Clean up whitespace
-    values = [" ".join(ele.lstrip().split()).lstrip() for ele in db_table_cols_list]
+    values: list = [
+        "{name} {col_type}".format(name=name, col_type=col_type)
+        for name, col_type in schema.column_types().items()
+    ]
 
     # Add not null clause to all rows
     if not allow_nulls:
         values = ["{x} NOT NULL".format(x=x) for x in values]
 
-    # convert list to string
-    values = ",\n".join(values)
-
     create_query = __generate_table_creation_query__(
-        column_data=values, table_name=table_name
+        column_data=",\n".join(values), table_name=table_name
     )
     return create_query
 
@@ -238,67 +418,95 @@ def generate_table_creation_query(
 # ----------------------------------------------------
 
 
+__to_str__: __np__.ufunc = __np__.frompyfunc(str, 1, 1)
+
+
 def __generate_insert_query__(
-    column_names: str, data_list: list, table_name: str
+    column_names: str, data_list: __np__.ndarray, table_name: str
 ) -> str:
     """
     Generate final query for inserting a set of rows into a table.
 
     :param column_names: (str): Names of columns matching new rows.
-    :param data_list: (list): List of rows to be inserted.
+    :param data_list: (numpy.ndarray): Object array of rows to be inserted, each a string of comma separated values.
     :param table_name: (str): Name of table to insert data into.
     :return: (str): Query for inserting set of rows into table.
     """
-    query: str = """
+    row_prefix: str = """\nINTO {table_name} ({column_names}) VALUES (""".format(
+        table_name=table_name, column_names=column_names
+    )
+    rows: __np__.ndarray = row_prefix + data_list + ")"
 
-    INSERT ALL
+    query: str = "".join(["""
 
-    """
-    for row in data_list:
-        # row = row.replace(",", " ")
-        query = (
-            query
-            + """\nINTO {table_name} ({column_names}) VALUES ({row})""".format(
-                table_name=table_name, column_names=column_names, row=row
-            )
-        )
+    INSERT ALL
 
-    query = query + """\nSELECT 1 FROM DUAL"""
+    """, *rows, """\nSELECT 1 FROM DUAL"""])
 
     return query
 
 
+def __insert_query_column_dtype__(column: __pd__.Series):
+    """
+    Get the dtype a non-object column takes on once its cells have been passed through
+    DataFrame.map, which is how the values of the insert query have always been produced.
+
+    :param column: (pandas.Series): Column of the data being inserted.
+    :return: (dtype): dtype after mapping, None if it can only be found by mapping the column.
+    """
+    if not isinstance(column.dtype, __np__.dtype):
+        return None
+    kind: str = column.dtype.kind
+    if kind == "i":
+        return __np__.dtype("int64")
+    if kind == "u":
+        return __np__.dtype("uint64")
+    if kind == "f":
+        return __np__.dtype("float64")
+    if kind in "bmM":
+        return column.dtype
+    return None
+
+
 def generate_insert_query(data: __pd__.DataFrame, table_name: str) -> str:
     """
     Generate query for inserting the rows of data into the table.
 
+    Works a column at a time: object columns are quoted (except to_date(...) values) as whole
+    columns, every column is converted to strings at once and the rows are joined column by column.
+
     :param data: (list): Rows to be inserted into table.
     :param table_name: (str): Name of table to insert rows into.
     :return: (str): Query for inserting rows.
     """
-    # regex_whitespace_saver: __Callable__ = lambda x: __re__.sub(" ", "___", x)
-    # regex_whitespace_restorer: __Callable__ = lambda x: __re__.sub("___", " ", x)
-
-    # Copy data so that it can be safely edited
-    data = data.copy()
-
-    data_object_subset: __pd__.DataFrame = data.loc[:, data.dtypes == object]
-    data_object_subset = data_object_subset.astype(__np__.str_)
-    data_object_subset = data_object_subset.map(
-        lambda x: f"'{x}'"
-        if not isinstance(x, type(None)) and ("to_date" not in x)
-        else x
-    )
-
-    data.loc[:, data.dtypes == object] = data_object_subset
-
-    # Handle None values
-    data = data.map(lambda x: "NULL" if (isinstance(x, type(None))) else x)
-
-    values = [
-        ', '.join([str(x) for x in data.iloc[i].values.flatten().tolist()])
-        for i in range(len(data))
-    ]
+    columns: list = []
+    x: int
+    for x in range(data.shape[1]):
+        column: __pd__.Series = data.iloc[:, x]
+        if column.dtype == object:
+            column = column.astype(__np__.str_).astype(object)
+            column = column.where(
+                column.str.contains("to_date", regex=False), "'" + column + "'"
+            )
+        elif __insert_query_column_dtype__(column) is None:
+            # Handle None values
+            column = column.map(lambda v: "NULL" if (isinstance(v, type(None))) else v)
+        else:
+            column = column.astype(__insert_query_column_dtype__(column))
+        columns.append(column)
+
+    # Rows of mixed dtypes are converted to their common dtype before they are stringified
+    common_dtype = __pd__.DataFrame(
+        {x: __pd__.Series(dtype=column.dtype) for x, column in enumerate(columns)}
+    ).to_numpy().dtype
+
+    values: __np__.ndarray = __np__.full(len(data), "", dtype=object)
+    for x, column in enumerate(columns):
+        if common_dtype == object:
+            column_values: __np__.ndarray = column.to_numpy(dtype=object)
+        else:
+            column_values = __np__.array(column.to_numpy(dtype=common_dtype).tolist(), dtype=object)
+        values = values + (", " if x > 0 else "") + __to_str__(column_values)
 
     col_list = data.columns
     col_list = [col.replace(" ", "_") for col in col_list]
@@ -311,6 +519,128 @@ def generate_insert_query(data: __pd__.DataFrame, table_name: str) -> str:
     return insert_query
 
 
+# ----------------------------------------------------
+# Generate bind variable query to insert data into table
+# ----------------------------------------------------
+
+
+__oracle_to_date_regex__: __re__.Pattern = __re__.compile(
+    r"to_date\(\s*'([^']*)'\s*,\s*'([^']*)'\s*\)", __re__.IGNORECASE
+)
+
+__oracle_date_format_tokens__: dict = {
+    "yyyy": "%Y",
+    "yy": "%y",
+    "month": "%B",
+    "mon": "%b",
+    "mm": "%m",
+    "dd": "%d",
+    "hh24": "%H",
+    "hh12": "%I",
+    "hh": "%I",
+    "mi": "%M",
+    "ss": "%S",
+    "am": "%p",
+    "pm": "%p",
+}
+
+__oracle_date_format_regex__: __re__.Pattern = __re__.compile(
+    "|".join(sorted(__oracle_date_format_tokens__, key=len, reverse=True)),
+    __re__.IGNORECASE,
+)
+
+
+def __oracle_date_format_to_strftime__(oracle_format: str) -> str:
+    """
+    Convert an Oracle date format model, as used in to_date(...), to a strftime format.
+
+    :param oracle_format: (str): Oracle date format model, e.g. 'dd/mon/yy hh24:mi:ss'.
+    :return: (str): Equivalent strftime format, e.g. '%d/%b/%y %H:%M:%S'.
+    """
+    return __oracle_date_format_regex__.sub(
+        lambda match: __oracle_date_format_tokens__[match.group(0).lower()],
+        oracle_format,
+    )
+
+
+def __to_date_column_to_datetimes__(column: __pd__.Series) -> __pd__.Series:
+    """
+    Parse a column of to_date(...) strings into datetimes so that they can be bound.
+
+    :param column: (pandas.Series): Column of to_date('<literal>','<format>') strings.
+    :return: (pandas.Series): Column of datetimes.
+    """
+    parts: __pd__.DataFrame = column.str.extract(__oracle_to_date_regex__)
+    result: __pd__.Series = __pd__.Series(__pd__.NaT, index=column.index)
+    for oracle_format, group in parts.groupby(1):
+        result[group.index] = __pd__.to_datetime(
+            group[0], format=__oracle_date_format_to_strftime__(oracle_format)
+        )
+    return result
+
+
+def __to_pydatetime_series__(column: __pd__.Series) -> __pd__.Series:
+    """
+    Convert a datetime column to an object column of datetime.datetime values with the same index.
+    pandas 3 returns a Series with a new RangeIndex from dt.to_pydatetime, so the values are taken by position.
+
+    :param column: (pandas.Series): Datetime column.
+    :return: (pandas.Series): Column of datetime.datetime values.
+    """
+    return __pd__.Series(__np__.asarray(column.dt.to_pydatetime(), dtype=object), index=column.index, dtype=object)
+
+
+def __column_to_bind_values__(column: __pd__.Series) -> list:
+    """
+    Convert a DataFrame column to a list of driver friendly Python values based on its dtype.
+    Nulls become None, booleans become 1/0, and to_date(...) strings become datetimes.
+
+    :param column: (pandas.Series): Column to convert.
+    :return: (list): Python values for binding.
+    """
+    null_mask: __pd__.Series = column.isna()
+
+    if __pd__.api.types.is_bool_dtype(column):
+        column = column.astype(object).map({True: 1, False: 0})
+    elif __pd__.api.types.is_datetime64_any_dtype(column):
+        column = __to_pydatetime_series__(column)
+    elif __pd__.api.types.is_object_dtype(column) or __pd__.api.types.is_string_dtype(column):
+        is_date: __pd__.Series = column.astype(str).str.contains("to_date")
+        if is_date.sum() > 0 and is_date.sum() == (~null_mask).sum():
+            column = __to_pydatetime_series__(__to_date_column_to_datetimes__(column[~null_mask]))
+            column = column.reindex(null_mask.index)
+
+    column = column.astype(object)
+    return column.where(~null_mask, None).tolist()
+
+
+def generate_insert_bind_query(data: __pd__.DataFrame, table_name: str) -> tuple:
+    """
+    Generate a bind variable query for inserting the rows of data into the table,
+    along with the bind values for executing it once per row (executemany).
+
+    The statement text depends only on the table and column names, so it is parsed
+    once and reused for every partition.
+
+    :param data: (DataFrame): Rows to be inserted into table.
+    :param table_name: (str): Name of table to insert rows into.
+    :return: (tuple): (query, binds) where binds is a list of dicts, one per row.
+    """
+    col_list: list = [col.replace(" ", "_") for col in data.columns]
+    bind_names: list = ["v{i}".format(i=i) for i in range(len(col_list))]
+
+    insert_query: str = "INSERT INTO {table_name} ({column_names}) VALUES ({bind_names})".format(
+        table_name=table_name,
+        column_names=", ".join(col_list),
+        bind_names=", ".join([":" + x for x in bind_names]),
+    )
+
+    columns: list = [__column_to_bind_values__(data.iloc[:, i]) for i in range(len(col_list))]
+    binds: list = [dict(zip(bind_names, row)) for row in zip(*columns)]
+
+    return insert_query, binds
+
+
 # ----------------------------------------------------
 # Generate query to update current records in database to new value
 # ----------------------------------------------------
@@ -341,6 +671,138 @@ def generate_update_column_by_value_query(
     return query
 
 
+# ----------------------------------------------------
+# Generate bind variable query to update current records in database to new value
+# ----------------------------------------------------
+
+
+def __to_bind_value__(value):
+    """
+    Convert a value, possibly written as a SQL literal, to a driver friendly bind value.
+    Numpy scalars become Python scalars, to_date(...) strings become datetimes and quoted
+    strings ('text') are unquoted, so values written for the literal SQL queries bind the same.
+
+    :param value: Value to convert.
+    :return: Value for binding.
+    """
+    if isinstance(value, __np__.generic):
+        return value.item()
+    if isinstance(value, str):
+        match: __re__.Match = __oracle_to_date_regex__.fullmatch(value.strip())
+        if match:
+            return __pd__.to_datetime(
+                match.group(1), format=__oracle_date_format_to_strftime__(match.group(2))
+            ).to_pydatetime()
+        if len(value) >= 2 and value.startswith("'") and value.endswith("'"):
+            return value[1:-1].replace("''", "'")
+    return value
+
+
+def generate_update_column_by_value_bind_query(
+    table_name: str, column_name: str, old_value: int, new_value: int
+) -> tuple:
+    """
+    Generate bind variable query to update values of column matching old_value to the value in new_value.
+    The statement text only depends on the table and column, so it is reused for every value.
+
+    :param column_name: (str): Name of column to update.
+    :param table_name: (str): Name of table to update.
+    :param old_value: (int): Value of column to select rows by.
+    :param new_value: (str): Value of column that selected rows will be updated to.
+    :return: (tuple): (query, binds) where binds is a dict of bind names to values.
+    """
+    query: str = """UPDATE {table_name}
+    SET 
+        {column_name} = :new_value
+    WHERE
+        {column_name} = :old_value""".format(
+        table_name=table_name, column_name=column_name,
+    )
+    binds: dict = {
+        "new_value": __to_bind_value__(new_value),
+        "old_value": __to_bind_value__(old_value),
+    }
+    return query, binds
+
+
+# ----------------------------------------------------
+# Generate bind variable queries to update records from many old values to new values at once
+# ----------------------------------------------------
+
+
+def generate_update_column_by_values_bind_query(
+    table_name: str, column_name: str, value_pairs: list
+) -> tuple:
+    """
+    Generate one bind variable query updating values of column from many old values to their new values.
+    Each row is matched on its value before the update, so a new value that is also an old value
+    is not updated again.
+
+    :param table_name: (str): Name of table to update.
+    :param column_name: (str): Name of column to update.
+    :param value_pairs: (list): (old_value, new_value) pairs, at most 1000 as Oracle limits IN lists to 1000 values.
+    :return: (tuple): (query, binds) where binds is a dict of bind names to values.
+    """
+    when_clauses: str = "\n".join(
+        [
+            "            WHEN :old_value_{i} THEN :new_value_{i}".format(i=i)
+            for i in range(len(value_pairs))
+        ]
+    )
+    query: str = """UPDATE {table_name}
+    SET 
+        {column_name} = CASE {column_name}
+{when_clauses}
+        END
+    WHERE
+        {column_name} IN ({old_values})""".format(
+        table_name=table_name,
+        column_name=column_name,
+        when_clauses=when_clauses,
+        old_values=", ".join([":old_value_{i}".format(i=i) for i in range(len(value_pairs))]),
+    )
+    binds: dict = {}
+    for i, (old_value, new_value) in enumerate(value_pairs):
+        binds["old_value_{i}".format(i=i)] = __to_bind_value__(old_value)
+        binds["new_value_{i}".format(i=i)] = __to_bind_value__(new_value)
+    return query, binds
+
+
+def generate_count_by_values_bind_query(
+    table_name: str, column_name: str, values: list
+) -> tuple:
+    """
+    Generate bind variable query counting the rows of table holding each of many values in column.
+    The count of the i-th value is in the i-th column of the single returned row.
+
+    :param table_name: (str): Name of table to count rows of.
+    :param column_name: (str): Name of column to match values in.
+    :param values: (list): Values to count, at most 1000 as Oracle limits IN lists to 1000 values.
+    :return: (tuple): (query, binds) where binds is a dict of bind names to values.
+    """
+    counts: str = ",\n".join(
+        [
+            "    SUM(CASE WHEN {column_name} = :value_{i} THEN 1 ELSE 0 END) AS count_{i}".format(
+                column_name=column_name, i=i
+            )
+            for i in range(len(values))
+        ]
+    )
+    query: str = """SELECT
+{counts}
+FROM {table_name}
+WHERE {column_name} IN ({values})""".format(
+        counts=counts,
+        table_name=table_name,
+        column_name=column_name,
+        values=", ".join([":value_{i}".format(i=i) for i in range(len(values))]),
+    )
+    binds: dict = {
+        "value_{i}".format(i=i): __to_bind_value__(value) for i, value in enumerate(values)
+    }
+    return query, binds
+
+
 # ----------------------------------------------------
 # Generate query to check existence of table on database
 # ----------------------------------------------------
@@ -353,7 +815,73 @@ def generate_check_existence_of_table_query(table_name: str) -> str:
     :param table_name: (str): Name of table to update.
     :return: (str): Query to check existence of table.
     """
-    query: str = "SELECT 1 from {table_name} where rownum < 2".format(
+    query: str = "SELECT 1 from {table_name} where 1 = 0".format(
         table_name=table_name
     )
     return query
+
+
+# ----------------------------------------------------
+# Generate query to get the columns of many tables from the data dictionary
+# ----------------------------------------------------
+
+
+def generate_table_catalog_query(table_names: list, dialect_name: str = "oracle") -> tuple:
+    """
+    Generate query to get the columns, data types and lengths of many tables at once from the data
+    dictionary (ALL_TAB_COLUMNS on Oracle, sqlite_master on SQLite). Table names may be qualified with
+    their owner (OWNER.TABLE), unqualified names are looked up in the current schema.
+
+    :param table_names: (list): Names of tables to look up.
+    :param dialect_name: (str): SQLAlchemy dialect name of the DB, 'oracle' or 'sqlite'.
+    :return: (tuple): (query, binds) returning owner, table_name, in_current_schema, column_name, data_type,
+        data_length and nullable.
+    """
+    binds: dict = {}
+    conditions: list = []
+
+    if dialect_name == "sqlite":
+        for i, table_name in enumerate(table_names):
+            binds["t{i}".format(i=i)] = table_name.split(".")[-1].upper()
+        # Oracle style limit of 1000 items per IN list
+        for i in range(0, len(table_names), 1000):
+            conditions.append("upper(m.name) IN ({binds})".format(
+                binds=", ".join([":t{j}".format(j=j) for j in range(i, min(i + 1000, len(table_names)))])
+            ))
+        query: str = """SELECT
+        NULL AS owner,
+        upper(m.name) AS table_name,
+        1 AS in_current_schema,
+        p.name AS column_name,
+        p.type AS data_type,
+        NULL AS data_length,
+        CASE WHEN p."notnull" = 1 THEN 'N' ELSE 'Y' END AS nullable
+    FROM sqlite_master m JOIN pragma_table_info(m.name) p
+    WHERE m.type IN ('table', 'view') AND ({conditions})
+    ORDER BY m.name, p.cid""".format(conditions=" OR ".join(conditions) if conditions else "1 = 0")
+        return query, binds
+
+    pairs: list = []
+    for i, table_name in enumerate(table_names):
+        parts: list = table_name.upper().split(".")
+        binds["t{i}".format(i=i)] = parts[-1]
+        if len(parts) > 1:
+            binds["o{i}".format(i=i)] = parts[0]
+            pairs.append("(:o{i}, :t{i})".format(i=i))
+        else:
+            pairs.append("(SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'), :t{i})".format(i=i))
+    for i in range(0, len(pairs), 1000):
+        conditions.append("(owner, table_name) IN ({pairs})".format(pairs=", ".join(pairs[i:i + 1000])))
+
+    query = """SELECT
+        owner,
+        table_name,
+        CASE WHEN owner = SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA') THEN 1 ELSE 0 END AS in_current_schema,
+        column_name,
+        data_type,
+        data_length,
+        nullable
+    FROM all_tab_columns
+    WHERE {conditions}
+    ORDER BY owner, table_name, column_id""".format(conditions=" OR ".join(conditions) if conditions else "1 = 0")
+    return query, binds
@@ -0,0 +1,90 @@
+import threading as __threading__
+
+
+# ----------------------------------------------------
+# Choose upload partition sizes from the latency and size of earlier partitions
+# ----------------------------------------------------
+
+
+class AdaptivePartitionSizer:
+    """
+    Splits the rows of an upload into partitions whose size adapts while the upload runs. After each
+    partition the measured seconds and bytes per row are folded into running averages, and the next
+    partitions are sized to take target_seconds without sending more than max_bytes, changing by at
+    most a factor of 2 per partition.
+
+    Iterating yields (start, end, first_row, last_row) tuples like library_backend's fixed size
+    partitions, and is safe to share between threads.
+
+    :param num_rows: (int): Number of rows to upload.
+    :param target_seconds: (float): Seconds a partition should take to build and send.
+    :param max_bytes: (int): Most bytes of SQL or bind values to send in one partition.
+    :param initial_size: (int): Rows in the first partition.
+    :param min_size: (int): Fewest rows in a partition.
+    :param max_size: (int): Most rows in a partition.
+    """
+
+    def __init__(
+        self,
+        num_rows: int,
+        target_seconds: float = 1.0,
+        max_bytes: int = 16 * 2 ** 20,
+        initial_size: int = 1000,
+        min_size: int = 1,
+        max_size: int = 100000,
+    ):
+        self.num_rows: int = num_rows
+        self.target_seconds: float = target_seconds
+        self.max_bytes: int = max_bytes
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.size: int = max(min_size, min(initial_size, max_size))
+        self.sizes: list = []
+        self.seconds_per_row: float = None
+        self.bytes_per_row: float = None
+        self.__next_start__: int = 0
+        self.__lock__: __threading__.Lock = __threading__.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> tuple:
+        with self.__lock__:
+            start: int = self.__next_start__
+            if start >= self.num_rows and (start > 0 or len(self.sizes) > 0):
+                raise StopIteration
+            end: int = min(start + self.size, self.num_rows)
+            self.__next_start__ = end
+            self.sizes.append(end - start)
+        # The final partition reports the row count as its last row, as fixed size partitions do
+        return start, end, start, end - 1 if end < self.num_rows else self.num_rows
+
+    def record(self, num_rows: int, seconds: float, num_bytes: int) -> int:
+        """
+        Record how long a partition took and how many bytes it sent, and size the next partitions from it.
+
+        :param num_rows: (int): Rows in the partition.
+        :param seconds: (float): Seconds the partition took to build and send.
+        :param num_bytes: (int): Bytes of SQL or bind values sent.
+        :return: (int): Rows in the next partitions.
+        """
+        if num_rows <= 0:
+            return self.size
+
+        with self.__lock__:
+            seconds_per_row: float = seconds / num_rows
+            bytes_per_row: float = num_bytes / num_rows
+            if self.seconds_per_row is None:
+                self.seconds_per_row = seconds_per_row
+                self.bytes_per_row = bytes_per_row
+            else:
+                self.seconds_per_row = (self.seconds_per_row + seconds_per_row) / 2
+                self.bytes_per_row = (self.bytes_per_row + bytes_per_row) / 2
+
+            size: float = min(
+                self.target_seconds / max(self.seconds_per_row, 1e-9),
+                self.max_bytes / max(self.bytes_per_row, 1e-9),
+            )
+            size = min(max(size, self.size / 2), self.size * 2)
+            self.size = int(max(self.min_size, min(size, self.max_size)))
+            return self.size
@@ -0,0 +1,173 @@
+import pandas as __pd__
+import numpy as __np__
+from typing import Optional as __Optional__
+
+
+# ----------------------------------------------------
+# Infer Oracle column types from DataFrames, a chunk at a time
+# ----------------------------------------------------
+
+
+__oracle_keywords__: list = ["default", "comment", "date", "size"]
+
+# Longest string a float64 can be written as, e.g. -2.2250738585072014e-308
+__max_float_str_len__: int = 24
+
+
+def __oracle_numeric_type__(dtype_name: str) -> str:
+    """
+    Replace a numpy data type name with the Oracle data type used for it.
+
+    :param dtype_name: (str): Name of numpy data type.
+    :return: (str): Oracle data type.
+    """
+    if dtype_name.startswith("datetime64"):
+        return "VARCHAR2(200)"
+    dtype_name = dtype_name.replace("float32", "FLOAT(32)")
+    dtype_name = dtype_name.replace("float64", "FLOAT(64)")
+    dtype_name = dtype_name.replace("int64", "INT")
+    dtype_name = dtype_name.replace("int32", "INT")
+    dtype_name = dtype_name.replace("bool", "NUMBER(3)")
+    return dtype_name
+
+
+def __db_column_name__(column_name) -> str:
+    """
+    Get the name a DataFrame column is given on the DB: spaces replaced by underscores and Oracle keywords quoted.
+
+    :param column_name: (str): Name of DataFrame column.
+    :return: (str): Name of DB column.
+    """
+    name: str = str(column_name)
+    if name in __oracle_keywords__:
+        name = f'"{name.upper()}"'
+    return name.replace(" ", "_")
+
+
+class SchemaInferrer:
+    """
+    Infers the Oracle column types of a table from its data, one DataFrame chunk at a time, so data too large
+    for memory can be described in a single pass. All rows are inspected, so string lengths are exact.
+
+    Columns holding strings (object or string dtype) become DATE if every value is a to_date(...) string, or
+    VARCHAR2 sized from the longest value otherwise. Other columns are typed from their dtype, with floats that
+    contain nulls becoming BINARY_FLOAT / BINARY_DOUBLE. Chunks holding only nulls do not decide the type.
+    """
+
+    def __init__(self):
+        self.num_rows: int = 0
+        self.__columns__: dict = {}
+
+    def update(self, data: __pd__.DataFrame) -> None:
+        """
+        Add a chunk of data to the inferred schema.
+
+        :param data: (pandas.DataFrame): Chunk of data.
+        :return: None
+        """
+        for state in self.__columns__.values():
+            if state["name"] not in data.columns:
+                state["has_nulls"] = state["has_nulls"] or len(data) > 0
+
+        x: str
+        for x in data.columns:
+            column: __pd__.Series = data[x]
+            state: __Optional__[dict] = self.__columns__.get(x)
+            if state is None:
+                state = {
+                    "name": x,
+                    "has_strings": False,
+                    "dtype": None,
+                    "null_dtype": None,
+                    "all_dates": True,
+                    "max_len": None,
+                    "has_nulls": self.num_rows > 0,
+                }
+                self.__columns__[x] = state
+
+            null_mask: __pd__.Series = column.isna()
+            has_nulls: bool = bool(null_mask.any())
+            state["has_nulls"] = state["has_nulls"] or has_nulls
+            if has_nulls:
+                state["all_dates"] = False
+            values: __pd__.Series = column[~null_mask]
+
+            chunk_len: __Optional__[int] = None
+            if column.dtype == object or isinstance(column.dtype, __pd__.StringDtype):
+                if len(values) > 0:
+                    state["has_strings"] = True
+                    values = values.astype(str)
+                    if not values.str.contains("to_date", regex=False).all():
+                        state["all_dates"] = False
+                    chunk_len = int(values.str.len().max())
+            else:
+                state["all_dates"] = False
+                # Chunks holding only nulls say little about the type, e.g. empty CSV columns read as float64
+                dtype_key: str = "dtype" if len(values) > 0 else "null_dtype"
+                state[dtype_key] = (
+                    column.dtype
+                    if state[dtype_key] is None
+                    else __np__.result_type(state[dtype_key], column.dtype)
+                )
+                # Keep a length in case other chunks turn the column into strings
+                if len(values) == 0:
+                    pass
+                elif column.dtype.kind in "iu":
+                    chunk_len = max(len(str(values.min())), len(str(values.max())))
+                elif column.dtype.kind == "b":
+                    chunk_len = 5
+                else:
+                    chunk_len = __max_float_str_len__
+
+            if chunk_len is not None:
+                state["max_len"] = chunk_len if state["max_len"] is None else max(state["max_len"], chunk_len)
+
+        self.num_rows += len(data)
+
+    @property
+    def column_names(self) -> list:
+        """
+        Names of the columns seen so far, as in the DataFrames.
+        """
+        return [state["name"] for state in self.__columns__.values()]
+
+    def column_types(self) -> dict:
+        """
+        Get the inferred Oracle data type of each column, keyed by column name as it will appear on the DB:
+        spaces replaced by underscores and Oracle keywords quoted.
+
+        :return: (dict): Column names to Oracle data types, in column order.
+        """
+        column_types: dict = {}
+        for state in self.__columns__.values():
+            name: str = __db_column_name__(state["name"])
+
+            dtype = state["dtype"] if state["dtype"] is not None else state["null_dtype"]
+            if state["has_strings"] or dtype is None:
+                if state["all_dates"] and state["has_strings"]:
+                    column_types[name] = "DATE"
+                    continue
+                col_len: int = 10 if state["max_len"] is None else state["max_len"]
+                length: int = int(col_len + (10 - (col_len % 10)))
+                rounded_up_length: int = 1 << ((length * 2) - 1).bit_length()
+                if rounded_up_length > 4000:
+                    rounded_up_length = 4000
+                column_types[name] = f"VARCHAR2({rounded_up_length})"
+            else:
+                col_type: str = __oracle_numeric_type__(str(dtype))
+                if state["has_nulls"] and col_type == "FLOAT(32)":
+                    col_type = "BINARY_FLOAT"
+                elif state["has_nulls"] and col_type == "FLOAT(64)":
+                    col_type = "BINARY_DOUBLE"
+                column_types[name] = col_type
+        return column_types
+
+    def renamed_keyword_columns(self) -> dict:
+        """
+        Get the columns that are Oracle keywords and are quoted on the DB.
+
+        :return: (dict): Column names to quoted column names.
+        """
+        return {
+            x: f'"{x.upper()}"' for x in self.__columns__ if x in __oracle_keywords__
+        }
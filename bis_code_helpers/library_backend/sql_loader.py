@@ -0,0 +1,97 @@
+import re as __re__
+
+
+# ----------------------------------------------------
+# Generate SQL*Loader control files and read SQL*Loader logs
+# ----------------------------------------------------
+
+# Format DATE columns are written to the data file in, as an Oracle date mask
+__sql_loader_date_mask__: str = "YYYY-MM-DD HH24:MI:SS"
+
+
+def __sql_loader_field__(column_name: str, column_type: str) -> str:
+    """
+    Generate the field specification of a column in a SQL*Loader control file, from its Oracle data type.
+
+    :param column_name: (str): Name of DB column.
+    :param column_type: (str): Oracle data type, as from SchemaInferrer.column_types.
+    :return: (str): Field specification.
+    """
+    varchar_length = __re__.match(r"VARCHAR2\((\d+)\)", column_type)
+    if varchar_length is not None:
+        # Without a length, SQL*Loader rejects fields longer than 255 characters
+        return "{name} CHAR({length})".format(name=column_name, length=varchar_length.group(1))
+    if column_type == "DATE":
+        return '{name} DATE "{mask}"'.format(name=column_name, mask=__sql_loader_date_mask__)
+    if column_type in ("INT", "NUMBER(3)"):
+        return "{name} INTEGER EXTERNAL".format(name=column_name)
+    return "{name} FLOAT EXTERNAL".format(name=column_name)
+
+
+def generate_sql_loader_control_file(
+    column_types: dict,
+    table_name: str,
+    data_file: str,
+    bad_file: str,
+    load_method: str = "APPEND",
+    delimiter: str = ",",
+) -> str:
+    """
+    Generate a SQL*Loader control file loading a delimited UTF-8 data file into table. Fields may be enclosed
+    in double quotes, with doubled double quotes inside them, and empty fields are loaded as nulls.
+
+    :param column_types: (dict): DB column names to Oracle data types, as from SchemaInferrer.column_types.
+    :param table_name: (str): Name of table to load into.
+    :param data_file: (str): Path of data file, one record per line in column order.
+    :param bad_file: (str): Path of file for rejected records.
+    :param load_method: (str): APPEND, INSERT, REPLACE or TRUNCATE.
+    :param delimiter: (str): Field delimiter of the data file.
+    :return: (str): Control file.
+    """
+    fields: str = ",\n".join(
+        "    " + __sql_loader_field__(name, column_type) for name, column_type in column_types.items()
+    )
+    control_file: str = """LOAD DATA
+CHARACTERSET AL32UTF8
+LENGTH SEMANTICS CHAR
+INFILE '{data_file}'
+BADFILE '{bad_file}'
+{load_method}
+INTO TABLE {table_name}
+FIELDS TERMINATED BY '{delimiter}' OPTIONALLY ENCLOSED BY '"'
+TRAILING NULLCOLS
+(
+{fields}
+)
+""".format(
+        data_file=data_file,
+        bad_file=bad_file,
+        load_method=load_method,
+        table_name=table_name,
+        delimiter=delimiter,
+        fields=fields,
+    )
+    return control_file
+
+
+__sql_loader_log_patterns__: dict = {
+    "loaded": r"(\d+) Rows? successfully loaded",
+    "read": r"Total logical records read:\s+(\d+)",
+    "rejected": r"Total logical records rejected:\s+(\d+)",
+    "discarded": r"Total logical records discarded:\s+(\d+)",
+    "skipped": r"Total logical records skipped:\s+(\d+)",
+}
+
+
+def parse_sql_loader_log(log: str) -> dict:
+    """
+    Read the row counts from a SQL*Loader log. Counts repeated per table are summed.
+
+    :param log: (str): Contents of log file.
+    :return: (dict): read, loaded, rejected, discarded and skipped row counts, None for counts not in the log.
+    """
+    counts: dict = {}
+    for name, pattern in __sql_loader_log_patterns__.items():
+        matches: list = __re__.findall(pattern, log)
+        counts[name] = sum(int(x) for x in matches) if len(matches) > 0 else None
+    return counts
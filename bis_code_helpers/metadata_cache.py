@@ -0,0 +1,169 @@
+import threading as __threading__
+import time as __time__
+import weakref as __weakref__
+from typing import Optional as __Optional__
+
+
+# ----------------------------------------------------
+# Cache of table existence and column names for an engine
+# ----------------------------------------------------
+
+
+class TableMetadataCache:
+    """
+    Cache of table existence and column names for one engine. Entries expire after ttl_seconds
+    and can be invalidated explicitly. Table names are matched case-insensitively.
+
+    :param ttl_seconds: (float): Seconds an entry stays valid for.
+    """
+
+    def __init__(self, ttl_seconds: float = 300):
+        self.ttl_seconds: float = ttl_seconds
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries__: dict = {}
+        self.__lock__: __threading__.Lock = __threading__.Lock()
+
+    @staticmethod
+    def __key__(table_name: str) -> str:
+        return table_name.strip().upper()
+
+    def __lookup__(self, table_name: str, field: str):
+        with self.__lock__:
+            entry: __Optional__[tuple] = self.__entries__.get(self.__key__(table_name), {}).get(field)
+            if entry is None or entry[1] < __time__.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def __store__(self, table_name: str, field: str, value) -> None:
+        with self.__lock__:
+            self.__entries__.setdefault(self.__key__(table_name), {})[field] = (
+                value,
+                __time__.monotonic() + self.ttl_seconds,
+            )
+
+    def get_existence(self, table_name: str) -> __Optional__[bool]:
+        """
+        Get the cached existence of a table.
+
+        :param table_name: (str): Name of table.
+        :return: (Optional[bool]): Existence of table, None if not cached or expired.
+        """
+        return self.__lookup__(table_name, "exists")
+
+    def set_existence(self, table_name: str, exists: bool) -> None:
+        """
+        Cache the existence of a table. Marking a table as not existing also forgets its columns.
+
+        :param table_name: (str): Name of table.
+        :param exists: (bool): Existence of table.
+        :return: None
+        """
+        if not exists:
+            self.invalidate(table_name)
+        self.__store__(table_name, "exists", exists)
+
+    def get_column_names(self, table_name: str) -> __Optional__[list]:
+        """
+        Get the cached column names of a table.
+
+        :param table_name: (str): Name of table.
+        :return: (Optional[list]): Column names, None if not cached or expired.
+        """
+        column_names: __Optional__[list] = self.__lookup__(table_name, "column_names")
+        return None if column_names is None else list(column_names)
+
+    def set_column_names(self, table_name: str, column_names: list) -> None:
+        """
+        Cache the column names of a table, which also marks the table as existing.
+
+        :param table_name: (str): Name of table.
+        :param column_names: (list): Column names of table.
+        :return: None
+        """
+        self.__store__(table_name, "exists", True)
+        self.__store__(table_name, "column_names", list(column_names))
+
+    def invalidate(self, table_name: __Optional__[str] = None) -> None:
+        """
+        Forget everything cached for a table, or for all tables.
+
+        :param table_name: (Optional[str]): Name of table, None for all tables.
+        :return: None
+        """
+        with self.__lock__:
+            if table_name is None:
+                self.__entries__.clear()
+            else:
+                self.__entries__.pop(self.__key__(table_name), None)
+
+    def stats(self) -> dict:
+        """
+        Get the hit and miss counters of the cache.
+
+        :return: (dict): hits, misses, hit_rate and number of cached tables.
+        """
+        with self.__lock__:
+            lookups: int = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "tables": len(self.__entries__),
+            }
+
+
+__metadata_caches__: __weakref__.WeakKeyDictionary = __weakref__.WeakKeyDictionary()
+
+
+def __cache_key__(engine):
+    """
+    Get the engine a cache is kept for. Async engines, sessions and connections share the cache of
+    the engine they wrap.
+
+    :param engine: (Union[sqlalchemy.engine, sqlalchemy.ext.asyncio.AsyncEngine, DatabaseSession]): DB engine.
+    :return: (sqlalchemy.engine): Engine the cache is kept for.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    return getattr(engine, "engine", engine)
+
+
+def enable_metadata_cache(engine, ttl_seconds: float = 300) -> TableMetadataCache:
+    """
+    Enable caching of table existence and column names for an engine. check_existence_of_table and
+    get_db_table_column_names then answer from the cache, and create_table, drop_table and
+    truncate_table keep it up to date. Calling it again returns the existing cache with the new TTL.
+
+    :param engine: (sqlalchemy.engine): DB engine to cache metadata for.
+    :param ttl_seconds: (float): Seconds an entry stays valid for.
+    :return: (TableMetadataCache): The cache of the engine.
+    """
+    engine = __cache_key__(engine)
+    cache: __Optional__[TableMetadataCache] = __metadata_caches__.get(engine)
+    if cache is None:
+        cache = TableMetadataCache(ttl_seconds)
+        __metadata_caches__[engine] = cache
+    cache.ttl_seconds = ttl_seconds
+    return cache
+
+
+def get_metadata_cache(engine) -> __Optional__[TableMetadataCache]:
+    """
+    Get the metadata cache of an engine.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :return: (Optional[TableMetadataCache]): The cache of the engine, None if caching is not enabled.
+    """
+    return __metadata_caches__.get(__cache_key__(engine))
+
+
+def disable_metadata_cache(engine) -> None:
+    """
+    Disable and discard the metadata cache of an engine.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :return: None
+    """
+    __metadata_caches__.pop(__cache_key__(engine), None)
@@ -0,0 +1,401 @@
+import bisect as __bisect__
+import threading as __threading__
+import time as __time__
+from logging import Logger as __Logger__
+from typing import Callable as __Callable__
+from typing import Optional as __Optional__
+
+
+# ----------------------------------------------------
+# Metrics of one database call, passed to the registered sinks
+# ----------------------------------------------------
+
+
+class QueryMetrics:
+    """
+    Timings and sizes of one database call. Phases are only present if the call reached them:
+        - "checkout": getting a connection from the engine, or the session's connection.
+        - "execute": executing the statement.
+        - "fetch": fetching the rows. pandas.read_sql builds its DataFrame while fetching, so for
+          the default result mode of execute_select_query_on_db this includes the build.
+        - "build": building the DataFrame or Arrow result from the fetched rows.
+        - "commit": committing an action query.
+
+    pooled_checkout_seconds is the checkout time of a connection the pool already held, 0 for a newly
+    created connection. It includes any time spent queueing for the connection, but also its pre-ping and reset.
+
+    :param operation: (str): Function making the call, e.g. "execute_select_query_on_db".
+    :param sql_length: (int): Length of the SQL text.
+    """
+
+    def __init__(self, operation: str, sql_length: int):
+        self.operation: str = operation
+        self.sql_length: int = sql_length
+        self.phases: dict = {}
+        self.total_seconds: float = 0.0
+        self.rows: __Optional__[int] = None
+        self.pooled_checkout_seconds: float = 0.0
+        self.new_connection: bool = False
+        self.error: __Optional__[str] = None
+
+    def __repr__(self) -> str:
+        return (
+            "QueryMetrics(operation={operation!r}, total_seconds={total:.6f}, phases={phases}, rows={rows}, "
+            "sql_length={sql_length}, pooled_checkout_seconds={pooled_checkout:.6f}, error={error!r})".format(
+                operation=self.operation,
+                total=self.total_seconds,
+                phases={k: round(v, 6) for k, v in self.phases.items()},
+                rows=self.rows,
+                sql_length=self.sql_length,
+                pooled_checkout=self.pooled_checkout_seconds,
+                error=self.error,
+            )
+        )
+
+
+# ----------------------------------------------------
+# Registry of sinks receiving the metrics of every database call
+# ----------------------------------------------------
+
+# Replaced rather than changed in place, so calls can read it without a lock
+__sinks__: tuple = ()
+__sinks_lock__: __threading__.Lock = __threading__.Lock()
+
+
+def add_instrumentation_sink(sink: __Callable__[[QueryMetrics], None]) -> __Callable__[[QueryMetrics], None]:
+    """
+    Register a sink called with the QueryMetrics of every database call made by the database interaction
+    functions, on the thread that made the call. While no sink is registered the calls are not timed.
+    Errors raised by a sink are logged and otherwise ignored.
+
+    :param sink: (Callable[[QueryMetrics], None]): Sink to register, e.g. a MetricsRecorder.
+    :return: (Callable[[QueryMetrics], None]): The sink, to allow use as a decorator.
+    """
+    global __sinks__
+    with __sinks_lock__:
+        if sink not in __sinks__:
+            __sinks__ = __sinks__ + (sink,)
+    return sink
+
+
+def remove_instrumentation_sink(sink: __Callable__[[QueryMetrics], None]) -> None:
+    """
+    Unregister a sink registered with add_instrumentation_sink.
+
+    :param sink: (Callable[[QueryMetrics], None]): Sink to unregister.
+    :return: None
+    """
+    global __sinks__
+    with __sinks_lock__:
+        __sinks__ = tuple(x for x in __sinks__ if x is not sink)
+
+
+# ----------------------------------------------------
+# Timers used by the database interaction functions
+# ----------------------------------------------------
+
+
+class __NullQueryTimer__:
+    """
+    Timer used while no sink is registered, doing nothing.
+    """
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def skip(self) -> None:
+        pass
+
+    def checked_out(self, connection) -> None:
+        pass
+
+    def watch_execute(self, connection) -> None:
+        pass
+
+    def unwatch_execute(self, connection) -> None:
+        pass
+
+    def finish(self, rows: __Optional__[int] = None, error: __Optional__[BaseException] = None) -> None:
+        pass
+
+
+__null_query_timer__: __NullQueryTimer__ = __NullQueryTimer__()
+
+
+class __QueryTimer__:
+    """
+    Timer of one database call. Each lap adds the time since the previous lap to a phase.
+    """
+
+    def __init__(self, operation: str, query: str, logger: __Optional__[__Logger__], sinks: tuple):
+        self.metrics: QueryMetrics = QueryMetrics(operation, len(query) if query is not None else 0)
+        self.logger: __Optional__[__Logger__] = logger
+        self.sinks: tuple = sinks
+        self.start: float = __time__.perf_counter()
+        self.last: float = self.start
+        self.execute_listener = None
+
+    def lap(self, phase: str) -> None:
+        now: float = __time__.perf_counter()
+        self.metrics.phases[phase] = self.metrics.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def skip(self) -> None:
+        self.last = __time__.perf_counter()
+
+    def checked_out(self, connection) -> None:
+        """
+        End the checkout phase. A connection the pool already held also counts its checkout as pooled checkout,
+        a newly created one is marked as new.
+        """
+        self.lap("checkout")
+        info: __Optional__[dict] = getattr(getattr(connection, "connection", None), "info", None)
+        if info is None:
+            return
+        if info.get("bis_code_helpers_seen"):
+            self.metrics.pooled_checkout_seconds += self.metrics.phases["checkout"]
+        else:
+            info["bis_code_helpers_seen"] = True
+            self.metrics.new_connection = True
+
+    def watch_execute(self, connection) -> None:
+        """
+        End the execute phase when a statement run by someone else on connection, e.g. pandas.read_sql,
+        finishes executing.
+        """
+        import sqlalchemy as __sq__
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            self.lap("execute")
+
+        self.execute_listener = after_cursor_execute
+        __sq__.event.listen(connection, "after_cursor_execute", after_cursor_execute)
+
+    def unwatch_execute(self, connection) -> None:
+        import sqlalchemy as __sq__
+
+        if self.execute_listener is not None:
+            __sq__.event.remove(connection, "after_cursor_execute", self.execute_listener)
+            self.execute_listener = None
+
+    def finish(self, rows: __Optional__[int] = None, error: __Optional__[BaseException] = None) -> None:
+        self.metrics.total_seconds = __time__.perf_counter() - self.start
+        self.metrics.rows = rows
+        if error is not None:
+            self.metrics.error = str(error)
+        for sink in self.sinks:
+            try:
+                sink(self.metrics)
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.warning("Instrumentation sink {sink!r} failed: {e}".format(sink=sink, e=e))
+
+
+def __start_query__(operation: str, query: str, logger: __Optional__[__Logger__] = None):
+    """
+    Start timing a database call.
+
+    :param operation: (str): Function making the call.
+    :param query: (str): SQL text of the call.
+    :param logger: (logging.Logger): Logger for errors raised by sinks.
+    :return: (Union[__QueryTimer__, __NullQueryTimer__]): Timer, doing nothing while no sink is registered.
+    """
+    sinks: tuple = __sinks__
+    if len(sinks) == 0:
+        return __null_query_timer__
+    return __QueryTimer__(operation, query, logger, sinks)
+
+
+# ----------------------------------------------------
+# In-process histograms of the recorded metrics
+# ----------------------------------------------------
+
+
+def __exponential_bounds__(lowest: float, factor: float, count: int) -> list:
+    return [lowest * factor ** i for i in range(count)]
+
+
+class Histogram:
+    """
+    Thread-safe histogram counting values into buckets with fixed upper bounds, plus one bucket for values
+    above the highest bound. Quantiles are estimated from the buckets, so they are as precise as the bounds.
+
+    :param bounds: (list): Ascending upper bounds of the buckets.
+    """
+
+    def __init__(self, bounds: list):
+        self.bounds: list = list(bounds)
+        self.counts: list = [0] * (len(self.bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: __Optional__[float] = None
+        self.max: __Optional__[float] = None
+        self.__lock__: __threading__.Lock = __threading__.Lock()
+
+    def record(self, value: float) -> None:
+        """
+        Count a value.
+
+        :param value: (float): Value to count.
+        :return: None
+        """
+        with self.__lock__:
+            self.counts[__bisect__.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> __Optional__[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in, capped at the largest value seen.
+
+        :param q: (float): Quantile between 0 and 1, e.g. 0.99.
+        :return: (Optional[float]): Estimated quantile, None if no values were counted.
+        """
+        with self.__lock__:
+            if self.count == 0:
+                return None
+            rank: float = q * self.count
+            cumulative: int = 0
+            for i, count in enumerate(self.counts):
+                cumulative += count
+                if cumulative >= rank and count > 0:
+                    return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+            return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Summarize the histogram.
+
+        :return: (dict): Count, sum, min, max, mean, p50, p90, p99 and the bucket counts by upper bound.
+        """
+        summary: dict = {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count > 0 else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+        with self.__lock__:
+            summary["buckets"] = dict(zip([str(x) for x in self.bounds] + ["+Inf"], self.counts))
+        return summary
+
+
+__seconds_bounds__: list = __exponential_bounds__(0.0001, 2, 21)
+__size_bounds__: list = __exponential_bounds__(1, 4, 13)
+
+
+class MetricsRecorder:
+    """
+    Sink keeping histograms of the metrics of every database call, by function and measure:
+    "<operation>.<phase>_seconds", "<operation>.total_seconds", "<operation>.pooled_checkout_seconds",
+    "<operation>.rows" and "<operation>.sql_length", plus error counts by function.
+
+    Register it to start recording::
+
+        recorder = add_instrumentation_sink(MetricsRecorder())
+        ...
+        recorder.snapshot()["execute_select_query_on_db.total_seconds"]["p99"]
+    """
+
+    def __init__(self):
+        self.histograms: dict = {}
+        self.errors: dict = {}
+        self.__lock__: __threading__.Lock = __threading__.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        """
+        Get a histogram by name, creating it if needed.
+
+        :param name: (str): Name of histogram.
+        :return: (Histogram): The histogram.
+        """
+        histogram: __Optional__[Histogram] = self.histograms.get(name)
+        if histogram is None:
+            bounds: list = __seconds_bounds__ if name.endswith("_seconds") else __size_bounds__
+            with self.__lock__:
+                histogram = self.histograms.setdefault(name, Histogram(bounds))
+        return histogram
+
+    def __call__(self, metrics: QueryMetrics) -> None:
+        prefix: str = metrics.operation + "."
+        for phase, seconds in metrics.phases.items():
+            self.histogram(prefix + phase + "_seconds").record(seconds)
+        self.histogram(prefix + "total_seconds").record(metrics.total_seconds)
+        self.histogram(prefix + "pooled_checkout_seconds").record(metrics.pooled_checkout_seconds)
+        self.histogram(prefix + "sql_length").record(metrics.sql_length)
+        if metrics.rows is not None and metrics.rows >= 0:
+            self.histogram(prefix + "rows").record(metrics.rows)
+        if metrics.error is not None:
+            with self.__lock__:
+                self.errors[metrics.operation] = self.errors.get(metrics.operation, 0) + 1
+
+    def snapshot(self) -> dict:
+        """
+        Summarize every histogram, see Histogram.to_dict, and the error counts under "errors".
+
+        :return: (dict): Summaries by histogram name.
+        """
+        with self.__lock__:
+            histograms: dict = dict(self.histograms)
+            errors: dict = dict(self.errors)
+        summary: dict = {name: histogram.to_dict() for name, histogram in sorted(histograms.items())}
+        summary["errors"] = errors
+        return summary
+
+    def to_prometheus(self, prefix: str = "bis_code_helpers") -> str:
+        """
+        Export the histograms in the Prometheus text format, one histogram metric per measure labelled
+        by operation, and the error counts as a counter.
+
+        :param prefix: (str): Prefix of the metric names.
+        :return: (str): Metrics in the Prometheus text format.
+        """
+        with self.__lock__:
+            histograms: dict = dict(self.histograms)
+            errors: dict = dict(self.errors)
+
+        by_measure: dict = {}
+        for name, histogram in sorted(histograms.items()):
+            operation, measure = name.rsplit(".", 1)
+            by_measure.setdefault(measure, []).append((operation, histogram))
+
+        lines: list = []
+        for measure, histograms in by_measure.items():
+            metric: str = "{prefix}_{measure}".format(prefix=prefix, measure=measure)
+            lines.append("# TYPE {metric} histogram".format(metric=metric))
+            for operation, histogram in histograms:
+                cumulative: int = 0
+                for bound, count in zip(histogram.bounds + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    lines.append('{metric}_bucket{{operation="{operation}",le="{bound}"}} {count}'.format(
+                        metric=metric, operation=operation, bound=bound, count=cumulative
+                    ))
+                lines.append('{metric}_sum{{operation="{operation}"}} {total}'.format(
+                    metric=metric, operation=operation, total=histogram.total
+                ))
+                lines.append('{metric}_count{{operation="{operation}"}} {count}'.format(
+                    metric=metric, operation=operation, count=histogram.count
+                ))
+
+        metric = "{prefix}_errors_total".format(prefix=prefix)
+        lines.append("# TYPE {metric} counter".format(metric=metric))
+        for operation, count in sorted(errors.items()):
+            lines.append('{metric}{{operation="{operation}"}} {count}'.format(
+                metric=metric, operation=operation, count=count
+            ))
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded.
+
+        :return: None
+        """
+        with self.__lock__:
+            self.histograms = {}
+            self.errors = {}
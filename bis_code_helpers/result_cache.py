@@ -0,0 +1,441 @@
+import collections as __collections__
+import hashlib as __hashlib__
+import json as __json__
+import os as __os__
+import re as __re__
+import threading as __threading__
+import time as __time__
+import weakref as __weakref__
+from typing import Optional as __Optional__
+
+import bis_code_helpers
+
+
+# ----------------------------------------------------
+# Cache of select query results for an engine
+# ----------------------------------------------------
+
+__string_literal_pattern__: __re__.Pattern = __re__.compile(r"('(?:[^']|'')*')")
+# Quoted names, string literals, possibly schema qualified names and single characters, in query order
+__sql_token_pattern__: __re__.Pattern = __re__.compile(
+    r"""'(?:[^']|'')*'|(?:"[^"]+"|[\w$#]+)(?:\s*\.\s*(?:"[^"]+"|[\w$#]+))*|\S"""
+)
+# Keywords ending the table list of a FROM clause
+__from_clause_end_keywords__: frozenset = frozenset(
+    [
+        "where", "group", "order", "having", "union", "minus", "intersect", "except",
+        "connect", "start", "fetch", "offset", "for", "model", "window",
+    ]
+)
+
+
+def __normalize_sql__(query: str) -> str:
+    """
+    Collapse whitespace outside string literals and drop a trailing semicolon, so queries differing
+    only in layout share a cache entry.
+
+    :param query: (str): Query to normalize.
+    :return: (str): Normalized query.
+    """
+    parts: list = __string_literal_pattern__.split(query)
+    # Odd indices are the string literals captured by the split
+    parts = [x if i % 2 == 1 else __re__.sub(r"\s+", " ", x) for i, x in enumerate(parts)]
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def __table_key__(table_name: str) -> str:
+    """
+    Get the name a table is invalidated by: the unquoted, upper case name without its schema.
+
+    :param table_name: (str): Name of table, optionally schema qualified.
+    :return: (str): Key of table.
+    """
+    return table_name.split(".")[-1].strip().strip('"').upper()
+
+
+def __referenced_tables__(query: str) -> frozenset:
+    """
+    Find the tables a select query reads: the names in the comma separated table list of each FROM clause,
+    and after each JOIN. Tables in subqueries are found by the FROM clause of the subquery.
+
+    :param query: (str): Query to scan.
+    :return: (frozenset): Keys of the tables read.
+    """
+    tables: set = set()
+    # Whether the tokens at each open parenthesis level are in the table list of a FROM clause
+    in_from_clause: list = [False]
+    expect_table: bool = False
+    for token in __sql_token_pattern__.findall(query):
+        keyword: str = token.lower()
+        if token == "(":
+            in_from_clause.append(False)
+            expect_table = False
+        elif token == ")":
+            if len(in_from_clause) > 1:
+                in_from_clause.pop()
+            expect_table = False
+        elif keyword in ("from", "join"):
+            in_from_clause[-1] = True
+            expect_table = True
+        elif expect_table:
+            expect_table = False
+            if token[0] == '"' or token[0].isalnum() or token[0] in "_$#":
+                tables.add(__table_key__(token))
+        elif in_from_clause[-1]:
+            if token == ",":
+                expect_table = True
+            elif keyword in __from_clause_end_keywords__:
+                in_from_clause[-1] = False
+    return frozenset(tables)
+
+
+def __result_size__(result) -> int:
+    """
+    Estimate the bytes of memory a DataFrame or Arrow table uses.
+
+    :param result: (Union[pandas.DataFrame, pyarrow.Table]): Query result.
+    :return: (int): Bytes used.
+    """
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    return int(result.nbytes)
+
+
+class ResultCache:
+    """
+    Cache of select query results for one engine, keyed by the normalized SQL, the bind values and the
+    result mode. Entries expire after ttl_seconds, and the least recently used entries are evicted when
+    the results held exceed max_bytes. Results larger than max_bytes are not cached.
+
+    With a disk_path, results are also written there as Parquet files, which needs pyarrow. A result
+    evicted from memory, or cached by an earlier process, is then read back from disk until it expires.
+
+    Entries are invalidated by the tables their query reads, from the table lists of its FROM clauses and
+    its JOINs, matched by name without schema, case-insensitively. Each invalidation also moves the
+    generation of the table on, so a result read before the table changed, but put once it was
+    invalidated, is not cached (see generation).
+
+    :param namespace: (str): Identity of the database, keeping disk entries of different databases apart.
+    :param max_bytes: (int): Most bytes of results held in memory.
+    :param ttl_seconds: (float): Seconds an entry stays valid for.
+    :param disk_path: (Optional[str]): Directory of the on-disk tier, None for memory only.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "",
+        max_bytes: int = 256 * 2 ** 20,
+        ttl_seconds: float = 300,
+        disk_path: __Optional__[str] = None,
+    ):
+        self.namespace: str = namespace
+        self.max_bytes: int = max_bytes
+        self.ttl_seconds: float = ttl_seconds
+        self.disk_path: __Optional__[str] = disk_path
+        self.bytes: int = 0
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.disk_errors: int = 0
+        # key -> (result, size, expiry on the monotonic clock, referenced tables)
+        self.__entries__: __collections__.OrderedDict = __collections__.OrderedDict()
+        # Invalidations so far, of all tables and by table key
+        self.__generation__: int = 0
+        self.__table_generations__: dict = {}
+        self.__lock__: __threading__.Lock = __threading__.Lock()
+        if disk_path is not None:
+            __os__.makedirs(disk_path, exist_ok=True)
+            self.__prune_disk__()
+
+    def key(self, query: str, binds: __Optional__[dict] = None, result_mode: str = "pandas") -> str:
+        """
+        Get the cache key of a query.
+
+        :param query: (str): Query to be executed.
+        :param binds: (Optional[dict]): Bind values for the query.
+        :param result_mode: (str): Result mode of execute_select_query_on_db.
+        :return: (str): Cache key.
+        """
+        binds_repr: list = sorted((str(k), repr(v)) for k, v in (binds or {}).items())
+        identity: str = __json__.dumps([self.namespace, __normalize_sql__(query), binds_repr, result_mode])
+        return __hashlib__.sha256(identity.encode()).hexdigest()
+
+    def generation(self, query: str) -> tuple:
+        """
+        Get the generation of the tables a query reads, to be taken before the query is executed and passed
+        to put with its result. The result is only cached if none of the tables was invalidated in between.
+
+        :param query: (str): Query to be executed.
+        :return: (tuple): Generation of the tables read.
+        """
+        tables: frozenset = __referenced_tables__(query)
+        with self.__lock__:
+            return self.__generation_of__(tables)
+
+    def get(self, key: str):
+        """
+        Get a cached result, from memory or else from disk. DataFrames are returned as copies, so changing
+        them does not change the cache.
+
+        :param key: (str): Cache key.
+        :return: (Optional[Union[pandas.DataFrame, pyarrow.Table]]): Result, None if not cached or expired.
+        """
+        with self.__lock__:
+            entry: __Optional__[tuple] = self.__entries__.get(key)
+            if entry is not None and entry[2] < __time__.monotonic():
+                self.__remove__(key)
+                entry = None
+            if entry is not None:
+                self.__entries__.move_to_end(key)
+                self.memory_hits += 1
+                return __copy_result__(entry[0])
+
+        loaded: __Optional__[tuple] = self.__read_disk__(key)
+        with self.__lock__:
+            if loaded is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        result, expires_at, tables = loaded
+        self.__put_memory__(key, result, __time__.monotonic() + expires_at - __time__.time(), tables)
+        return __copy_result__(result)
+
+    def put(self, key: str, query: str, result, generation: __Optional__[tuple] = None) -> None:
+        """
+        Cache a result.
+
+        :param key: (str): Cache key, see key.
+        :param query: (str): Query the result is of, for the tables it reads.
+        :param result: (Union[pandas.DataFrame, pyarrow.Table]): Result to cache.
+        :param generation: (Optional[tuple]): Generation taken before the query was executed, see generation.
+            The result is not cached if a table it reads has been invalidated since.
+        :return: None
+        """
+        tables: frozenset = __referenced_tables__(query)
+        result = __copy_result__(result)
+        if not self.__put_memory__(key, result, __time__.monotonic() + self.ttl_seconds, tables, generation):
+            return
+        self.__write_disk__(key, result, __time__.time() + self.ttl_seconds, tables)
+        if generation is not None and self.generation(query) != generation:
+            # Invalidated while the file was written, after the invalidation had removed the files
+            self.__remove_disk__(key)
+
+    def invalidate(self, table_name: __Optional__[str] = None) -> None:
+        """
+        Forget every result read from a table, or all results, in memory and on disk.
+
+        :param table_name: (Optional[str]): Name of table, None for all tables.
+        :return: None
+        """
+        table_key: __Optional__[str] = None if table_name is None else __table_key__(table_name)
+        with self.__lock__:
+            if table_key is None:
+                self.__generation__ += 1
+            else:
+                self.__table_generations__[table_key] = self.__table_generations__.get(table_key, 0) + 1
+            for key in [k for k, v in self.__entries__.items() if table_key is None or table_key in v[3]]:
+                self.__remove__(key)
+        if self.disk_path is not None:
+            for key, metadata in self.__disk_entries__():
+                if table_key is None or table_key in metadata["tables"]:
+                    self.__remove_disk__(key)
+
+    def stats(self) -> dict:
+        """
+        Get the hit and miss counters of the cache.
+
+        :return: (dict): hits, memory_hits, disk_hits, misses, hit_rate, entries and bytes in memory, evictions
+            and disk_errors.
+        """
+        with self.__lock__:
+            hits: int = self.memory_hits + self.disk_hits
+            lookups: int = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups > 0 else 0.0,
+                "entries": len(self.__entries__),
+                "bytes": self.bytes,
+                "evictions": self.evictions,
+                "disk_errors": self.disk_errors,
+            }
+
+    # Memory tier, the lock must be held by callers of __remove__ and __generation_of__
+
+    def __generation_of__(self, tables: frozenset) -> tuple:
+        return self.__generation__, tuple(sorted((x, self.__table_generations__.get(x, 0)) for x in tables))
+
+    def __remove__(self, key: str) -> None:
+        entry: __Optional__[tuple] = self.__entries__.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def __put_memory__(
+        self, key: str, result, expires_at: float, tables: frozenset, generation: __Optional__[tuple] = None
+    ) -> bool:
+        size: int = __result_size__(result)
+        with self.__lock__:
+            if generation is not None and self.__generation_of__(tables) != generation:
+                return False
+            self.__remove__(key)
+            if size > self.max_bytes:
+                return False
+            self.__entries__[key] = (result, size, expires_at, tables)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self.__remove__(next(iter(self.__entries__)))
+                self.evictions += 1
+        return True
+
+    # Disk tier, one Parquet file and one JSON metadata file per entry
+
+    def __disk_file__(self, key: str, extension: str) -> str:
+        return __os__.path.join(self.disk_path, key + extension)
+
+    def __disk_entries__(self) -> list:
+        entries: list = []
+        for file_name in __os__.listdir(self.disk_path):
+            if not file_name.endswith(".json"):
+                continue
+            key: str = file_name[: -len(".json")]
+            try:
+                with open(self.__disk_file__(key, ".json")) as f:
+                    entries.append((key, __json__.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def __remove_disk__(self, key: str) -> None:
+        for extension in [".json", ".parquet"]:
+            try:
+                __os__.remove(self.__disk_file__(key, extension))
+            except FileNotFoundError:
+                pass
+
+    def __prune_disk__(self) -> None:
+        for key, metadata in self.__disk_entries__():
+            if metadata.get("expires_at", 0) < __time__.time():
+                self.__remove_disk__(key)
+
+    def __write_disk__(self, key: str, result, expires_at: float, tables: frozenset) -> None:
+        if self.disk_path is None:
+            return
+        try:
+            import pyarrow.parquet as __pq__
+
+            is_arrow: bool = not hasattr(result, "memory_usage")
+            temporary_file: str = self.__disk_file__(key, ".parquet.{pid}.tmp".format(pid=__os__.getpid()))
+            if is_arrow:
+                __pq__.write_table(result, temporary_file)
+            else:
+                result.to_parquet(temporary_file)
+            __os__.replace(temporary_file, self.__disk_file__(key, ".parquet"))
+            # The metadata is written last, as an entry is only read once it has metadata
+            if is_arrow:
+                result_format: str = "arrow"
+            elif all(getattr(x, "pyarrow_dtype", None) is not None for x in result.dtypes):
+                result_format = "arrow_pandas"
+            else:
+                result_format = "pandas"
+            metadata: dict = {"expires_at": expires_at, "tables": sorted(tables), "format": result_format}
+            temporary_file = self.__disk_file__(key, ".json.{pid}.tmp".format(pid=__os__.getpid()))
+            with open(temporary_file, "w") as f:
+                __json__.dump(metadata, f)
+            __os__.replace(temporary_file, self.__disk_file__(key, ".json"))
+        except Exception:
+            with self.__lock__:
+                self.disk_errors += 1
+
+    def __read_disk__(self, key: str) -> __Optional__[tuple]:
+        if self.disk_path is None or not __os__.path.exists(self.__disk_file__(key, ".json")):
+            return None
+        try:
+            import pyarrow.parquet as __pq__
+
+            with open(self.__disk_file__(key, ".json")) as f:
+                metadata: dict = __json__.load(f)
+            if metadata["expires_at"] < __time__.time():
+                self.__remove_disk__(key)
+                return None
+            table = __pq__.read_table(self.__disk_file__(key, ".parquet"))
+            if metadata["format"] == "arrow":
+                result = table
+            elif metadata["format"] == "arrow_pandas":
+                import pandas as __pd__
+
+                result = table.to_pandas(types_mapper=__pd__.ArrowDtype)
+            else:
+                result = table.to_pandas()
+            return result, metadata["expires_at"], frozenset(metadata["tables"])
+        except Exception:
+            with self.__lock__:
+                self.disk_errors += 1
+            return None
+
+
+def __copy_result__(result):
+    """
+    Copy a DataFrame so the cache and its callers do not share it. Arrow tables are immutable and shared.
+    """
+    return result.copy() if hasattr(result, "memory_usage") else result
+
+
+__result_caches__: __weakref__.WeakKeyDictionary = __weakref__.WeakKeyDictionary()
+
+
+def enable_result_cache(
+    engine,
+    max_bytes: int = 256 * 2 ** 20,
+    ttl_seconds: float = 300,
+    disk_path: __Optional__[str] = None,
+) -> ResultCache:
+    """
+    Enable caching of select query results for an engine. execute_select_query_on_db then answers repeated
+    queries from the cache, unless called with use_result_cache=False. truncate_table, drop_table and
+    the upload, upsert and update functions invalidate the results read from the tables they change. Changes made in any other way, e.g. by execute_action_query_on_db or by other programs,
+    are only seen once the entries expire or are invalidated with ResultCache.invalidate.
+    Calling it again returns the existing cache with the new limits.
+
+    :param engine: (sqlalchemy.engine): DB engine to cache results for.
+    :param max_bytes: (int): Most bytes of results held in memory.
+    :param ttl_seconds: (float): Seconds an entry stays valid for.
+    :param disk_path: (Optional[str]): Directory to also keep results in as Parquet files, needs pyarrow.
+    :return: (ResultCache): The cache of the engine.
+    """
+    engine = bis_code_helpers.metadata_cache.__cache_key__(engine)
+    cache: __Optional__[ResultCache] = __result_caches__.get(engine)
+    if cache is None:
+        namespace: str = engine.url.render_as_string(hide_password=True) if hasattr(engine, "url") else ""
+        cache = ResultCache(namespace, max_bytes, ttl_seconds, disk_path)
+        __result_caches__[engine] = cache
+    cache.max_bytes = max_bytes
+    cache.ttl_seconds = ttl_seconds
+    if disk_path != cache.disk_path:
+        if disk_path is not None:
+            __os__.makedirs(disk_path, exist_ok=True)
+        cache.disk_path = disk_path
+    return cache
+
+
+def get_result_cache(engine) -> __Optional__[ResultCache]:
+    """
+    Get the result cache of an engine.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :return: (Optional[ResultCache]): The cache of the engine, None if caching is not enabled.
+    """
+    return __result_caches__.get(bis_code_helpers.metadata_cache.__cache_key__(engine))
+
+
+def disable_result_cache(engine) -> None:
+    """
+    Disable and discard the in-memory result cache of an engine. Results on disk are kept for the next
+    cache enabled with the same disk_path.
+
+    :param engine: (sqlalchemy.engine): DB engine.
+    :return: None
+    """
+    __result_caches__.pop(bis_code_helpers.metadata_cache.__cache_key__(engine), None)
@@ -1,28 +1,119 @@
+import collections as __collections__
+import os as __os__
+import signal as __signal__
 import subprocess as __subprocess__
+import threading as __threading__
+import time as __time__
 import logging as __logging__
+from typing import Callable as __Callable__
+from typing import Iterable as __Iterable__
 from typing import Optional as __Optional__
 
 import bis_code_helpers
 
 
-def run_external_command(command_arg_list: list, logger: __Optional__[__logging__.Logger] = None) -> str:
+# Longest piece of a line read at once when streaming, so output without line breaks cannot fill memory
+__max_line_bytes__: int = 1024 * 1024
+
+# Most bytes of output kept as the tail when streaming, so tail_lines long lines cannot fill memory either
+__max_tail_bytes__: int = 8 * 1024 * 1024
+
+# Seconds to wait for the output pipe to close after killing a command that timed out
+__kill_grace_seconds__: float = 5
+
+
+def run_external_command(
+    command_arg_list: list,
+    logger: __Optional__[__logging__.Logger] = None,
+    accepted_return_codes: __Iterable__[int] = (0,),
+    timeout_seconds: __Optional__[float] = None,
+    stream_output: bool = False,
+    output_callback: __Optional__[__Callable__[[str], None]] = None,
+    tail_lines: int = 1000,
+) -> str:
     """
     Run an external command, wait for it to finish, check return code, and return
     combined stdout and stderr as as string.
 
     arg list is in the format ['executable', 'arg0', 'arg1', ...].
 
+    For commands with a lot of output, stream_output or output_callback forward the output line by line while
+    the command runs, to output_callback, else to logger at info level, else to stdout. Only the last
+    tail_lines lines, and at most 8 MiB of them, are then kept, for the return value and the error message.
+
+    With timeout_seconds the command runs in a new process group, which is killed, with any processes the
+    command started, if it does not finish in time.
+
     :param command_arg_list: (list): List of args.
     :param logger: (logging.Logger): Logger to use for failure logging.
-    :return: (str): Combined stdout and stderr.
+    :param accepted_return_codes: (Iterable[int]): Return codes counted as success, e.g. (0, 2) for warnings.
+    :param timeout_seconds: (Optional[float]): Most seconds to wait for the command, None for no limit.
+    :param stream_output: (bool): Forward output line by line, keeping only the last tail_lines lines.
+    :param output_callback: (Optional[Callable[[str], None]]): Called with each line of output, without its line break. Implies stream_output.
+    :param tail_lines: (int): Lines of output kept when streaming, fewer if they hold more than 8 MiB.
+    :return: (str): Combined stdout and stderr, only the last tail_lines lines when streaming.
     """
-    p: __subprocess__.run = __subprocess__.run(
-        command_arg_list, stdout=__subprocess__.PIPE, stderr=__subprocess__.STDOUT
+    process_group: bool = timeout_seconds is not None
+    deadline: __Optional__[float] = __time__.monotonic() + timeout_seconds if process_group else None
+    p: __subprocess__.Popen = __subprocess__.Popen(
+        command_arg_list,
+        stdout=__subprocess__.PIPE,
+        stderr=__subprocess__.STDOUT,
+        **(__new_process_group_options__() if process_group else {}),
     )
-    stdout: str = p.stdout.decode()
+    error: __Optional__[Exception] = None
+    if stream_output or output_callback is not None:
+        if output_callback is None:
+            output_callback = logger.info if logger else print
+        tail: __collections__.deque = __collections__.deque(maxlen=tail_lines)
+        reader_errors: list = []
+        reader: __threading__.Thread = __threading__.Thread(
+            target=__forward_output__, args=(p.stdout, output_callback, tail, reader_errors), daemon=True
+        )
+        reader.start()
+        try:
+            p.wait(timeout=timeout_seconds)
+            reader.join(None if deadline is None else max(deadline - __time__.monotonic(), 0))
+            if reader.is_alive():
+                # The command has exited, but processes it started still hold its output open
+                raise __subprocess__.TimeoutExpired(p.args, timeout_seconds)
+        except __subprocess__.TimeoutExpired as e:
+            error = e
+            __kill_process_tree__(p, process_group)
+            reader.join(__kill_grace_seconds__)
+        except BaseException:
+            __kill_process_tree__(p, process_group)
+            reader.join(__kill_grace_seconds__)
+            raise
+        finally:
+            # A reader still blocked on a pipe held by an escaped process is left to its daemon thread
+            if not reader.is_alive():
+                p.stdout.close()
+        if reader_errors:
+            raise reader_errors[0]
+        stdout: str = b"".join(tail).decode(errors="replace")
+    else:
+        try:
+            output, _ = p.communicate(timeout=timeout_seconds)
+        except __subprocess__.TimeoutExpired as e:
+            error = e
+            __kill_process_tree__(p, process_group)
+            try:
+                output, _ = p.communicate(timeout=__kill_grace_seconds__)
+            except __subprocess__.TimeoutExpired as e_grace:
+                output = e_grace.output or b""
+        except BaseException:
+            __kill_process_tree__(p, process_group)
+            raise
+        stdout = output.decode()
+    if error is not None:
+        error.output = stdout
     # Check that the return code is a success.
     try:
-        p.check_returncode()
+        if error is not None:
+            raise error
+        if p.returncode not in accepted_return_codes:
+            raise __subprocess__.CalledProcessError(p.returncode, p.args, stdout)
     except Exception as e:
         if logger:
             raise bis_code_helpers.LoggedSubprocessError(logger, f"{str(e)}\n\nThe output of the subprocess is: {stdout}")
@@ -30,3 +121,72 @@ def run_external_command(command_arg_list: list, logger: __Optional__[__logging_
             print(stdout)
             raise e
     return stdout
+
+
+def __forward_output__(
+    stream, output_callback: __Callable__[[str], None], tail: __collections__.deque, reader_errors: list
+) -> None:
+    """
+    Forward the output of a command line by line, keeping the last lines in tail, as bytes, up to
+    __max_tail_bytes__ of them. Runs in its own thread, so that the output pipe never fills up while waiting
+    for the command.
+
+    :param stream: (io.BufferedReader): stdout pipe of the command.
+    :param output_callback: (Callable[[str], None]): Called with each line, without its line break.
+    :param tail: (collections.deque): Buffer of the last lines, bounded by its maxlen.
+    :param reader_errors: (list): Gets the exception raised by output_callback, if any.
+    """
+    tail_bytes: int = 0
+    for raw_line in iter(lambda: stream.readline(__max_line_bytes__), b""):
+        line: str = raw_line.decode(errors="replace")
+        if tail.maxlen != 0:
+            if len(tail) == tail.maxlen:
+                tail_bytes -= len(tail.popleft())
+            tail.append(raw_line)
+            tail_bytes += len(raw_line)
+            while tail_bytes > __max_tail_bytes__:
+                tail_bytes -= len(tail.popleft())
+        if not reader_errors:
+            try:
+                output_callback(line.rstrip("\r\n"))
+            except Exception as e:
+                # Keep reading, so the command does not block on a full pipe, and raise once it is stopped
+                reader_errors.append(e)
+
+
+def __new_process_group_options__() -> dict:
+    """
+    Get the Popen options starting a command in a new process group, so that it can be killed with its children.
+
+    :return: (dict): Keyword arguments for subprocess.Popen.
+    """
+    if __os__.name == "nt":
+        return {"creationflags": __subprocess__.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def __kill_process_tree__(p: __subprocess__.Popen, process_group: bool) -> None:
+    """
+    Kill a command, and with process_group the processes it started in the process group it was started in.
+    The group is killed even if the command itself has exited, as its children may still be running.
+
+    :param p: (subprocess.Popen): Command.
+    :param process_group: (bool): The command was started in its own process group.
+    """
+    if process_group:
+        if __os__.name == "nt":
+            if p.poll() is None:
+                __subprocess__.run(
+                    ["taskkill", "/F", "/T", "/PID", str(p.pid)],
+                    stdout=__subprocess__.DEVNULL,
+                    stderr=__subprocess__.DEVNULL,
+                )
+        else:
+            try:
+                # The group id is the pid of the command, and is not reused while any process is left in the group
+                __os__.killpg(p.pid, __signal__.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+    if p.poll() is None:
+        p.kill()
+    p.wait()
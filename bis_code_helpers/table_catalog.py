@@ -0,0 +1,142 @@
+import pandas as __pd__
+from logging import Logger as __Logger__
+from typing import Optional as __Optional__
+
+import bis_code_helpers
+
+
+# ----------------------------------------------------
+# Snapshot of the existence and columns of many tables
+# ----------------------------------------------------
+
+
+class TableCatalog:
+    """
+    Snapshot of the existence and columns of a set of tables, loaded from the data dictionary in one query
+    by load_table_catalog. Table names are matched case-insensitively and may be qualified with their
+    owner (OWNER.TABLE).
+
+    :param table_names: (list): Names of tables that were looked up.
+    :param columns: (pandas.DataFrame): Rows returned by library_backend.generate_table_catalog_query.
+    """
+
+    def __init__(self, table_names: list, columns: __pd__.DataFrame):
+        self.table_names: list = list(table_names)
+        self.__tables__: dict = {}
+
+        columns = columns.copy()
+        # SQLite declares lengths as part of the type, e.g. VARCHAR2(20)
+        declared_length: __pd__.Series = columns["data_type"].astype(str).str.extract(r"\((\d+)")[0]
+        columns["data_length"] = columns["data_length"].fillna(__pd__.to_numeric(declared_length))
+        columns["data_type"] = columns["data_type"].astype(str).str.replace(r"\(.*\)", "", regex=True)
+
+        for (owner, table_name, in_current_schema), group in columns.groupby(
+            ["owner", "table_name", "in_current_schema"], dropna=False, sort=False
+        ):
+            table_columns: __pd__.DataFrame = group[
+                ["column_name", "data_type", "data_length", "nullable"]
+            ].reset_index(drop=True)
+            if not __pd__.isna(owner):
+                self.__tables__[(str(owner).upper(), str(table_name).upper())] = table_columns
+            if int(in_current_schema) == 1:
+                self.__tables__[(None, str(table_name).upper())] = table_columns
+
+    @staticmethod
+    def __key__(table_name: str) -> tuple:
+        parts: list = table_name.strip().upper().split(".")
+        return (parts[0], parts[-1]) if len(parts) > 1 else (None, parts[0])
+
+    def exists(self, table_name: str) -> bool:
+        """
+        Check existence of table in the snapshot.
+
+        :param table_name: (str): Name of table.
+        :return: (bool): Existence of table.
+        """
+        return self.__key__(table_name) in self.__tables__
+
+    def column_names(self, table_name: str) -> __Optional__[list]:
+        """
+        Get the column names of a table in the snapshot.
+
+        :param table_name: (str): Name of table.
+        :return: (Optional[list]): List of column names, None if table does not exist.
+        """
+        table_columns: __Optional__[__pd__.DataFrame] = self.__tables__.get(self.__key__(table_name))
+        return None if table_columns is None else list(table_columns["column_name"])
+
+    def columns(self, table_name: str) -> __Optional__[__pd__.DataFrame]:
+        """
+        Get the columns of a table in the snapshot with their data types, lengths and nullability.
+
+        :param table_name: (str): Name of table.
+        :return: (Optional[pandas.DataFrame]): column_name, data_type, data_length and nullable per column,
+            None if table does not exist.
+        """
+        table_columns: __Optional__[__pd__.DataFrame] = self.__tables__.get(self.__key__(table_name))
+        return None if table_columns is None else table_columns.copy()
+
+    def missing_tables(self) -> list:
+        """
+        Get the looked up tables that do not exist.
+
+        :return: (list): Names of tables that do not exist.
+        """
+        return [x for x in self.table_names if not self.exists(x)]
+
+
+def load_table_catalog(
+    table_names: list,
+    engine,
+    logger: __Logger__ = None,
+    prime_metadata_cache: bool = True,
+) -> TableCatalog:
+    """
+    Load the existence, column names, data types and lengths of many tables with one data dictionary query.
+
+    With prime_metadata_cache the results are also put in the engine's metadata cache (enabling it if
+    needed), so check_existence_of_table, get_db_table_column_names and create_table answer from it without
+    further round-trips. Only tables and views are found, tables reached through synonyms are reported as
+    not existing.
+
+    :param table_names: (list): Names of tables to look up.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :param prime_metadata_cache: (bool): Put the results in the engine's metadata cache.
+    :return: (TableCatalog): Snapshot of the tables.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    query, binds = bis_code_helpers.library_backend.generate_table_catalog_query(
+        table_names, engine.dialect.name
+    )
+
+    success_msg: str = "Loaded catalog of {n} tables.".format(n=len(table_names))
+    error_msg: str = "Failed to load catalog of {n} tables.".format(n=len(table_names))
+
+    result: __pd__.DataFrame = bis_code_helpers.execute_select_query_on_db(
+        query, success_msg, error_msg, engine, logger, binds, use_result_cache=False
+    )
+    result.columns = [x.lower() for x in result.columns]
+    if engine.dialect.requires_name_normalize:
+        result["column_name"] = result["column_name"].map(engine.dialect.normalize_name)
+
+    catalog: TableCatalog = TableCatalog(table_names, result)
+
+    if prime_metadata_cache:
+        cache: bis_code_helpers.TableMetadataCache = bis_code_helpers.get_metadata_cache(
+            engine
+        ) or bis_code_helpers.enable_metadata_cache(engine)
+        for table_name in table_names:
+            if catalog.exists(table_name):
+                cache.set_column_names(table_name, catalog.column_names(table_name))
+            else:
+                cache.set_existence(table_name, False)
+
+    missing_tables: list = catalog.missing_tables()
+    if len(missing_tables) > 0:
+        logger.debug("Tables that do not exist: {tables}".format(tables=missing_tables))
+
+    return catalog
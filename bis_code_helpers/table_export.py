@@ -0,0 +1,332 @@
+import os as __os__
+import queue as __queue__
+import re as __re__
+import threading as __threading__
+import pandas as __pd__
+from concurrent.futures import ThreadPoolExecutor as __ThreadPoolExecutor__
+from logging import Logger as __Logger__
+from typing import Optional as __Optional__
+
+import bis_code_helpers
+
+
+# ----------------------------------------------------
+# Stream a table or query to Parquet or CSV files
+# ----------------------------------------------------
+
+__export_formats__: dict = {"parquet": ".parquet", "csv": ".csv"}
+
+
+def export_to_files(
+    source: str,
+    output_dir: str,
+    engine,
+    file_format: str = "parquet",
+    chunk_size: int = 100000,
+    rows_per_file: __Optional__[int] = 1000000,
+    split_column: __Optional__[str] = None,
+    num_splits: int = 1,
+    binds: __Optional__[dict] = None,
+    queue_size: int = 2,
+    write_options: __Optional__[dict] = None,
+    logger: __Logger__ = None,
+) -> dict:
+    """
+    Export a table or the result of a select query to Parquet or CSV files without holding the whole result
+    in memory. Rows are fetched in chunks of chunk_size rows and handed to a writer thread through a queue of
+    at most queue_size chunks, so the next chunk is fetched while the previous one is encoded and written.
+
+    With a split_column and num_splits above 1, the rows are split into num_splits ranges of that column,
+    numeric or datetime, between its smallest and largest value, and each range is exported concurrently
+    on its own connection from the engine's pool. Rows without a value in split_column go with the first
+    range. Given a DatabaseSession, the ranges are exported one after another on its connection.
+
+    Files are named part-<range>-<file>.<format> in output_dir, a new file being started every
+    rows_per_file rows. Existing files of the same names are overwritten. A Parquet file takes the column
+    types of its first chunk. If a later chunk has types that cannot be converted to them, e.g. a column
+    that was all null in the first chunk, a new file is started. Parquet files need pyarrow.
+
+    :param source: (str): Name of table, or a select query.
+    :param output_dir: (str): Directory to write the files to, created if missing.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param file_format: (str): 'parquet' or 'csv'.
+    :param chunk_size: (int): Number of rows fetched and written at a time.
+    :param rows_per_file: (Optional[int]): Most rows per file, None for one file per range.
+    :param split_column: (Optional[str]): Column to split the rows into ranges by.
+    :param num_splits: (int): Number of ranges to export concurrently.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :param queue_size: (int): Most chunks fetched ahead of the writer, per range.
+    :param write_options: (Optional[dict]): Keyword arguments for pyarrow.parquet.ParquetWriter or DataFrame.to_csv.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (dict): Paths of the written files to their number of rows.
+    """
+
+    if logger is None:
+        logger = bis_code_helpers.library_backend.MockLogger()
+
+    if file_format not in __export_formats__:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Unknown file format '{file_format}', expected one of {formats}.".format(
+                file_format=file_format, formats=list(__export_formats__)
+            ),
+        )
+    if rows_per_file is not None and rows_per_file < 1:
+        raise bis_code_helpers.LoggedValueError(
+            logger, "rows_per_file must be at least 1, got {rows}.".format(rows=rows_per_file)
+        )
+    pa = bis_code_helpers.database_interaction.__import_pyarrow__(logger) if file_format == "parquet" else None
+
+    if __re__.match(r"^\s*(select|with)\b", source, __re__.IGNORECASE):
+        source_query: str = source
+    else:
+        source_query = "select * from {table_name}".format(table_name=source)
+
+    if split_column is not None and num_splits > 1:
+        ranges: list = __split_by_key_range__(source_query, split_column, num_splits, binds, engine, logger)
+    else:
+        ranges = [(source_query, binds)]
+
+    __os__.makedirs(output_dir, exist_ok=True)
+
+    def export_range(index: int) -> dict:
+        query, range_binds = ranges[index]
+        writer: __ExportFileWriter__ = __ExportFileWriter__(
+            output_dir, "part-{index:04d}".format(index=index), file_format, rows_per_file, write_options, pa
+        )
+        chunks = __prefetch_chunks__(query, range_binds, engine, chunk_size, queue_size, logger)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        finally:
+            chunks.close()
+            writer.close()
+        return writer.files
+
+    # A session has a single connection to export on
+    max_workers: int = 1 if isinstance(engine, bis_code_helpers.DatabaseSession) else len(ranges)
+    files: dict = {}
+    if max_workers <= 1:
+        for index in range(len(ranges)):
+            files.update(export_range(index))
+    else:
+        with __ThreadPoolExecutor__(max_workers=max_workers) as executor:
+            futures: list = [executor.submit(export_range, index) for index in range(len(ranges))]
+            for future in futures:
+                files.update(future.result())
+
+    logger.info(
+        "Exported {rows} rows to {n} {file_format} files in '{output_dir}'.".format(
+            rows=sum(files.values()), n=len(files), file_format=file_format, output_dir=output_dir
+        )
+    )
+    return files
+
+
+def __split_by_key_range__(
+    source_query: str, split_column: str, num_splits: int, binds: __Optional__[dict], engine, logger: __Logger__
+) -> list:
+    """
+    Split a query into queries for num_splits ranges of a numeric or datetime column, between its smallest
+    and largest value. Integer columns give fewer ranges if they have fewer distinct values than num_splits.
+
+    :param source_query: (str): Query to split.
+    :param split_column: (str): Column to split by.
+    :param num_splits: (int): Number of ranges.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (list): (query, binds) of each range.
+    """
+    bounds: __pd__.DataFrame = bis_code_helpers.execute_select_query_on_db(
+        bis_code_helpers.library_backend.generate_key_bounds_query(source_query, split_column),
+        "Retrieved bounds of '{column}'.".format(column=split_column),
+        "Failed to retrieve bounds of '{column}'.".format(column=split_column),
+        engine,
+        logger,
+        binds,
+        use_result_cache=False,
+    )
+    lower, upper = bounds.iloc[0, 0], bounds.iloc[0, 1]
+    if __pd__.isna(lower) or __pd__.isna(upper):
+        # No row has a key, so there is nothing to split
+        return [(source_query, binds)]
+
+    if isinstance(lower, str) or isinstance(upper, str):
+        # SQLite returns datetimes as text
+        try:
+            lower, upper = __pd__.Timestamp(lower), __pd__.Timestamp(upper)
+        except (ValueError, TypeError):
+            pass
+    if isinstance(lower, __pd__.Timestamp) or isinstance(upper, __pd__.Timestamp):
+        lower, upper = __pd__.Timestamp(lower), __pd__.Timestamp(upper)
+        boundaries: list = [(lower + (upper - lower) * i / num_splits).to_pydatetime() for i in range(num_splits + 1)]
+    elif __pd__.api.types.is_integer(lower) and __pd__.api.types.is_integer(upper):
+        lower, upper = int(lower), int(upper)
+        boundaries = sorted({lower + (upper - lower) * i // num_splits for i in range(num_splits + 1)})
+    elif __pd__.api.types.is_number(lower) and __pd__.api.types.is_number(upper):
+        lower, upper = float(lower), float(upper)
+        boundaries = [lower + (upper - lower) * i / num_splits for i in range(num_splits + 1)]
+    else:
+        raise bis_code_helpers.LoggedValueError(
+            logger,
+            "Cannot split on '{column}', its values are neither numbers nor datetimes.".format(column=split_column),
+        )
+    if len(boundaries) < 2:
+        boundaries = [lower, upper]
+    # Interpolation can round the end boundaries inwards, which would drop the rows holding the smallest or
+    # largest key
+    boundaries[0] = lower.to_pydatetime() if isinstance(lower, __pd__.Timestamp) else lower
+    boundaries[-1] = upper.to_pydatetime() if isinstance(upper, __pd__.Timestamp) else upper
+
+    ranges: list = []
+    for i in range(len(boundaries) - 1):
+        query: str = bis_code_helpers.library_backend.generate_key_range_query(
+            source_query, split_column, include_upper=i == len(boundaries) - 2, include_nulls=i == 0
+        )
+        ranges.append((query, {**(binds or {}), "lower_key": boundaries[i], "upper_key": boundaries[i + 1]}))
+    logger.debug(
+        "Split export on '{column}' into {n} ranges from {lower} to {upper}.".format(
+            column=split_column, n=len(ranges), lower=lower, upper=upper
+        )
+    )
+    return ranges
+
+
+def __prefetch_chunks__(
+    query: str, binds: __Optional__[dict], engine, chunk_size: int, queue_size: int, logger: __Logger__
+):
+    """
+    Yield the chunks of a query while a producer thread fetches the following chunks into a bounded queue.
+    Closing the generator early stops the producer and releases its connection.
+
+    :param query: (str): Query to be executed.
+    :param binds: (Optional[dict]): Bind values for the query.
+    :param engine: (sqlalchemy.engine): DB engine used for DB connection.
+    :param chunk_size: (int): Number of rows per chunk.
+    :param queue_size: (int): Most chunks fetched ahead.
+    :param logger: (logging.Logger): Logger to use for logging.
+    :return: (Iterator[pandas.DataFrame]): Chunks of the result.
+    """
+    chunks: __queue__.Queue = __queue__.Queue(maxsize=max(1, queue_size))
+    stop: __threading__.Event = __threading__.Event()
+    end_of_chunks: object = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except __queue__.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        results = bis_code_helpers.execute_select_query_on_db_in_chunks(
+            query,
+            "Fetched all rows of export query.",
+            "Failed to fetch rows of export query.",
+            engine,
+            logger,
+            chunk_size=chunk_size,
+            binds=binds,
+        )
+        try:
+            for chunk in results:
+                if not put(chunk):
+                    return
+            put(end_of_chunks)
+        except Exception as e:
+            put(e)
+        finally:
+            results.close()
+
+    producer: __threading__.Thread = __threading__.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is end_of_chunks:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+class __ExportFileWriter__:
+    """
+    Writes the chunks of one range to numbered files, starting a new file every rows_per_file rows.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        prefix: str,
+        file_format: str,
+        rows_per_file: __Optional__[int],
+        write_options: __Optional__[dict],
+        pa,
+    ):
+        self.output_dir: str = output_dir
+        self.prefix: str = prefix
+        self.file_format: str = file_format
+        self.rows_per_file: __Optional__[int] = rows_per_file
+        self.write_options: dict = write_options or {}
+        self.pa = pa
+        self.files: dict = {}
+        self.path: __Optional__[str] = None
+        self.handle = None
+
+    def open(self, chunk: __pd__.DataFrame, table=None) -> None:
+        self.path = __os__.path.join(
+            self.output_dir,
+            "{prefix}-{index:05d}{extension}".format(
+                prefix=self.prefix, index=len(self.files), extension=__export_formats__[self.file_format]
+            ),
+        )
+        self.files[self.path] = 0
+        if self.file_format == "parquet":
+            import pyarrow.parquet as __pq__
+
+            self.handle = __pq__.ParquetWriter(self.path, table.schema, **self.write_options)
+        else:
+            self.handle = open(self.path, "w", newline="")
+            chunk.iloc[:0].to_csv(self.handle, index=False, **self.write_options)
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def write(self, chunk: __pd__.DataFrame) -> None:
+        start: int = 0
+        while start < len(chunk.index) or (self.handle is None and len(self.files) == 0):
+            if self.rows_per_file is None:
+                end: int = len(chunk.index)
+            else:
+                free: int = self.rows_per_file - (self.files[self.path] if self.handle is not None else 0)
+                end = min(len(chunk.index), start + free)
+            self.write_to_file(chunk.iloc[start:end])
+            start = end
+            if self.rows_per_file is not None and self.files[self.path] >= self.rows_per_file:
+                self.close()
+
+    def write_to_file(self, chunk: __pd__.DataFrame) -> None:
+        if self.file_format == "parquet":
+            table = self.pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.handle is not None and not table.schema.equals(self.handle.schema, check_metadata=False):
+                try:
+                    table = table.cast(self.handle.schema)
+                except (self.pa.ArrowInvalid, self.pa.ArrowNotImplementedError, ValueError, TypeError):
+                    self.close()
+            if self.handle is None:
+                self.open(chunk, table)
+            self.handle.write_table(table)
+        else:
+            if self.handle is None:
+                self.open(chunk)
+            chunk.to_csv(self.handle, index=False, header=False, **self.write_options)
+        self.files[self.path] += len(chunk.index)
@@ -28,6 +28,8 @@ REQUIRED = [
 # What packages are optional?
 EXTRAS = {
     # 'fancy feature': ['django'],
+    'arrow': ['pyarrow>=14'],
+    'async': ['sqlalchemy[asyncio]'],
 }
 
 # The rest you shouldn't have to touch too much :)
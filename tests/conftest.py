@@ -0,0 +1,16 @@
+import pytest
+import sqlalchemy
+
+import bis_code_helpers
+
+bis_code_helpers.set_mock_logging_level(bis_code_helpers.LoggingLevels.WARNING)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    SQLite engine standing in for Oracle, on a file so that every pooled connection sees the same database.
+    """
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "test.db"))
+    yield engine
+    engine.dispose()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Stand-in for Oracle's sqlldr, used by test_sql_loader.py to exercise load_data_via_sql_loader without an
+Oracle client.
+
+It is called as sqlldr is, with a single parfile=... argument, reads the control file named there and
+loads the data file into the SQLite database named by the FAKE_SQLLDR_DB environment variable. DATE fields
+are checked against the mask of the control file, and records holding the field value REJECT are written
+to the bad file instead. It writes a log in SQL*Loader's format and exits as sqlldr does: 0 if every
+record was loaded, 2 if any was rejected, 1 on a broken control or parameter file.
+"""
+import csv
+import datetime
+import os
+import re
+import sqlite3
+import sys
+
+
+def read_parameters(argv: list) -> dict:
+    if len(argv) != 2 or not argv[1].startswith("parfile="):
+        raise SystemExit(1)
+    with open(argv[1].split("=", 1)[1]) as f:
+        return dict(line.rstrip("\n").split("=", 1) for line in f if "=" in line)
+
+
+def read_control_file(path: str) -> dict:
+    with open(path) as f:
+        control = f.read()
+    fields = re.findall(r"^\s+(\S+) (CHAR\(\d+\)|DATE \"[^\"]+\"|INTEGER EXTERNAL|FLOAT EXTERNAL),?$", control, re.M)
+    return {
+        "table": re.search(r"^INTO TABLE (\S+)$", control, re.M).group(1),
+        "data_file": re.search(r"^INFILE '([^']+)'$", control, re.M).group(1),
+        "fields": fields,
+    }
+
+
+def convert(value: str, field_type: str):
+    if value == "":
+        return None
+    if field_type == 'DATE "YYYY-MM-DD HH24:MI:SS"':
+        return datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S").isoformat(sep=" ")
+    if field_type == "INTEGER EXTERNAL":
+        return int(value)
+    if field_type == "FLOAT EXTERNAL":
+        return float(value)
+    return value
+
+
+def main() -> int:
+    parameters = read_parameters(sys.argv)
+    try:
+        control = read_control_file(parameters["control"])
+    except (OSError, AttributeError, KeyError):
+        return 1
+
+    names = [name for name, _ in control["fields"]]
+    insert = "INSERT INTO {table} ({columns}) VALUES ({values})".format(
+        table=control["table"], columns=", ".join(names), values=", ".join("?" * len(names))
+    )
+    read = loaded = rejected = 0
+    connection = sqlite3.connect(os.environ["FAKE_SQLLDR_DB"])
+    with open(control["data_file"], newline="", encoding="utf-8") as data, open(parameters["bad"], "w") as bad:
+        for record in csv.reader(data):
+            read += 1
+            record = record + [""] * (len(names) - len(record))
+            try:
+                if "REJECT" in record:
+                    raise ValueError("rejected record")
+                values = [convert(x, field_type) for x, (_, field_type) in zip(record, control["fields"])]
+            except ValueError:
+                rejected += 1
+                bad.write(",".join(record) + "\n")
+                continue
+            connection.execute(insert, values)
+            loaded += 1
+    connection.commit()
+    connection.close()
+
+    with open(parameters["log"], "w") as log:
+        log.write(
+            "SQL*Loader: Release 19.0.0.0.0 - Production\n\n"
+            "Table {table}:\n"
+            "  {loaded} Rows successfully loaded.\n"
+            "  {rejected} Rows not loaded due to data errors.\n"
+            "  0 Rows not loaded because all WHEN clauses were failed.\n"
+            "  0 Rows not loaded because all fields were null.\n\n"
+            "Total logical records skipped:          0\n"
+            "Total logical records read:        {read:>7}\n"
+            "Total logical records rejected:    {rejected:>7}\n"
+            "Total logical records discarded:        0\n".format(
+                table=control["table"], loaded=loaded, rejected=rejected, read=read
+            )
+        )
+    print("Path used:      Direct\n\nLoad completed - logical record count {read}.".format(read=read))
+    return 2 if rejected > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+import pandas as pd
+
+import bis_code_helpers
+
+
+def create_table_for(data: pd.DataFrame, table_name: str, engine) -> None:
+    """
+    Create a table with the columns generate_table_creation_query infers from data.
+    """
+    bis_code_helpers.execute_action_query_on_db(
+        bis_code_helpers.library_backend.generate_table_creation_query(data, table_name),
+        "Created test table.",
+        "Failed to create test table.",
+        engine,
+    )
+
+
+def read_table(table_name: str, engine, order_by: str = "ID") -> pd.DataFrame:
+    return pd.read_sql("select * from {t} order by {o}".format(t=table_name, o=order_by), engine)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bis_code_helpers
+from helpers import create_table_for
+
+pa = pytest.importorskip("pyarrow")
+
+
+def load_data(engine, rows: int = 25) -> pd.DataFrame:
+    data = pd.DataFrame(
+        {
+            "ID": np.arange(rows, dtype="int64"),
+            "AMOUNT": [None if i % 7 == 3 else i * 1.5 for i in range(rows)],
+            "LABEL": [None if i % 5 == 0 else "label {i}".format(i=i) for i in range(rows)],
+        }
+    )
+    create_table_for(data, "ARROW_TEST", engine)
+    bis_code_helpers.upload_data_to_table(data, 10, "ARROW_TEST", engine, use_bind_variables=True)
+    return data
+
+
+def select(engine, result_mode: str, **kwargs):
+    return bis_code_helpers.execute_select_query_on_db(
+        "select ID, AMOUNT, LABEL from ARROW_TEST order by ID", "", "", engine, result_mode=result_mode, **kwargs
+    )
+
+
+def test_arrow_result_matches_pandas_result(engine):
+    load_data(engine)
+    expected = select(engine, "pandas")
+
+    table = select(engine, "arrow", arrow_batch_size=4)
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["ID", "AMOUNT", "LABEL"]
+    assert table.column("ID").to_pylist() == expected["ID"].tolist()
+    assert table.column("AMOUNT").to_pylist() == [None if pd.isna(x) else x for x in expected["AMOUNT"]]
+    assert table.column("LABEL").to_pylist() == [None if pd.isna(x) else x for x in expected["LABEL"]]
+
+
+def test_arrow_batches_of_only_nulls_are_promoted(engine):
+    load_data(engine)
+
+    # The first batch of labels is all null, the later ones are strings
+    table = bis_code_helpers.execute_select_query_on_db(
+        "select LABEL from ARROW_TEST where ID in (0, 5, 11, 12) order by ID", "", "", engine,
+        result_mode="arrow", arrow_batch_size=2,
+    )
+
+    assert table.column("LABEL").type == pa.string()
+    assert table.column("LABEL").to_pylist() == [None, None, "label 11", "label 12"]
+
+
+def test_arrow_pandas_result_is_arrow_backed(engine):
+    load_data(engine)
+    expected = select(engine, "pandas")
+
+    df = select(engine, "arrow_pandas")
+
+    assert all(isinstance(x, pd.ArrowDtype) for x in df.dtypes)
+    assert df["ID"].tolist() == expected["ID"].tolist()
+    assert df["LABEL"].isna().tolist() == expected["LABEL"].isna().tolist()
+
+
+def test_arrow_result_of_an_empty_select(engine):
+    load_data(engine)
+
+    table = bis_code_helpers.execute_select_query_on_db(
+        "select ID, LABEL from ARROW_TEST where ID < 0", "", "", engine, result_mode="arrow"
+    )
+
+    assert table.num_rows == 0
+    assert table.column_names == ["ID", "LABEL"]
+
+
+def test_unknown_result_mode_is_rejected(engine):
+    with pytest.raises(bis_code_helpers.LoggedValueError):
+        select(engine, "polars")
@@ -0,0 +1,103 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bis_code_helpers
+from helpers import create_table_for
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+
+def make_data(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ID": np.arange(rows, dtype="int64"),
+            "AMOUNT": [None if i % 4 == 1 else i / 4 for i in range(rows)],
+            "NAME": [None if i % 5 == 2 else "it's, row {i}".format(i=i) for i in range(rows)],
+        }
+    )
+
+
+def run_async(engine, test) -> None:
+    """
+    Run a test coroutine on an aiosqlite engine for the same database file as the sync engine.
+    """
+
+    async def run() -> None:
+        async_engine = create_async_engine(str(engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1))
+        try:
+            await test(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_async_upload_and_select_round_trip(engine, max_concurrency):
+    data = make_data(50)
+    create_table_for(data, "ASYNC_TEST", engine)
+
+    async def test(async_engine) -> None:
+        await bis_code_helpers.async_upload_data_to_table(
+            data, 7, "ASYNC_TEST", async_engine, use_bind_variables=True, max_concurrency=max_concurrency
+        )
+        loaded = await bis_code_helpers.async_execute_select_query_on_db(
+            "select * from ASYNC_TEST order by ID", "", "", async_engine
+        )
+
+        assert loaded["ID"].tolist() == data["ID"].tolist()
+        assert loaded["AMOUNT"].fillna(-1).tolist() == data["AMOUNT"].fillna(-1).tolist()
+        assert loaded["NAME"].fillna("<null>").tolist() == data["NAME"].fillna("<null>").tolist()
+
+    run_async(engine, test)
+
+
+def test_async_select_with_binds(engine):
+    data = make_data(10)
+    create_table_for(data, "ASYNC_TEST", engine)
+    bis_code_helpers.upload_data_to_table(data, 10, "ASYNC_TEST", engine, use_bind_variables=True)
+
+    async def test(async_engine) -> None:
+        loaded = await bis_code_helpers.async_execute_select_query_on_db(
+            "select ID from ASYNC_TEST where ID >= :low order by ID", "", "", async_engine, binds={"low": 7}
+        )
+
+        assert loaded["ID"].tolist() == [7, 8, 9]
+
+    run_async(engine, test)
+
+
+def test_async_metadata_helpers_run_concurrently(engine):
+    for table_name in ["ASYNC_A", "ASYNC_B"]:
+        data = make_data(3 if table_name == "ASYNC_A" else 5)
+        create_table_for(data, table_name, engine)
+        bis_code_helpers.upload_data_to_table(data, 10, table_name, engine, use_bind_variables=True)
+
+    async def test(async_engine) -> None:
+        counts = await asyncio.gather(
+            bis_code_helpers.async_get_db_table_row_count("ASYNC_A", async_engine),
+            bis_code_helpers.async_get_db_table_row_count("ASYNC_B", async_engine),
+            bis_code_helpers.async_get_db_table_row_count("ASYNC_MISSING", async_engine),
+        )
+
+        assert counts == [3, 5, None]
+        assert await bis_code_helpers.async_check_existence_of_table("ASYNC_A", async_engine)
+        assert not await bis_code_helpers.async_check_existence_of_table("ASYNC_MISSING", async_engine)
+        column_names = await bis_code_helpers.async_get_db_table_column_names("ASYNC_B", async_engine)
+        assert column_names == ["ID", "AMOUNT", "NAME"]
+
+    run_async(engine, test)
+
+
+def test_async_upload_reports_failed_row_ranges(engine):
+    async def test(async_engine) -> None:
+        with pytest.raises(bis_code_helpers.LoggedDatabaseError, match="rows: 0 - 4, 5 - 7"):
+            await bis_code_helpers.async_upload_data_to_table(
+                make_data(7), 5, "ASYNC_MISSING", async_engine, use_bind_variables=True
+            )
+
+    run_async(engine, test)
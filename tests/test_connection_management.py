@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+
+import bis_code_helpers
+from bis_code_helpers import connection_management
+
+
+class RecordingLogger(bis_code_helpers.MockLogger):
+    def __init__(self):
+        super().__init__()
+        self.warnings: list = []
+
+    def warning(self, message: str):
+        self.warnings.append(message)
+
+
+@pytest.fixture
+def sqlite_engines(tmp_path, monkeypatch):
+    """
+    Make create_engine build SQLite engines, with the pool arguments it is given, instead of Oracle ones.
+    """
+    create_engine = sqlalchemy.create_engine
+    monkeypatch.setattr(connection_management, "__init_oracle_client__", lambda: None)
+    monkeypatch.setattr(
+        connection_management.__sq__,
+        "create_engine",
+        lambda conn_string, **kwargs: create_engine("sqlite:///" + str(tmp_path / "test.db"), **kwargs),
+    )
+    yield
+    bis_code_helpers.dispose_all_engines()
+
+
+def test_reused_engine_warns_about_ignored_pool_arguments(sqlite_engines):
+    logger = RecordingLogger()
+    engine = bis_code_helpers.create_engine("user", "secret", "db", logger, pool_size=5)
+
+    same = bis_code_helpers.create_engine("user", "secret", "db", logger, pool_size=5)
+    assert same is engine
+    assert logger.warnings == []
+
+    other = bis_code_helpers.create_engine("user", "secret", "db", logger, pool_size=20, pool_timeout=5)
+    assert other is engine
+    assert engine.pool.size() == 5
+    assert len(logger.warnings) == 1
+    assert "pool_size=20 (registered: 5)" in logger.warnings[0]
+    assert "pool_timeout=5 (registered: 30)" in logger.warnings[0]
+
+
+def test_disposed_engine_is_created_again_with_new_pool_arguments(sqlite_engines):
+    engine = bis_code_helpers.create_engine("user", "secret", "db", pool_size=5)
+    bis_code_helpers.dispose_engine(engine)
+
+    engine = bis_code_helpers.create_engine("user", "secret", "db", pool_size=20)
+
+    assert engine.pool.size() == 20
+
+
+def test_async_engine_is_disposed_when_it_cannot_connect(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    created: list = []
+    original_create_async_engine = sqlalchemy.ext.asyncio.create_async_engine
+
+    def create_async_engine(conn_string, **kwargs):
+        engine = original_create_async_engine("sqlite+aiosqlite://")
+        created.append(engine)
+        return engine
+
+    class FailingConnectionManager:
+        def __init__(self, engine):
+            pass
+
+        async def __aenter__(self):
+            raise ConnectionError("DB unreachable")
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+    disposed: list = []
+    dispose = sqlalchemy.ext.asyncio.AsyncEngine.dispose
+
+    async def recording_dispose(self, *args, **kwargs):
+        disposed.append(self)
+        await dispose(self, *args, **kwargs)
+
+    monkeypatch.setattr(connection_management.__sq_asyncio__, "create_async_engine", create_async_engine)
+    monkeypatch.setattr(connection_management, "AsyncConnectionManager", FailingConnectionManager)
+    monkeypatch.setattr(sqlalchemy.ext.asyncio.AsyncEngine, "dispose", recording_dispose)
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError, match="DB unreachable"):
+        asyncio.run(bis_code_helpers.create_async_engine("user", "secret", "db"))
+
+    assert len(created) == 1
+    assert disposed == created
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["pandas", "numpy", "sqlalchemy", "oracledb"]
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, check=True, text=True).stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import bis_code_helpers",
+        "import bis_code_helpers.run_external_command",
+        "from bis_code_helpers import run_external_command",
+    ],
+)
+def test_run_external_command_is_the_function_without_heavy_imports(code):
+    output = run_python(
+        code + "\nimport sys, types, bis_code_helpers\n"
+        "print(type(bis_code_helpers.run_external_command) is types.FunctionType, "
+        "[m for m in {heavy} if m in sys.modules])".format(heavy=HEAVY_MODULES)
+    )
+
+    assert output == "True []"
+
+
+def test_names_are_imported_on_first_use():
+    output = run_python(
+        "import sys, bis_code_helpers\n"
+        "before = 'bis_code_helpers.result_cache' in sys.modules\n"
+        "bis_code_helpers.ResultCache\n"
+        "print(before, 'bis_code_helpers.result_cache' in sys.modules)"
+    )
+
+    assert output == "False True"
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bis_code_helpers
+from helpers import create_table_for
+
+
+@pytest.fixture
+def metrics():
+    """
+    Metrics of every database call made while the test runs.
+    """
+    recorded = []
+    sink = bis_code_helpers.add_instrumentation_sink(recorded.append)
+    yield recorded
+    bis_code_helpers.remove_instrumentation_sink(sink)
+
+
+def operations(metrics: list) -> list:
+    result = [(x.operation, sorted(x.phases), x.error is not None) for x in metrics]
+    metrics.clear()
+    return result
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame({"ID": np.arange(10, dtype="int64"), "NAME": list("abcdefghij")})
+
+
+def test_existence_checks_are_timed(engine, metrics):
+    create_table_for(make_data(), "METRICS_TEST", engine)
+    metrics.clear()
+
+    assert bis_code_helpers.check_existence_of_table("METRICS_TEST", engine)
+    assert not bis_code_helpers.check_existence_of_table("METRICS_MISSING", engine)
+
+    # A missing table is an answer, not an error
+    assert operations(metrics) == [
+        ("check_existence_of_table", ["checkout", "execute", "fetch"], False),
+        ("check_existence_of_table", ["checkout", "execute"], False),
+    ]
+
+
+def test_all_or_nothing_upload_times_every_partition_and_the_commit(engine, metrics):
+    create_table_for(make_data(), "METRICS_TEST", engine)
+    metrics.clear()
+
+    bis_code_helpers.upload_data_to_table(
+        make_data(), 3, "METRICS_TEST", engine, use_bind_variables=True, commit_policy="all_or_nothing"
+    )
+
+    assert operations(metrics) == [("upload_data_to_table", ["execute"], False)] * 4 + [
+        ("upload_data_to_table", ["commit"], False)
+    ]
+
+
+def test_update_column_by_values_is_timed(engine, metrics):
+    data = make_data()
+    create_table_for(data, "METRICS_TEST", engine)
+    bis_code_helpers.upload_data_to_table(data, 10, "METRICS_TEST", engine, use_bind_variables=True)
+    metrics.clear()
+
+    bis_code_helpers.update_column_by_values({"a": "z", "b": "y"}, "METRICS_TEST", "NAME", engine)
+
+    assert operations(metrics) == [
+        ("update_column_by_values", ["execute", "fetch"], False),
+        ("update_column_by_values", ["execute"], False),
+        ("update_column_by_values", ["commit"], False),
+    ]
+
+
+def test_no_commit_is_timed_inside_a_session_transaction(engine, metrics):
+    data = make_data()
+    create_table_for(data, "METRICS_TEST", engine)
+    bis_code_helpers.upload_data_to_table(data, 10, "METRICS_TEST", engine, use_bind_variables=True)
+    metrics.clear()
+
+    with bis_code_helpers.DatabaseSession(engine) as session:
+        bis_code_helpers.update_column_by_values({"c": "x"}, "METRICS_TEST", "NAME", session)
+
+    assert ("update_column_by_values", ["commit"], False) not in operations(metrics)
+
+
+def test_pooled_checkouts_are_told_apart_from_new_connections(engine, metrics):
+    for _ in range(3):
+        bis_code_helpers.execute_select_query_on_db("select 1 as X", "", "", engine)
+
+    assert [x.new_connection for x in metrics] == [True, False, False]
+    assert metrics[0].pooled_checkout_seconds == 0
+    assert all(x.pooled_checkout_seconds == x.phases["checkout"] for x in metrics[1:])
+
+
+def test_metrics_recorder_keeps_histograms_by_operation(engine):
+    recorder = bis_code_helpers.add_instrumentation_sink(bis_code_helpers.MetricsRecorder())
+    try:
+        for _ in range(3):
+            bis_code_helpers.execute_select_query_on_db("select 1 as X", "", "", engine)
+    finally:
+        bis_code_helpers.remove_instrumentation_sink(recorder)
+
+    snapshot = recorder.snapshot()
+    for measure in ["total_seconds", "checkout_seconds", "fetch_seconds", "pooled_checkout_seconds", "rows"]:
+        assert snapshot["execute_select_query_on_db." + measure]["count"] == 3
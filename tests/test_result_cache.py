@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bis_code_helpers
+from helpers import create_table_for
+
+QUERY = "select ID, LABEL from CACHE_TEST order by ID"
+
+
+def result(rows: int = 3) -> pd.DataFrame:
+    return pd.DataFrame({"ID": np.arange(rows, dtype="int64"), "LABEL": ["row {i}".format(i=i) for i in range(rows)]})
+
+
+def test_put_is_dropped_when_a_read_table_was_invalidated_since_the_generation():
+    cache = bis_code_helpers.ResultCache()
+    key = cache.key(QUERY)
+    generation = cache.generation(QUERY)
+
+    cache.invalidate("schema.cache_test")
+    cache.put(key, QUERY, result(), generation)
+
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_put_is_dropped_when_all_tables_were_invalidated_since_the_generation():
+    cache = bis_code_helpers.ResultCache()
+    key = cache.key(QUERY)
+    generation = cache.generation(QUERY)
+
+    cache.invalidate()
+    cache.put(key, QUERY, result(), generation)
+
+    assert cache.get(key) is None
+
+
+def test_put_is_kept_when_only_other_tables_were_invalidated():
+    cache = bis_code_helpers.ResultCache()
+    key = cache.key(QUERY)
+    generation = cache.generation(QUERY)
+
+    cache.invalidate("OTHER_TABLE")
+    cache.put(key, QUERY, result(), generation)
+
+    pd.testing.assert_frame_equal(cache.get(key), result())
+
+
+def test_disk_put_is_dropped_when_a_read_table_was_invalidated_since_the_generation(tmp_path):
+    pytest.importorskip("pyarrow")
+    cache = bis_code_helpers.ResultCache(disk_path=str(tmp_path))
+    key = cache.key(QUERY)
+    generation = cache.generation(QUERY)
+
+    cache.invalidate("CACHE_TEST")
+    cache.put(key, QUERY, result(), generation)
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_disk_metadata_is_written_without_leaving_temporary_files(tmp_path):
+    pytest.importorskip("pyarrow")
+    cache = bis_code_helpers.ResultCache(disk_path=str(tmp_path))
+    key = cache.key(QUERY)
+
+    cache.put(key, QUERY, result())
+
+    assert not any(x.endswith(".tmp") for x in os.listdir(str(tmp_path)))
+    # A new cache on the same directory reads the entry back from disk
+    pd.testing.assert_frame_equal(bis_code_helpers.ResultCache(disk_path=str(tmp_path)).get(key), result())
+
+
+def test_select_racing_an_upload_does_not_cache_the_stale_result(engine, monkeypatch):
+    create_table_for(result(), "CACHE_TEST", engine)
+    bis_code_helpers.upload_data_to_table(result(), 10, "CACHE_TEST", engine, use_bind_variables=True)
+    bis_code_helpers.enable_result_cache(engine)
+    try:
+        read_sql = pd.read_sql
+
+        def read_sql_then_upload(*args, **kwargs):
+            # The upload lands after the select read the table, but before its result is cached
+            df = read_sql(*args, **kwargs)
+            monkeypatch.setattr(pd, "read_sql", read_sql)
+            bis_code_helpers.upload_data_to_table(
+                result(4)[3:], 10, "CACHE_TEST", engine, use_bind_variables=True
+            )
+            return df
+
+        monkeypatch.setattr(pd, "read_sql", read_sql_then_upload)
+        stale = bis_code_helpers.execute_select_query_on_db(QUERY, "", "", engine)
+        fresh = bis_code_helpers.execute_select_query_on_db(QUERY, "", "", engine)
+    finally:
+        bis_code_helpers.disable_result_cache(engine)
+
+    assert len(stale) == 3
+    assert len(fresh) == 4
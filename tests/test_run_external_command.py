@@ -0,0 +1,54 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import bis_code_helpers
+
+# The package attribute of this name is the function
+run_external_command_module = importlib.import_module("bis_code_helpers.run_external_command")
+
+
+def print_lines(lines: int, width: int) -> list:
+    code = "for i in range({lines}): print(str(i).rjust({width}, 'x'))".format(lines=lines, width=width)
+    return [sys.executable, "-c", code]
+
+
+def test_streamed_output_keeps_the_last_tail_lines():
+    lines: list = []
+
+    output = bis_code_helpers.run_external_command(print_lines(50, 5), output_callback=lines.append, tail_lines=10)
+
+    assert len(lines) == 50
+    assert output.splitlines() == [str(i).rjust(5, "x") for i in range(40, 50)]
+
+
+def test_streamed_output_tail_is_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(run_external_command_module, "__max_tail_bytes__", 1000)
+    lines: list = []
+
+    # 100 lines of 100 bytes each, with their line breaks, of which 1000 bytes fit the tail
+    output = bis_code_helpers.run_external_command(print_lines(100, 99), output_callback=lines.append)
+
+    assert len(lines) == 100
+    assert output.splitlines() == [str(i).rjust(99, "x") for i in range(90, 100)]
+
+
+def test_streamed_output_without_a_tail():
+    lines: list = []
+
+    output = bis_code_helpers.run_external_command(print_lines(5, 3), output_callback=lines.append, tail_lines=0)
+
+    assert len(lines) == 5
+    assert output == ""
+
+
+def test_failing_command_reports_the_tail():
+    command = [sys.executable, "-c", "print('last words'); raise SystemExit(3)"]
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        bis_code_helpers.run_external_command(command, stream_output=True, output_callback=lambda line: None)
+
+    assert error.value.returncode == 3
+    assert "last words" in error.value.output
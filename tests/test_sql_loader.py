@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bis_code_helpers
+
+FAKE_SQLLDR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_sqlldr.py")
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="The fake SQL*Loader is run through its shebang line")
+
+
+@pytest.fixture
+def sql_loader_options(engine, monkeypatch) -> dict:
+    """
+    Arguments running load_data_via_sql_loader against the fake SQL*Loader, which loads into the engine's database.
+    """
+    monkeypatch.setenv("FAKE_SQLLDR_DB", engine.url.database)
+    return {"sql_loader_path": FAKE_SQLLDR, "userid": "scott/tiger@local"}
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ID": np.arange(5, dtype="int64"),
+            "NAME": ["plain", "with, comma", 'with "quotes"', None, "last"],
+            "FLAG": [True, False, True, True, False],
+            "AMOUNT": [1.5, np.nan, 3.0, 4.0, 5.25],
+            "CREATED": [
+                "to_date('2024-01-0{d} 10:11:12','YYYY-MM-DD HH24:MI:SS')".format(d=i + 1) for i in range(5)
+            ],
+        }
+    )
+
+
+def test_sql_loader_loads_chunks_and_parses_the_log(engine, sql_loader_options, tmp_path):
+    data = make_data()
+    work_dir = str(tmp_path / "work")
+
+    counts = bis_code_helpers.load_data_via_sql_loader(
+        [data.iloc[:2], data.iloc[2:]], "SQLLDR_TEST", engine, work_dir=work_dir, keep_files=True,
+        **sql_loader_options,
+    )
+
+    assert counts == {"read": 5, "loaded": 5, "rejected": 0, "discarded": 0, "skipped": 0}
+    loaded = pd.read_sql("select * from SQLLDR_TEST order by ID", engine)
+    assert loaded["NAME"].fillna("<null>").tolist() == ["plain", "with, comma", 'with "quotes"', "<null>", "last"]
+    assert loaded["FLAG"].tolist() == [1, 0, 1, 1, 0]
+    assert loaded["AMOUNT"].fillna(-1).tolist() == [1.5, -1, 3.0, 4.0, 5.25]
+    assert loaded["CREATED"].tolist() == ["2024-01-0{d} 10:11:12".format(d=i + 1) for i in range(5)]
+
+
+def test_sql_loader_control_file_follows_the_column_types(engine, sql_loader_options, tmp_path):
+    work_dir = str(tmp_path / "work")
+
+    bis_code_helpers.load_data_via_sql_loader(
+        make_data(), "SQLLDR_TEST", engine, work_dir=work_dir, keep_files=True, **sql_loader_options
+    )
+
+    with open(os.path.join(work_dir, "sqlldr_test.ctl")) as f:
+        control_file = f.read()
+    assert "APPEND\nINTO TABLE SQLLDR_TEST\n" in control_file
+    for field in [
+        "    ID INTEGER EXTERNAL,",
+        "    NAME CHAR(64),",
+        "    FLAG INTEGER EXTERNAL,",
+        "    AMOUNT FLOAT EXTERNAL,",
+        '    CREATED DATE "YYYY-MM-DD HH24:MI:SS"',
+    ]:
+        assert field in control_file.splitlines()
+    # The parameter file holds the password, so it never outlives the run
+    assert not os.path.exists(os.path.join(work_dir, "sqlldr_test.par"))
+
+
+def test_sql_loader_removes_its_files_after_a_successful_load(engine, sql_loader_options, tmp_path):
+    work_dir = str(tmp_path / "work")
+
+    bis_code_helpers.load_data_via_sql_loader(
+        make_data(), "SQLLDR_TEST", engine, work_dir=work_dir, **sql_loader_options
+    )
+
+    assert os.listdir(work_dir) == []
+
+
+def test_sql_loader_rejects_within_max_errors_are_counted(engine, sql_loader_options):
+    # The fake SQL*Loader rejects records holding REJECT
+    data = make_data().assign(NAME=["REJECT", "ok", "ok", "ok", "ok"])
+
+    counts = bis_code_helpers.load_data_via_sql_loader(data, "SQLLDR_TEST", engine, max_errors=1, **sql_loader_options)
+
+    assert (counts["read"], counts["loaded"], counts["rejected"]) == (5, 4, 1)
+
+
+def test_sql_loader_rejects_beyond_max_errors_raise(engine, sql_loader_options):
+    data = make_data().assign(NAME=["REJECT", "ok", "ok", "ok", "ok"])
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError, match="rejected 1 rows"):
+        bis_code_helpers.load_data_via_sql_loader(data, "SQLLDR_TEST", engine, **sql_loader_options)
+
+
+def test_sql_loader_refuses_line_breaks(engine, sql_loader_options):
+    with pytest.raises(bis_code_helpers.LoggedDataError):
+        bis_code_helpers.load_data_via_sql_loader(
+            pd.DataFrame({"TEXT": ["two\nlines"]}), "SQLLDR_TEST", engine, **sql_loader_options
+        )
+
+
+@pytest.fixture
+def temporary_dir(tmp_path, monkeypatch) -> str:
+    """
+    Directory the work directories of loads without a work_dir are created in.
+    """
+    path = tmp_path / "tmp"
+    path.mkdir()
+    monkeypatch.setattr("tempfile.tempdir", str(path))
+    return str(path)
+
+
+def test_sql_loader_removes_the_data_file_when_sql_loader_fails(engine, temporary_dir):
+    with pytest.raises(bis_code_helpers.LoggedSubprocessError):
+        bis_code_helpers.load_data_via_sql_loader(
+            make_data(), "SQLLDR_TEST", engine, sql_loader_path="false", userid="scott/tiger@local"
+        )
+
+    assert os.listdir(temporary_dir) == []
+
+
+def test_sql_loader_removes_the_data_file_when_writing_it_fails(engine, sql_loader_options, temporary_dir):
+    data = make_data().assign(NAME=["two\nlines", "ok", "ok", "ok", "ok"])
+
+    with pytest.raises(bis_code_helpers.LoggedDataError):
+        bis_code_helpers.load_data_via_sql_loader(data, "SQLLDR_TEST", engine, **sql_loader_options)
+
+    assert os.listdir(temporary_dir) == []
+
+
+def test_sql_loader_failure_removes_files_from_a_given_work_dir(engine, tmp_path):
+    work_dir = str(tmp_path / "work")
+
+    with pytest.raises(bis_code_helpers.LoggedSubprocessError):
+        bis_code_helpers.load_data_via_sql_loader(
+            make_data(), "SQLLDR_TEST", engine, sql_loader_path="false", userid="scott/tiger@local",
+            work_dir=work_dir, keep_files=True,
+        )
+
+    assert os.listdir(work_dir) == []
+
+
+def test_sql_loader_keeps_the_files_of_rejected_rows(engine, sql_loader_options, temporary_dir):
+    data = make_data().assign(NAME=["REJECT", "ok", "ok", "ok", "ok"])
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError):
+        bis_code_helpers.load_data_via_sql_loader(data, "SQLLDR_TEST", engine, **sql_loader_options)
+
+    (work_dir,) = os.listdir(temporary_dir)
+    assert sorted(os.listdir(os.path.join(temporary_dir, work_dir))) == [
+        "sqlldr_test.bad", "sqlldr_test.ctl", "sqlldr_test.dat", "sqlldr_test.log"
+    ]
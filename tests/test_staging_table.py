@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy
+
+import bis_code_helpers
+from helpers import create_table_for, read_table
+
+
+def make_data(rows: int, offset: int = 0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ID": np.arange(offset, offset + rows, dtype="int64"),
+            "NAME": ["name {i}".format(i=i) for i in range(offset, offset + rows)],
+        }
+    )
+
+
+def table_exists(table_name: str, engine) -> bool:
+    return sqlalchemy.inspect(engine).has_table(table_name)
+
+
+@pytest.mark.parametrize("publish_mode", ["append", "swap"])
+def test_staging_load_into_a_new_table(engine, publish_mode):
+    published = bis_code_helpers.load_data_via_staging_table(
+        make_data(25), "STAGING_TEST", engine, upload_partition_size=10, publish_mode=publish_mode
+    )
+
+    assert published == 25
+    assert read_table("STAGING_TEST", engine)["ID"].tolist() == list(range(25))
+    assert not table_exists("STAGING_TEST_STG", engine)
+
+
+def test_staging_append_adds_to_the_table(engine):
+    bis_code_helpers.load_data_via_staging_table(make_data(5), "STAGING_TEST", engine)
+
+    bis_code_helpers.load_data_via_staging_table(make_data(5, offset=5), "STAGING_TEST", engine)
+
+    assert read_table("STAGING_TEST", engine)["ID"].tolist() == list(range(10))
+
+
+def test_staging_swap_replaces_the_table(engine):
+    bis_code_helpers.load_data_via_staging_table(make_data(5), "STAGING_TEST", engine, publish_mode="swap")
+
+    bis_code_helpers.load_data_via_staging_table(
+        make_data(3, offset=100), "STAGING_TEST", engine, publish_mode="swap"
+    )
+
+    assert read_table("STAGING_TEST", engine)["ID"].tolist() == [100, 101, 102]
+    assert not table_exists("STAGING_TEST_OLD", engine)
+    assert not table_exists("STAGING_TEST_STG", engine)
+
+
+def test_staging_swap_recovers_from_leftover_tables(engine):
+    bis_code_helpers.load_data_via_staging_table(make_data(5), "STAGING_TEST", engine)
+    # Left behind by a load that was killed part way, with other columns and rows than the next load
+    leftover = pd.DataFrame({"OTHER": ["stale"]})
+    for table_name in ["STAGING_TEST_STG", "STAGING_TEST_OLD"]:
+        create_table_for(leftover, table_name, engine)
+        bis_code_helpers.upload_data_to_table(leftover, 10, table_name, engine, use_bind_variables=True)
+
+    published = bis_code_helpers.load_data_via_staging_table(
+        make_data(3, offset=100), "STAGING_TEST", engine, publish_mode="swap"
+    )
+
+    assert published == 3
+    assert read_table("STAGING_TEST", engine)["NAME"].tolist() == ["name 100", "name 101", "name 102"]
+    assert not table_exists("STAGING_TEST_OLD", engine)
+    assert not table_exists("STAGING_TEST_STG", engine)
+
+
+def test_staging_load_with_missing_rows_leaves_the_table_untouched(engine, monkeypatch):
+    bis_code_helpers.load_data_via_staging_table(make_data(5), "STAGING_TEST", engine)
+    upload_data_to_table = bis_code_helpers.database_interaction.upload_data_to_table
+
+    def upload_first_row(table_data, *args, **kwargs):
+        upload_data_to_table(table_data.iloc[:1], *args, **kwargs)
+
+    monkeypatch.setattr(bis_code_helpers.database_interaction, "upload_data_to_table", upload_first_row)
+
+    with pytest.raises(bis_code_helpers.LoggedDataError):
+        bis_code_helpers.load_data_via_staging_table(
+            make_data(3, offset=100), "STAGING_TEST", engine, publish_mode="swap"
+        )
+
+    assert read_table("STAGING_TEST", engine)["ID"].tolist() == list(range(5))
+    assert not table_exists("STAGING_TEST_STG", engine)
+
+
+def test_unknown_publish_mode_is_rejected(engine):
+    with pytest.raises(bis_code_helpers.LoggedValueError):
+        bis_code_helpers.load_data_via_staging_table(make_data(1), "STAGING_TEST", engine, publish_mode="merge")
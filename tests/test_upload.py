@@ -0,0 +1,150 @@
+import inspect
+
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy
+
+import bis_code_helpers
+from helpers import create_table_for, read_table
+
+
+def make_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ID": np.arange(5, dtype="int64"),
+            "AMOUNT": [1.5, np.nan, 3.0, -4.25, 0.0],
+            "NAME": ["plain", "it's, quoted", None, 'say "hi", twice', "last"],
+            "CREATED": pd.to_datetime(
+                ["2024-01-01 10:11:12", "2024-02-03 04:05:06", None, "2024-12-31 23:59:59", "2025-06-30 00:00:00"]
+            ),
+            "DUE": [
+                "to_date('2024-03-0{d} 01:02:03','YYYY-MM-DD HH24:MI:SS')".format(d=i + 1) for i in range(5)
+            ],
+        }
+    )
+
+
+def test_bind_variable_upload_round_trips_through_sqlite(engine):
+    data = make_data()
+    create_table_for(data, "UPLOAD_TEST", engine)
+
+    bis_code_helpers.upload_data_to_table(data, 2, "UPLOAD_TEST", engine, use_bind_variables=True)
+
+    loaded = read_table("UPLOAD_TEST", engine)
+    assert loaded["ID"].tolist() == [0, 1, 2, 3, 4]
+    assert loaded["AMOUNT"].fillna(-1).tolist() == [1.5, -1, 3.0, -4.25, 0.0]
+    assert loaded["NAME"].fillna("<null>").tolist() == ["plain", "it's, quoted", "<null>", 'say "hi", twice', "last"]
+    assert loaded["CREATED"].fillna("<null>").tolist() == [
+        "2024-01-01 10:11:12", "2024-02-03 04:05:06", "<null>", "2024-12-31 23:59:59", "2025-06-30 00:00:00"
+    ]
+    assert loaded["DUE"].tolist() == ["2024-03-0{d} 01:02:03".format(d=i + 1) for i in range(5)]
+
+
+def test_upload_defaults_to_literal_sql():
+    for function in [bis_code_helpers.upload_data_to_table, bis_code_helpers.async_upload_data_to_table]:
+        assert inspect.signature(function).parameters["use_bind_variables"].default is False
+
+
+def test_literal_upload_strips_quotes(engine, monkeypatch):
+    # SQLite cannot run INSERT ALL, so the statements are captured instead of executed
+    statements = []
+    monkeypatch.setattr(
+        bis_code_helpers,
+        "execute_action_query_on_db",
+        lambda query, success_msg, error_msg, engine, logger=None, binds=None: statements.append((query, binds)),
+    )
+
+    data = make_data()[["ID", "NAME", "DUE"]].astype({"NAME": object, "DUE": object})
+
+    bis_code_helpers.upload_data_to_table(data, 10, "UPLOAD_TEST", engine)
+
+    ((query, binds),) = statements
+    assert binds is None
+    assert query.strip().startswith("INSERT ALL")
+    assert "VALUES (1, 'its, quoted', to_date('2024-03-02 01:02:03','YYYY-MM-DD HH24:MI:SS'))" in query
+    assert "VALUES (3, 'say \"hi\", twice', " in query
+
+
+def test_bind_variable_upload_leaves_the_data_untouched(engine):
+    data = make_data()
+    create_table_for(data, "UPLOAD_TEST", engine)
+
+    bis_code_helpers.upload_data_to_table(data, 10, "UPLOAD_TEST", engine, use_bind_variables=True)
+
+    pd.testing.assert_frame_equal(data, make_data())
+
+
+def test_bind_variable_upload_with_concurrent_workers(engine):
+    data = pd.DataFrame({"ID": np.arange(1000, dtype="int64"), "NAME": ["row {i}".format(i=i) for i in range(1000)]})
+    create_table_for(data, "UPLOAD_TEST", engine)
+
+    bis_code_helpers.upload_data_to_table(data, 100, "UPLOAD_TEST", engine, use_bind_variables=True, max_workers=4)
+
+    loaded = read_table("UPLOAD_TEST", engine)
+    assert loaded["ID"].tolist() == list(range(1000))
+    assert loaded["NAME"].tolist() == data["NAME"].tolist()
+
+
+def create_not_null_table(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE TABLE UPLOAD_TEST (ID INT NOT NULL, NAME VARCHAR2(64) NOT NULL)"))
+
+
+def make_rows(rows: int, null_name_at: int = None) -> pd.DataFrame:
+    names = ["row {i}".format(i=i) for i in range(rows)]
+    if null_name_at is not None:
+        names[null_name_at] = None
+    return pd.DataFrame({"ID": np.arange(rows, dtype="int64"), "NAME": names})
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_all_or_nothing_upload_commits_every_partition(engine, max_workers):
+    create_not_null_table(engine)
+
+    bis_code_helpers.upload_data_to_table(
+        make_rows(100), 10, "UPLOAD_TEST", engine,
+        use_bind_variables=True, max_workers=max_workers, commit_policy="all_or_nothing",
+    )
+
+    assert read_table("UPLOAD_TEST", engine)["ID"].tolist() == list(range(100))
+    assert not sqlalchemy.inspect(engine).has_table("UPLOAD_TEST_STG")
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_all_or_nothing_upload_commits_nothing_when_a_partition_fails(engine, max_workers):
+    create_not_null_table(engine)
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError, match="nothing committed"):
+        bis_code_helpers.upload_data_to_table(
+            make_rows(100, null_name_at=95), 10, "UPLOAD_TEST", engine,
+            use_bind_variables=True, max_workers=max_workers, commit_policy="all_or_nothing",
+        )
+
+    assert len(read_table("UPLOAD_TEST", engine)) == 0
+    assert not sqlalchemy.inspect(engine).has_table("UPLOAD_TEST_STG")
+
+
+def test_best_effort_upload_commits_the_other_partitions(engine):
+    create_not_null_table(engine)
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError, match=r"other partitions committed\), rows: 90 - 100"):
+        bis_code_helpers.upload_data_to_table(
+            make_rows(100, null_name_at=95), 10, "UPLOAD_TEST", engine,
+            use_bind_variables=True, max_workers=4, commit_policy="best_effort",
+        )
+
+    assert read_table("UPLOAD_TEST", engine)["ID"].tolist() == list(range(90))
+
+
+def test_concurrent_all_or_nothing_upload_commits_nothing_when_staging_fails(engine):
+    create_not_null_table(engine)
+
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError, match="nothing committed"):
+        bis_code_helpers.upload_data_to_table(
+            make_rows(100).assign(EXTRA=1), 10, "UPLOAD_TEST", engine,
+            use_bind_variables=True, max_workers=4, commit_policy="all_or_nothing",
+        )
+
+    assert len(read_table("UPLOAD_TEST", engine)) == 0
+    assert not sqlalchemy.inspect(engine).has_table("UPLOAD_TEST_STG")
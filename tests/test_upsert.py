@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy
+
+import bis_code_helpers
+from helpers import create_table_for, read_table
+
+
+def create_keyed_table(engine) -> None:
+    data = pd.DataFrame(
+        {"ID": np.arange(4, dtype="int64"), "NAME": ["a", "b", "c", "d"], "AMOUNT": [1.0, 2.0, 3.0, 4.0]}
+    )
+    create_table_for(data, "UPSERT_TEST", engine)
+    # ON CONFLICT on the SQLite stand-in needs a unique index on the key columns
+    with engine.begin() as conn:
+        conn.execute(sqlalchemy.text("CREATE UNIQUE INDEX UPSERT_TEST_PK ON UPSERT_TEST (ID)"))
+    bis_code_helpers.upload_data_to_table(data, 10, "UPSERT_TEST", engine, use_bind_variables=True)
+
+
+def test_upsert_counts_inserted_and_updated_rows(engine):
+    create_keyed_table(engine)
+    changes = pd.DataFrame(
+        {
+            "ID": np.array([2, 3, 4, 5, 6], dtype="int64"),
+            "NAME": ["C", "D", "e", "f", "g"],
+            "AMOUNT": [30.0, None, 5.0, 6.0, 7.0],
+        }
+    )
+
+    # 2 rows updated and 3 inserted
+    assert bis_code_helpers.upsert_data_to_table(changes, "UPSERT_TEST", ["ID"], engine, upload_partition_size=2) == 5
+
+    loaded = read_table("UPSERT_TEST", engine)
+    assert loaded["ID"].tolist() == [0, 1, 2, 3, 4, 5, 6]
+    assert loaded["NAME"].tolist() == ["a", "b", "C", "D", "e", "f", "g"]
+    assert loaded["AMOUNT"].fillna(-1).tolist() == [1.0, 2.0, 30.0, -1, 5.0, 6.0, 7.0]
+    assert not sqlalchemy.inspect(engine).has_table("UPSERT_TEST_STG")
+
+
+def test_upsert_of_only_existing_rows_counts_updates(engine):
+    create_keyed_table(engine)
+    changes = pd.DataFrame({"ID": np.array([0, 1], dtype="int64"), "NAME": ["A", "B"], "AMOUNT": [1.5, 2.5]})
+
+    assert bis_code_helpers.upsert_data_to_table(changes, "UPSERT_TEST", ["ID"], engine) == 2
+
+    assert read_table("UPSERT_TEST", engine)["NAME"].tolist() == ["A", "B", "c", "d"]
+
+
+def test_upsert_rejects_duplicate_keys(engine):
+    create_keyed_table(engine)
+    changes = pd.DataFrame({"ID": np.array([1, 1], dtype="int64"), "NAME": ["x", "y"], "AMOUNT": [1.0, 2.0]})
+
+    with pytest.raises(bis_code_helpers.LoggedDataError):
+        bis_code_helpers.upsert_data_to_table(changes, "UPSERT_TEST", ["ID"], engine)
+
+    assert read_table("UPSERT_TEST", engine)["NAME"].tolist() == ["a", "b", "c", "d"]
+
+
+def test_upsert_rejects_missing_key_columns(engine):
+    create_keyed_table(engine)
+
+    with pytest.raises(bis_code_helpers.LoggedValueError):
+        bis_code_helpers.upsert_data_to_table(pd.DataFrame({"NAME": ["x"]}), "UPSERT_TEST", ["ID"], engine)
+
+
+def test_upsert_into_a_missing_table_fails(engine):
+    with pytest.raises(bis_code_helpers.LoggedDatabaseError):
+        bis_code_helpers.upsert_data_to_table(
+            pd.DataFrame({"ID": np.array([1], dtype="int64")}), "UPSERT_TEST", ["ID"], engine
+        )